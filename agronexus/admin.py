@@ -16,7 +16,10 @@ from .models import (AdministracaoMedicamento, Animal, AnimalManejo, Area,
                      EspecieAnimal, EstacaoMonta, HistoricoLoteAnimal, HistoricoOcupacaoArea,
                      Inseminacao, LancamentoFinanceiro, Lote, Manejo,
                      Medicamento, Parto, Pesagem, Propriedade, ProtocoloIATF,
-                     RacaAnimal, RelatorioPersonalizado, Usuario, Vacina, Vacinacao)
+                     RacaAnimal, RelatorioPersonalizado, TarefaProcessamento,
+                     Usuario, Vacina, Vacinacao)
+from .utils.catalogo import obter_catalogo
+from .utils.estatisticas import anotar_estatisticas_lotes
 
 
 def get_propriedades_usuario(user):
@@ -84,8 +87,8 @@ class EspecieListFilter(admin.SimpleListFilter):
 
     def lookups(self, request, model_admin):
         """Retorna opções de filtro baseadas nas espécies ativas"""
-        from .models import EspecieAnimal
-        especies = EspecieAnimal.objects.filter(ativo=True).order_by('nome_display')
+        especies = sorted(obter_catalogo().especies_ativas(),
+                          key=lambda especie: especie.nome_display)
         return [(especie.id, especie.nome_display) for especie in especies]
 
     def queryset(self, request, queryset):
@@ -102,10 +105,8 @@ class CategoriaListFilter(admin.SimpleListFilter):
 
     def lookups(self, request, model_admin):
         """Retorna opções de filtro baseadas nas categorias disponíveis"""
-        from .models import EspecieAnimal
-        
         categorias = []
-        especies = EspecieAnimal.objects.filter(ativo=True)
+        especies = obter_catalogo().especies_ativas()
         
         for especie in especies:
             for categoria_code, categoria_name in especie.get_categorias():
@@ -306,7 +307,7 @@ class EspecieAnimalAdmin(admin.ModelAdmin):
     
     def get_total_racas(self, obj):
         """Retorna o total de raças desta espécie"""
-        total = obj.racas.filter(ativo=True).count()
+        total = len(obter_catalogo().racas_ativas(obj.pk))
         if total > 0:
             url = f"/admin/agronexus/racaanimal/?especie__id__exact={obj.id}"
             return format_html('<a href="{}">{} raças</a>', url, total)
@@ -467,7 +468,8 @@ class LoteAdmin(admin.ModelAdmin):
         Filtra lotes baseado nas propriedades do usuário
         """
         qs = super().get_queryset(request)
-        return filter_queryset_by_propriedade(qs, request.user)
+        qs = filter_queryset_by_propriedade(qs, request.user)
+        return anotar_estatisticas_lotes(qs)
 
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         """
@@ -477,12 +479,14 @@ class LoteAdmin(admin.ModelAdmin):
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
     def get_total_animais(self, obj):
-        return obj.get_total_animais()
+        return obj.total_animais
     get_total_animais.short_description = 'Total Animais'
+    get_total_animais.admin_order_field = 'total_animais'
 
     def get_total_ua(self, obj):
-        return f"{obj.get_total_ua():.2f}"
+        return f"{obj.total_ua:.2f}"
     get_total_ua.short_description = 'Total UA'
+    get_total_ua.admin_order_field = 'total_ua'
 
 
 @admin.register(Manejo)
@@ -790,6 +794,27 @@ class ConfiguracaoSistemaAdmin(admin.ModelAdmin):
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 
+@admin.register(TarefaProcessamento)
+class TarefaProcessamentoAdmin(admin.ModelAdmin):
+    """Admin para tarefas assíncronas de importação/exportação"""
+    list_display = ['tipo', 'usuario', 'propriedade', 'status',
+                    'progresso', 'data_criacao', 'data_conclusao']
+    list_filter = ['tipo', 'status']
+    search_fields = ['usuario__username', 'propriedade__nome', 'task_id']
+    ordering = ['-data_criacao']
+    readonly_fields = ['id', 'task_id', 'progresso', 'resultado', 'mensagem_erro',
+                       'data_criacao', 'data_inicio', 'data_conclusao']
+
+    def get_queryset(self, request):
+        """
+        Mostra apenas as tarefas do próprio usuário para não superusuários
+        """
+        qs = super().get_queryset(request)
+        if request.user.is_superuser:
+            return qs
+        return qs.filter(usuario=request.user)
+
+
 # Inline admins para relacionamentos
 class AnimalInline(admin.TabularInline):
     model = Animal
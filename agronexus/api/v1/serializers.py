@@ -8,6 +8,7 @@ from decimal import Decimal
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
 
@@ -18,7 +19,9 @@ from ...models import (AdministracaoMedicamento, Animal, AnimalManejo, Area,
                        HistoricoOcupacaoArea, Inseminacao,
                        LancamentoFinanceiro, Lote, Manejo, Medicamento, Parto,
                        Pesagem, Propriedade, ProtocoloIATF, RacaAnimal,
-                       RelatorioPersonalizado, Usuario, Vacina, Vacinacao,Inseminacao)
+                       RelatorioPersonalizado, TarefaProcessamento, Usuario,
+                       Vacina, Vacinacao,Inseminacao)
+from ...utils.catalogo import obter_catalogo
 
 # ============================================================================
 # SERIALIZERS DE USUÁRIOS E AUTENTICAÇÃO
@@ -132,6 +135,8 @@ class PropriedadeSerializer(serializers.ModelSerializer):
     proprietario = UsuarioResumoSerializer(read_only=True)
     area_ocupada = serializers.DecimalField(
         max_digits=10, decimal_places=2, read_only=True)
+    total_ua = serializers.DecimalField(
+        max_digits=12, decimal_places=4, read_only=True)
     taxa_ocupacao_global = serializers.DecimalField(
         max_digits=8, decimal_places=4, read_only=True)
     total_animais = serializers.IntegerField(read_only=True)
@@ -143,7 +148,7 @@ class PropriedadeSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'nome', 'proprietario', 'localizacao', 'area_total_ha', 'coordenadas_gps',
             'inscricao_estadual', 'cnpj_cpf', 'ativa', 'data_criacao', 'area_ocupada',
-            'taxa_ocupacao_global', 'total_animais', 'total_lotes', 'total_areas'
+            'total_ua', 'taxa_ocupacao_global', 'total_animais', 'total_lotes', 'total_areas'
         ]
         read_only_fields = ['id', 'data_criacao']
 
@@ -160,7 +165,9 @@ class AreaSerializer(serializers.ModelSerializer):
     """Serializer para áreas"""
     propriedade = PropriedadeResumoSerializer(read_only=True)
     propriedade_id = serializers.UUIDField(write_only=True)
-    lote_atual = serializers.StringRelatedField(read_only=True)
+    lote_atual = serializers.StringRelatedField(source='get_lote_atual', read_only=True)
+    total_ua = serializers.DecimalField(
+        max_digits=10, decimal_places=4, read_only=True)
     taxa_ocupacao_atual = serializers.DecimalField(
         max_digits=8, decimal_places=4, read_only=True)
     periodo_ocupacao_atual = serializers.IntegerField(read_only=True)
@@ -170,7 +177,7 @@ class AreaSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'propriedade', 'propriedade_id', 'nome', 'tipo', 'tamanho_ha', 'tipo_forragem',
             'status', 'coordenadas_poligono', 'observacoes', 'data_criacao', 'lote_atual',
-            'taxa_ocupacao_atual', 'periodo_ocupacao_atual'
+            'total_ua', 'taxa_ocupacao_atual', 'periodo_ocupacao_atual'
         ]
         read_only_fields = ['id', 'data_criacao']
         validators = [
@@ -195,7 +202,6 @@ class AreaResumoSerializer(serializers.ModelSerializer):
 
 class EspecieAnimalSerializer(serializers.ModelSerializer):
     """Serializer para espécies de animais"""
-    total_animais = serializers.SerializerMethodField()
     total_racas = serializers.SerializerMethodField()
     categorias_disponiveis = serializers.SerializerMethodField()
 
@@ -205,42 +211,62 @@ class EspecieAnimalSerializer(serializers.ModelSerializer):
             'id', 'nome', 'nome_display', 'peso_ua_referencia', 
             'periodo_gestacao_dias', 'idade_primeira_cobertura_meses',
             'ativo', 'data_criacao', 'data_atualizacao',
-            'total_animais', 'total_racas', 'categorias_disponiveis'
+            'total_racas', 'categorias_disponiveis'
         ]
         read_only_fields = ['id', 'data_criacao', 'data_atualizacao']
 
-    def get_total_animais(self, obj):
-        """Retorna o total de animais desta espécie"""
-        return obj.animais.filter(status='ativo').count()
-
-    def get_total_racas(self, obj):
-        """Retorna o total de raças desta espécie"""
-        return obj.racas.filter(ativo=True).count()
+    def get_total_racas(self, obj) -> int:
+        """Retorna o total de raças desta espécie (catálogo em memória)"""
+        return len(obter_catalogo().racas_ativas(obj.pk))
 
     def get_categorias_disponiveis(self, obj):
         """Retorna as categorias disponíveis para esta espécie"""
         return obj.get_categorias()
 
 
+@extend_schema_field(EspecieAnimalSerializer)
+class EspecieCatalogoField(serializers.Field):
+    """Espécie aninhada servida pelo catálogo de referência (sem consultas)"""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('source', 'especie_id')
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, especie_id):
+        return obter_catalogo().representacao_especie(especie_id)
+
+
+class EspecieAnimalResumoSerializer(serializers.ModelSerializer):
+    """Serializer resumido para espécies de animais"""
+
+    class Meta:
+        model = EspecieAnimal
+        fields = ['id', 'nome', 'nome_display']
+
+
+@extend_schema_field(EspecieAnimalResumoSerializer)
+class EspecieResumoCatalogoField(EspecieCatalogoField):
+    """Espécie resumida servida pelo catálogo de referência"""
+
+    def to_representation(self, especie_id):
+        return obter_catalogo().representacao_especie_resumo(especie_id)
+
+
 class RacaAnimalSerializer(serializers.ModelSerializer):
     """Serializer para raças de animais"""
-    especie = EspecieAnimalSerializer(read_only=True)
+    especie = EspecieCatalogoField()
     especie_id = serializers.UUIDField(write_only=True)
-    total_animais = serializers.SerializerMethodField()
 
     class Meta:
         model = RacaAnimal
         fields = [
             'id', 'especie', 'especie_id', 'nome', 'origem', 
             'caracteristicas', 'peso_medio_adulto_kg', 'ativo',
-            'data_criacao', 'data_atualizacao', 'total_animais'
+            'data_criacao', 'data_atualizacao'
         ]
         read_only_fields = ['id', 'data_criacao', 'data_atualizacao']
 
-    def get_total_animais(self, obj):
-        """Retorna o total de animais desta raça"""
-        return obj.animais.filter(status='ativo').count()
-
 
 class RacaAnimalResumoSerializer(serializers.ModelSerializer):
     """Serializer resumido para raças de animais"""
@@ -250,6 +276,19 @@ class RacaAnimalResumoSerializer(serializers.ModelSerializer):
         fields = ['id', 'nome', 'especie']
 
 
+@extend_schema_field(RacaAnimalResumoSerializer)
+class RacaCatalogoField(serializers.Field):
+    """Raça resumida servida pelo catálogo de referência (sem consultas)"""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('source', 'raca_id')
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, raca_id):
+        return obter_catalogo().representacao_raca(raca_id)
+
+
 # ============================================================================
 # SERIALIZERS DE ANIMAIS E LOTES
 # ============================================================================
@@ -258,9 +297,9 @@ class AnimalSerializer(serializers.ModelSerializer):
     """Serializer para animais"""
     propriedade = PropriedadeResumoSerializer(read_only=True)
     propriedade_id = serializers.UUIDField(write_only=True)
-    especie = EspecieAnimalSerializer(read_only=True)
+    especie = EspecieCatalogoField()
     especie_id = serializers.UUIDField(write_only=True)
-    raca = RacaAnimalResumoSerializer(read_only=True)
+    raca = RacaCatalogoField()
     raca_id = serializers.UUIDField(write_only=True, required=False, allow_null=True)
     lote_atual = serializers.StringRelatedField(read_only=True)
     lote_atual_id = serializers.UUIDField(
@@ -269,12 +308,12 @@ class AnimalSerializer(serializers.ModelSerializer):
     pai_id = serializers.UUIDField(write_only=True, required=False, allow_null=True)
     mae = serializers.SerializerMethodField(read_only=True)
     mae_id = serializers.UUIDField(write_only=True, required=False, allow_null=True)
-    idade_dias = serializers.IntegerField(read_only=True)
-    idade_meses = serializers.IntegerField(read_only=True)
+    idade_dias = serializers.IntegerField(source='get_idade_dias', read_only=True)
+    idade_meses = serializers.IntegerField(source='get_idade_meses', read_only=True)
     peso_atual = serializers.DecimalField(
         max_digits=6, decimal_places=2, read_only=True)
     ua_value = serializers.DecimalField(
-        max_digits=8, decimal_places=4, read_only=True)
+        source='get_ua_value', max_digits=8, decimal_places=4, read_only=True)
 
     def get_pai(self, obj):
         """Retorna dados do pai se existir"""
@@ -320,11 +359,28 @@ class AnimalSerializer(serializers.ModelSerializer):
         ]
 
 
+class AnimalListaSerializer(AnimalSerializer):
+    """
+    Serializer de animais para listagens.
+
+    Com o queryset de `otimizar_queryset` o custo é fixo por página:
+    relações via select_related, peso do snapshot desnormalizado e
+    espécie/raça resumidas do catálogo em memória.
+    """
+    especie = EspecieResumoCatalogoField()
+
+    @staticmethod
+    def otimizar_queryset(queryset):
+        return queryset.select_related(
+            'propriedade__configuracao', 'lote_atual__propriedade', 'pai', 'mae',
+            'especie')
+
+
 class AnimalResumoSerializer(serializers.ModelSerializer):
     """Serializer resumido para animais"""
     especie_nome = serializers.CharField(source='especie.nome_display', read_only=True)
     raca_nome = serializers.CharField(source='raca.nome', read_only=True)
-    idade_meses = serializers.IntegerField(read_only=True)
+    idade_meses = serializers.IntegerField(source='get_idade_meses', read_only=True)
     peso_atual = serializers.DecimalField(
         max_digits=6, decimal_places=2, read_only=True)
 
@@ -736,7 +792,7 @@ class ContaFinanceiraSerializer(serializers.ModelSerializer):
     propriedade = PropriedadeResumoSerializer(read_only=True)
     propriedade_id = serializers.UUIDField(write_only=True)
     saldo_atual = serializers.DecimalField(
-        max_digits=12, decimal_places=2, read_only=True)
+        source='get_saldo_atual', max_digits=16, decimal_places=2, read_only=True)
 
     class Meta:
         model = ContaFinanceira
@@ -817,6 +873,30 @@ class RelatorioPersonalizadoSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'data_criacao', 'data_atualizacao']
 
 
+class TarefaProcessamentoSerializer(serializers.ModelSerializer):
+    """Serializer para tarefas assíncronas de importação/exportação"""
+    propriedade = PropriedadeResumoSerializer(read_only=True)
+    url_download = serializers.SerializerMethodField()
+
+    def get_url_download(self, obj):
+        """URL para baixar o arquivo gerado, quando disponível"""
+        if obj.status != 'concluida' or not obj.arquivo_resultado:
+            return None
+        from django.urls import reverse
+        url = reverse('tarefaprocessamento-download', args=[obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    class Meta:
+        model = TarefaProcessamento
+        fields = [
+            'id', 'tipo', 'status', 'progresso', 'propriedade', 'parametros',
+            'resultado', 'mensagem_erro', 'url_download', 'data_criacao',
+            'data_inicio', 'data_conclusao'
+        ]
+        read_only_fields = fields
+
+
 class ConfiguracaoSistemaSerializer(serializers.ModelSerializer):
     """Serializer para configurações do sistema"""
     propriedade = PropriedadeResumoSerializer(read_only=True)
@@ -826,7 +906,8 @@ class ConfiguracaoSistemaSerializer(serializers.ModelSerializer):
         model = ConfiguracaoSistema
         fields = [
             'id', 'propriedade', 'propriedade_id', 'peso_ua_referencia', 'dias_gmd_padrao',
-            'dias_diagnostico_gestacao', 'dias_gestacao', 'notificar_calendario_sanitario',
+            'dias_diagnostico_gestacao', 'dias_gestacao', 'dias_espera_voluntaria',
+            'notificar_calendario_sanitario',
             'dias_antecedencia_notificacao', 'moeda', 'data_criacao', 'data_atualizacao'
         ]
         read_only_fields = ['id', 'data_criacao', 'data_atualizacao']
@@ -3,15 +3,23 @@ AgroNexus - Sistema
 ViewSets para API REST
 """
 
+import hashlib
+import uuid
 from datetime import timedelta
+from functools import partial
+from itertools import chain
 
 from django.core.exceptions import ValidationError
-from django.db.models import Avg, Count, F, Q, Sum
+from django.db.models import (Avg, Count, DecimalField, F, OuterRef, Q,
+                              Sum)
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.utils import translate_validation
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.response import Response
 
@@ -22,16 +30,46 @@ from ...models import (AdministracaoMedicamento, Animal, AnimalManejo, Area,
                        HistoricoLoteAnimal, HistoricoOcupacaoArea, Inseminacao,
                        LancamentoFinanceiro, Lote, Manejo, Medicamento, Parto,
                        Pesagem, Propriedade, ProtocoloIATF, RacaAnimal,
-                       RelatorioPersonalizado, Usuario, Vacina, Vacinacao)
+                       RelatorioPersonalizado, ResumoFinanceiroMensal,
+                       ResumoRebanhoDiario, TarefaProcessamento, Usuario,
+                       Vacina, Vacinacao)
 from ...permissions.base import IsOwnerOrReadOnly, PropriedadeOwnerPermission
+from ...utils.cache import (NAMESPACE_REFERENCIA, cache_namespace,
+                            chave_consulta, chave_referencia,
+                            estatisticas_cache_dashboard, obter_dashboard,
+                            obter_indicadores_estacao)
+from ...utils.campos import SelecaoCampos
+from ...utils.catalogo import obter_catalogo
+from ...utils.estacao_monta import gerar_indicadores_estacao
+from ...utils.monitoramento import relatorio_endpoints, zerar_metricas
+from ...utils.ocupacao import (OCUPACAO_AREA, OCUPACAO_PROPRIEDADE,
+                               anexar_lotes_ativos, anotar_ocupacao_areas,
+                               anotar_ocupacao_propriedades)
+from ...utils.paginacao import PaginacaoCursor
+from ...utils.reproducao import (anotar_estado_reprodutivo,
+                                 da_inseminacao_atual, data_parto_prevista,
+                                 filtro_parto_previsto,
+                                 prazo_diagnostico_vencido)
+from ...utils.resumo_financeiro import fim_do_mes
+from ...utils.resumo_rebanho import serie_resumo_rebanho
+from ...utils.series_temporais import (ParametroSerieInvalido, acumular,
+                                      parametros_serie, serie_temporal)
+from ...utils.zootecnicos import obter_indices_zootecnicos
+from ...utils.estatisticas import (ESTATISTICAS_LOTE, anexar_gmd_medio,
+                                  anotar_estatisticas_lotes,
+                                  calcular_gmd_medio_lotes,
+                                  gerar_dashboard_propriedade,
+                                  subquery_agregado,
+                                  subquery_total_animais_lote)
 from ...utils.filters import (AnimalFilter, AreaFilter,
                               CalendarioSanitarioFilter,
                               DiagnosticoGestacaoFilter, EstacaoMontaFilter,
                               InseminacaoFilter, LancamentoFinanceiroFilter,
                               LoteFilter, ManejoFilter, PartoFilter,
                               PesagemFilter, PropriedadeFilter,
-                              VacinacaoFilter)
-from .serializers import (AdministracaoMedicamentoSerializer, AnimalSerializer,
+                              ResumoFinanceiroFilter, VacinacaoFilter)
+from .serializers import (AdministracaoMedicamentoSerializer,
+                          AnimalListaSerializer, AnimalSerializer,
                           AreaSerializer, CalendarioSanitarioSerializer,
                           CategoriaFinanceiraSerializer,
                           ConfiguracaoSistemaSerializer,
@@ -46,11 +84,52 @@ from .serializers import (AdministracaoMedicamentoSerializer, AnimalSerializer,
                           PartoSerializer, PesagemSerializer,
                           PropriedadeSerializer, ProtocoloIATFSerializer,
                           RacaAnimalSerializer,
-                          RelatorioPersonalizadoSerializer, UsuarioSerializer,
+                          RelatorioPersonalizadoSerializer,
+                          TarefaProcessamentoSerializer, UsuarioSerializer,
                           VacinacaoSerializer, VacinaSerializer)
 
 
-class BaseViewSet(viewsets.ModelViewSet):
+class CamposDinamicosMixin:
+    """
+    Representações enxutas na listagem e no detalhe.
+
+    ?fields=id,nome,animal.identificacao_unica retorna só os campos pedidos
+    e ?expand=propriedade,animal retorna essas relações completas; com
+    qualquer um dos dois as relações não expandidas viram o id. Os joins
+    e prefetches dos campos pedidos são somados aos do queryset da view e
+    as views consultam `campo_solicitado` antes de anotar valores caros.
+    """
+    acoes_campos_dinamicos = ('list', 'retrieve')
+
+    def get_selecao_campos(self):
+        if not hasattr(self, '_selecao_campos'):
+            ativo = (getattr(self, 'action', None) in self.acoes_campos_dinamicos
+                     and self.request is not None
+                     and self.request.method in permissions.SAFE_METHODS)
+            self._selecao_campos = (
+                SelecaoCampos.da_requisicao(self.request) if ativo else None)
+        return self._selecao_campos
+
+    def campo_solicitado(self, nome):
+        selecao = self.get_selecao_campos()
+        return selecao is None or selecao.inclui(nome)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        selecao = self.get_selecao_campos()
+        if selecao is not None:
+            selecao.aplicar(serializer)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        selecao = self.get_selecao_campos()
+        if selecao is not None:
+            queryset = selecao.otimizar_queryset(queryset, self.get_serializer())
+        return queryset
+
+
+class BaseViewSet(CamposDinamicosMixin, viewsets.ModelViewSet):
     """ViewSet base com funcionalidades comuns"""
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -77,6 +156,89 @@ class BaseViewSet(viewsets.ModelViewSet):
             serializer.save()
 
 
+class CacheReferenciaMixin:
+    """
+    Guarda a listagem de dados de referência no namespace 'referencia'.
+
+    A chave leva a versão de `nome_referencia`, incrementada pelos sinais
+    de save/delete do modelo, e os parâmetros da requisição.
+    """
+    nome_referencia = None
+
+    def list(self, request, *args, **kwargs):
+        cache = cache_namespace(NAMESPACE_REFERENCIA)
+        chave = chave_referencia(
+            self.nome_referencia, 'lista', chave_consulta(request))
+        dados = cache.get(chave)
+        if dados is None:
+            dados = super().list(request, *args, **kwargs).data
+            cache.set(chave, dados)
+        return Response(dados)
+
+
+class CatalogoETagMixin:
+    """
+    Respostas de leitura com ETag derivado do catálogo de referência.
+
+    Se o If-None-Match enviado ainda vale, responde 304 sem consultar o
+    banco nem serializar nada.
+    """
+
+    def etag_catalogo(self, request):
+        conteudo = f'{obter_catalogo().etag}:{chave_consulta(request)}'
+        return '"{}"'.format(hashlib.md5(conteudo.encode()).hexdigest())
+
+    def resposta_condicional(self, request, gerar):
+        etag = self.etag_catalogo(request)
+        enviados = request.headers.get('If-None-Match', '')
+        if etag in [valor.strip() for valor in enviados.split(',')]:
+            return Response(status=status.HTTP_304_NOT_MODIFIED,
+                            headers={'ETag': etag})
+        resposta = gerar()
+        resposta['ETag'] = etag
+        return resposta
+
+    def list(self, request, *args, **kwargs):
+        return self.resposta_condicional(
+            request, partial(super().list, request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.resposta_condicional(
+            request, partial(super().retrieve, request, *args, **kwargs))
+
+
+class HistoricoRebanhoMixin:
+    """
+    Ação `historico_rebanho` com a série do resumo diário do rebanho do
+    registro (propriedade, lote ou área).
+
+    A view informa `nivel_resumo` e `campo_resumo`, o campo do resumo que
+    aponta para o registro.
+    """
+    nivel_resumo = None
+    campo_resumo = None
+
+    @action(detail=True, methods=['get'])
+    def historico_rebanho(self, request, pk=None):
+        """
+        Animais, UA, peso médio e taxa de ocupação (UA/ha) por período,
+        lidos do resumo diário do rebanho.
+
+        Parâmetros: granularidade (dia, semana ou mes), data_inicio e
+        data_fim. Semanas e meses trazem a média dos dias com resumo e a
+        quantidade desses dias.
+        """
+        registro = self.get_object()
+        resumos = ResumoRebanhoDiario.objects.filter(
+            nivel=self.nivel_resumo, **{self.campo_resumo: registro})
+        try:
+            granularidade, inicio, fim = parametros_serie(request.query_params)
+            serie = serie_resumo_rebanho(resumos, granularidade, inicio, fim)
+        except ParametroSerieInvalido as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(serie)
+
+
 # ============================================================================
 # VIEWSETS DE USUÁRIOS E PROPRIEDADES
 # ============================================================================
@@ -117,7 +279,7 @@ class UsuarioViewSet(viewsets.ModelViewSet):
         return Response(data)
 
 
-class PropriedadeViewSet(BaseViewSet):
+class PropriedadeViewSet(HistoricoRebanhoMixin, BaseViewSet):
     """ViewSet para propriedades"""
     queryset = Propriedade.objects.all()
     serializer_class = PropriedadeSerializer
@@ -126,15 +288,32 @@ class PropriedadeViewSet(BaseViewSet):
     search_fields = ['nome', 'localizacao', 'inscricao_estadual']
     ordering_fields = ['nome', 'area_total_ha', 'data_criacao']
     ordering = ['nome']
+    nivel_resumo = 'propriedade'
+    campo_resumo = 'propriedade'
 
     def get_queryset(self):
         """Usuários veem apenas suas propriedades"""
-        return self.queryset.filter(proprietario=self.request.user).annotate(
-            area_ocupada=Sum('areas__tamanho_ha'),
-            total_animais=Count('animais', filter=Q(animais__status='ativo')),
-            total_lotes=Count('lotes', filter=Q(lotes__ativo=True)),
-            total_areas=Count('areas')
-        )
+        # Subconsultas por relação: joins de áreas, animais e lotes na mesma
+        # consulta multiplicariam as somas e contagens
+        referencia = {'propriedade': OuterRef('pk')}
+        anotacoes = {
+            'area_ocupada': subquery_agregado(
+                Area.objects.filter(**referencia), 'propriedade', Sum('tamanho_ha'),
+                output_field=DecimalField(max_digits=12, decimal_places=2)),
+            'total_animais': subquery_agregado(
+                Animal.objects.filter(status='ativo', **referencia),
+                'propriedade', Count('pk')),
+            'total_lotes': subquery_agregado(
+                Lote.objects.filter(ativo=True, **referencia), 'propriedade', Count('pk')),
+            'total_areas': subquery_agregado(
+                Area.objects.filter(**referencia), 'propriedade', Count('pk')),
+        }
+        queryset = self.queryset.filter(proprietario=self.request.user).annotate(**{
+            nome: expressao for nome, expressao in anotacoes.items()
+            if self.campo_solicitado(nome)
+        })
+        return anotar_ocupacao_propriedades(queryset, [
+            nome for nome in OCUPACAO_PROPRIEDADE if self.campo_solicitado(nome)])
 
     def perform_create(self, serializer):
         """Associa o usuário atual como proprietário"""
@@ -142,61 +321,49 @@ class PropriedadeViewSet(BaseViewSet):
 
     @action(detail=True, methods=['get'])
     def dashboard(self, request, pk=None):
-        """Dashboard com estatísticas da propriedade"""
+        """Dashboard com estatísticas da propriedade (em cache)"""
         propriedade = self.get_object()
+        return Response(
+            obter_dashboard(propriedade, gerar_dashboard_propriedade))
 
-        # Estatísticas gerais
-        total_animais = propriedade.animais.filter(status='ativo').count()
-        total_lotes = propriedade.lotes.filter(ativo=True).count()
-        total_areas = propriedade.areas.count()
-
-        # Estatísticas por categoria
-        por_categoria = propriedade.animais.filter(status='ativo').values(
-            'categoria'
-        ).annotate(total=Count('id'))
-
-        # Estatísticas por sexo
-        por_sexo = propriedade.animais.filter(status='ativo').values(
-            'sexo'
-        ).annotate(total=Count('id'))
-
-        # Estatísticas financeiras (último mês)
-        data_limite = timezone.now().date() - timedelta(days=30)
-        receitas = propriedade.lancamentos_financeiros.filter(
-            tipo='entrada',
-            data_lancamento__gte=data_limite
-        ).aggregate(total=Sum('valor'))['total'] or 0
-
-        despesas = propriedade.lancamentos_financeiros.filter(
-            tipo='saida',
-            data_lancamento__gte=data_limite
-        ).aggregate(total=Sum('valor'))['total'] or 0
-
-        return Response({
-            'estatisticas_gerais': {
-                'total_animais': total_animais,
-                'total_lotes': total_lotes,
-                'total_areas': total_areas,
-                'area_total_ha': propriedade.area_total_ha,
-                'taxa_ocupacao_global': propriedade.get_taxa_ocupacao_global()
-            },
-            'distribuicao_animais': {
-                'por_categoria': list(por_categoria),
-                'por_sexo': list(por_sexo)
-            },
-            'financeiro_mensal': {
-                'receitas': receitas,
-                'despesas': despesas,
-                'saldo': receitas - despesas
+    @action(detail=True, methods=['get'], url_path='indices-zootecnicos')
+    def indices_zootecnicos(self, request, pk=None):
+        """
+        Índices zootécnicos da propriedade em uma data (parâmetro data,
+        padrão: hoje), lidos do cache dos índices quando houver. O GMD de
+        cada animal só vem com animais=true.
+        """
+        propriedade = self.get_object()
+        valor = request.query_params.get('data')
+        try:
+            data = parse_date(valor) if valor else timezone.now().date()
+        except ValueError:
+            data = None
+        if data is None:
+            return Response(
+                {'error': f'data inválida: "{valor}". Use aaaa-mm-dd'},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        indices = obter_indices_zootecnicos(propriedade, data)
+        if request.query_params.get('animais') != 'true':
+            indices = {
+                chave: valor for chave, valor in indices.items()
+                if chave != 'gmd_animais'
             }
-        })
+        return Response(indices)
+
+    @action(detail=False, methods=['get'], url_path='cache-estatisticas',
+            permission_classes=[permissions.IsAdminUser])
+    def cache_estatisticas(self, request):
+        """Acertos e falhas do cache de dashboards"""
+        return Response(estatisticas_cache_dashboard())
 
 
 # ============================================================================
 # VIEWSETS DE ÁREAS
 # ============================================================================
 
-class AreaViewSet(BaseViewSet):
+class AreaViewSet(HistoricoRebanhoMixin, BaseViewSet):
     """ViewSet para áreas"""
     queryset = Area.objects.all()
     serializer_class = AreaSerializer
@@ -206,9 +373,37 @@ class AreaViewSet(BaseViewSet):
     search_fields = ['nome', 'tipo_forragem']
     ordering_fields = ['nome', 'tipo', 'tamanho_ha', 'status']
     ordering = ['nome']
+    nivel_resumo = 'area'
+    campo_resumo = 'area'
 
     def get_queryset(self):
-        return super().get_queryset().select_related('propriedade')
+        queryset = super().get_queryset().select_related('propriedade')
+
+        # Ocupação calculada via subconsultas agregadas
+        return anotar_ocupacao_areas(queryset, [
+            nome for nome in OCUPACAO_AREA if self.campo_solicitado(nome)])
+
+    def _com_lote_atual(self, areas):
+        if not self.campo_solicitado('lote_atual'):
+            return areas
+        return anexar_lotes_ativos(areas)
+
+    def list(self, request, *args, **kwargs):
+        """Lista áreas carregando os lotes atuais apenas da página retornada"""
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(self._com_lote_atual(page), many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(self._com_lote_atual(queryset), many=True)
+        return Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        area = self._com_lote_atual([self.get_object()])[0]
+        serializer = self.get_serializer(area)
+        return Response(serializer.data)
 
     @action(detail=True, methods=['post'])
     def ocupar(self, request, pk=None):
@@ -299,7 +494,7 @@ class AreaViewSet(BaseViewSet):
 # VIEWSETS DE ESPÉCIES E RAÇAS
 # ============================================================================
 
-class EspecieAnimalViewSet(viewsets.ReadOnlyModelViewSet):
+class EspecieAnimalViewSet(CatalogoETagMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet para espécies de animais (apenas leitura)"""
     queryset = EspecieAnimal.objects.filter(ativo=True)
     serializer_class = EspecieAnimalSerializer
@@ -309,23 +504,33 @@ class EspecieAnimalViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['nome', 'nome_display']
     ordering = ['nome']
 
+    def _especie_catalogo(self):
+        try:
+            especie_id = uuid.UUID(str(self.kwargs['pk']))
+        except ValueError:
+            raise NotFound()
+        especie = obter_catalogo().especie(especie_id)
+        if especie is None or not especie.ativo:
+            raise NotFound()
+        return especie
+
     @action(detail=True, methods=['get'])
     def racas(self, request, pk=None):
         """Retorna todas as raças de uma espécie"""
-        especie = self.get_object()
-        racas = especie.racas.filter(ativo=True)
-        serializer = RacaAnimalSerializer(racas, many=True)
-        return Response(serializer.data)
+        def gerar():
+            especie = self._especie_catalogo()
+            racas = obter_catalogo().racas_ativas(especie.pk)
+            return Response(RacaAnimalSerializer(racas, many=True).data)
+        return self.resposta_condicional(request, gerar)
 
     @action(detail=True, methods=['get'])
     def categorias(self, request, pk=None):
         """Retorna as categorias disponíveis para uma espécie"""
-        especie = self.get_object()
-        categorias = especie.get_categorias()
-        return Response(categorias)
+        return self.resposta_condicional(
+            request, lambda: Response(self._especie_catalogo().get_categorias()))
 
 
-class RacaAnimalViewSet(viewsets.ReadOnlyModelViewSet):
+class RacaAnimalViewSet(CatalogoETagMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet para raças de animais (apenas leitura)"""
     queryset = RacaAnimal.objects.filter(ativo=True)
     serializer_class = RacaAnimalSerializer
@@ -354,18 +559,14 @@ class AnimalViewSet(BaseViewSet):
     ordering = ['identificacao_unica']
 
     def get_queryset(self):
-        queryset = super().get_queryset().select_related(
-            'propriedade', 'lote_atual', 'pai', 'mae'
-        )
+        # Peso atual vem do snapshot denormalizado; idade e UA são
+        # calculados pelo serializer sem consultas adicionais
+        return AnimalListaSerializer.otimizar_queryset(super().get_queryset())
 
-        # Adiciona campos calculados
-        for animal in queryset:
-            animal.idade_dias = animal.get_idade_dias()
-            animal.idade_meses = animal.get_idade_meses()
-            animal.peso_atual = animal.get_peso_atual()
-            animal.ua_value = animal.get_ua_value()
-
-        return queryset
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return AnimalListaSerializer
+        return super().get_serializer_class()
 
     @action(detail=True, methods=['get'])
     def historico_completo(self, request, pk=None):
@@ -438,11 +639,12 @@ class AnimalViewSet(BaseViewSet):
         Exporta animais para Excel com validações de segurança.
         Só permite exportar animais de propriedades que pertencem ao usuário autenticado.
         """
-        import openpyxl
-        from openpyxl.styles import Font, PatternFill, Alignment
-        from django.http import HttpResponse
+        from django.http import StreamingHttpResponse
         from django.utils import timezone
-        import io
+
+        from ...utils.planilhas import (CONTENT_TYPE_XLSX,
+                                        filtrar_animais_exportacao,
+                                        gerar_planilha_animais)
 
         # Validações de segurança
         propriedade_id = request.data.get('propriedade_id')
@@ -469,25 +671,7 @@ class AnimalViewSet(BaseViewSet):
             queryset = queryset.filter(propriedade__in=propriedades_usuario)
 
         # Aplica filtros adicionais
-        especie_id = request.data.get('especie_id')
-        if especie_id:
-            queryset = queryset.filter(especie_id=especie_id)
-
-        status_filter = request.data.get('status')
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-
-        search = request.data.get('search')
-        if search:
-            queryset = queryset.filter(
-                Q(identificacao_unica__icontains=search) |
-                Q(nome_registro__icontains=search)
-            )
-
-        # Ordena por identificação única
-        queryset = queryset.select_related(
-            'propriedade', 'especie', 'raca', 'lote_atual', 'pai', 'mae'
-        ).order_by('identificacao_unica')
+        queryset = filtrar_animais_exportacao(queryset, request.data)
 
         # Validação de segurança: verifica se todos os animais pertencem ao usuário
         animais_nao_autorizados = queryset.exclude(
@@ -500,134 +684,6 @@ class AnimalViewSet(BaseViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        # Cria o workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Animais"
-
-        # Estilos
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill("solid", fgColor="2E8B57")
-        header_alignment = Alignment(horizontal="center", vertical="center")
-
-        # Define as colunas básicas
-        colunas = [
-            'ID Único', 'Nome/Registro', 'Propriedade', 'Espécie', 'Raça', 
-            'Sexo', 'Data Nascimento', 'Categoria', 'Status', 'Lote Atual',
-            'Peso Atual (kg)', 'Idade (meses)'
-        ]
-
-        # Adiciona colunas de genealogia se solicitado
-        if incluir_genealogia:
-            colunas.extend(['Pai', 'Mãe'])
-
-        # Escreve o cabeçalho
-        for col_num, column_title in enumerate(colunas, 1):
-            cell = ws.cell(row=1, column=col_num)
-            cell.value = column_title
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-
-        # Escreve os dados dos animais
-        row_num = 2
-        for animal in queryset:
-            # Dados básicos
-            dados_animal = [
-                animal.identificacao_unica or '',
-                animal.nome_registro or '',
-                animal.propriedade.nome if animal.propriedade else '',
-                animal.especie.nome_display if animal.especie else '',
-                animal.raca.nome if animal.raca else '',
-                animal.get_sexo_display(),
-                animal.data_nascimento.strftime('%d/%m/%Y') if animal.data_nascimento else '',
-                animal.get_categoria_display(),
-                animal.get_status_display(),
-                animal.lote_atual.nome if animal.lote_atual else '',
-                animal.get_peso_atual() or '',
-                animal.get_idade_meses() or ''
-            ]
-
-            # Adiciona dados de genealogia se solicitado
-            if incluir_genealogia:
-                dados_animal.extend([
-                    animal.pai.identificacao_unica if animal.pai else '',
-                    animal.mae.identificacao_unica if animal.mae else ''
-                ])
-
-            # Escreve a linha
-            for col_num, valor in enumerate(dados_animal, 1):
-                ws.cell(row=row_num, column=col_num, value=valor)
-
-            row_num += 1
-
-        # Adiciona estatísticas se solicitado
-        if incluir_estatisticas:
-            # Cria nova aba para estatísticas
-            ws_stats = wb.create_sheet("Estatísticas")
-            
-            # Calcula estatísticas
-            total_animais = queryset.count()
-            animais_ativos = queryset.filter(status='ativo').count()
-            animais_inativos = queryset.filter(status='inativo').count()
-            
-            # Distribuição por sexo
-            machos = queryset.filter(sexo='M').count()
-            femeas = queryset.filter(sexo='F').count()
-            
-            # Distribuição por espécie
-            por_especie = queryset.values('especie__nome_display').annotate(
-                total=Count('id')
-            ).order_by('-total')
-
-            # Escreve estatísticas
-            stats_data = [
-                ['Estatísticas Gerais', ''],
-                ['Total de Animais', total_animais],
-                ['Animais Ativos', animais_ativos],
-                ['Animais Inativos', animais_inativos],
-                ['', ''],
-                ['Distribuição por Sexo', ''],
-                ['Machos', machos],
-                ['Fêmeas', femeas],
-                ['', ''],
-                ['Distribuição por Espécie', '']
-            ]
-            
-            # Adiciona dados por espécie
-            for esp in por_especie:
-                stats_data.append([esp['especie__nome_display'], esp['total']])
-
-            # Escreve no worksheet
-            for row_num, (label, value) in enumerate(stats_data, 1):
-                ws_stats.cell(row=row_num, column=1, value=label)
-                if value != '':
-                    ws_stats.cell(row=row_num, column=2, value=value)
-
-            # Aplica formatação ao cabeçalho das estatísticas
-            for row in [1, 6, 10]:
-                cell = ws_stats.cell(row=row, column=1)
-                cell.font = header_font
-                cell.fill = header_fill
-
-        # Ajusta a largura das colunas
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-
-        # Gera o arquivo em memória
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
-
         # Prepara a resposta
         timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
         propriedade_nome = ''
@@ -637,9 +693,11 @@ class AnimalViewSet(BaseViewSet):
         
         filename = f'animais_export{propriedade_nome}_{timestamp}.xlsx'
         
-        response = HttpResponse(
-            output.getvalue(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        # A planilha é gerada em blocos enquanto é enviada ao cliente
+        response = StreamingHttpResponse(
+            gerar_planilha_animais(
+                queryset, incluir_genealogia, incluir_estatisticas),
+            content_type=CONTENT_TYPE_XLSX
         )
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
         
@@ -653,8 +711,10 @@ class AnimalViewSet(BaseViewSet):
         """
         import openpyxl
         from django.db import transaction
-        from datetime import datetime
-        import io
+
+        from ...utils.planilhas import (CABECALHOS_OBRIGATORIOS_IMPORTACAO,
+                                        ImportadorAnimais,
+                                        mapear_cabecalhos_importacao)
 
         # Verifica se arquivo foi enviado
         if 'arquivo' not in request.FILES:
@@ -679,88 +739,35 @@ class AnimalViewSet(BaseViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        wb = None
         try:
-            # Carrega o arquivo Excel
-            wb = openpyxl.load_workbook(arquivo, data_only=True)
+            # Carrega o arquivo Excel em modo somente leitura (linhas sob demanda)
+            wb = openpyxl.load_workbook(arquivo, read_only=True, data_only=True)
             if not wb.worksheets:
                 return Response(
                     {'error': 'Planilha vazia ou inválida'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            ws = wb.active
-            rows = list(ws.iter_rows(values_only=True))
-            
-            if len(rows) < 2:
+            rows = wb.active.iter_rows(values_only=True)
+            cabecalho = next(rows, None)
+            primeira_linha = next(rows, None)
+
+            if cabecalho is None or primeira_linha is None:
                 return Response(
                     {'error': 'Planilha deve conter pelo menos cabeçalho e uma linha de dados'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
             # Primeira linha são os cabeçalhos
-            headers = [str(header).strip().lower() if header else '' for header in rows[0]]
-            
-            # Mapeamento de cabeçalhos em português para nomes técnicos
-            # Função auxiliar para normalizar cabeçalhos (remover * e espaços extras)
-            def normalizar_header(header):
-                return header.replace('*', '').strip().lower()
-            
-            mapeamento_headers = {
-                'id único': 'identificacao_unica',
-                'id unico': 'identificacao_unica',
-                'identificacao única': 'identificacao_unica',
-                'identificacao unica': 'identificacao_unica',
-                'identificacao_unica': 'identificacao_unica',
-                'identificacao': 'identificacao_unica',
-                'nome/registro': 'nome_registro',
-                'nome registro': 'nome_registro',
-                'nome_registro': 'nome_registro',
-                'nome': 'nome_registro',
-                'propriedade': 'propriedade',
-                'espécie': 'especie',
-                'especie': 'especie',
-                'raça': 'raca',
-                'raca': 'raca',
-                'sexo': 'sexo',
-                'data nascimento': 'data_nascimento',
-                'data_nascimento': 'data_nascimento',
-                'data de nascimento': 'data_nascimento',
-                'nascimento': 'data_nascimento',
-                'categoria': 'categoria',
-                'status': 'status',
-                'lote atual': 'lote_atual',
-                'lote_atual': 'lote_atual',
-                'lote': 'lote_atual',
-                'peso atual (kg)': 'peso_atual',
-                'peso atual': 'peso_atual',
-                'peso_atual': 'peso_atual',
-                'peso': 'peso_atual',
-                'observações': 'observacoes',
-                'observacoes': 'observacoes',
-                'observação': 'observacoes',
-                'obs': 'observacoes',
-            }
-            
-            # Converter cabeçalhos usando o mapeamento com normalização
-            headers_normalizados = []
-            for header_original in headers:
-                # Normalizar header removendo asteriscos e espaços
-                header_normalizado = normalizar_header(header_original)
-                
-                # Buscar no mapeamento usando header normalizado
-                header_mapeado = mapeamento_headers.get(header_normalizado, header_original)
-                headers_normalizados.append(header_mapeado)
-            
-            headers = headers_normalizados
-            
+            headers = mapear_cabecalhos_importacao(cabecalho)
+
             # Validar cabeçalhos obrigatórios
-            headers_obrigatorios = ['identificacao_unica', 'especie', 'sexo', 'data_nascimento', 'categoria', 'status']
-            headers_faltantes = []
-            
-            for header in headers_obrigatorios:
-                if header not in headers:
-                    headers_faltantes.append(header)
-            
+            headers_faltantes = [
+                header for header in CABECALHOS_OBRIGATORIOS_IMPORTACAO
+                if header not in headers
+            ]
+
             if headers_faltantes:
                 return Response(
                     {'error': f'Colunas obrigatórias ausentes: {", ".join(headers_faltantes)}'},
@@ -775,238 +782,19 @@ class AnimalViewSet(BaseViewSet):
                     status=status.HTTP_403_FORBIDDEN
                 )
 
-            # Processar linhas de dados
-            animais_validos = []
-            animais_duplicados = []
-            erros = []
-            linha_num = 1  # Primeira linha de dados
-
+            # Processar linhas de dados em blocos
             with transaction.atomic():
-                for row_index, row in enumerate(rows[1:]):  # Pula o cabeçalho
-                    linha_num += 1
-                    
-                    # Pular linhas completamente vazias
-                    if not any(row):
-                        continue
-                    
-                    try:
-                        # Criar dicionário com dados da linha usando headers mapeados
-                        dados_animal = {}
-                        for i, valor in enumerate(row):
-                            if i < len(headers):  # Usar headers já mapeados
-                                header_mapeado = headers[i]
-                                valor_processado = str(valor).strip() if valor else ''
-                                dados_animal[header_mapeado] = valor_processado
-                        
-                        # Validações básicas
-                        erros_linha = []
-                        
-                        # Validar identificação única
-                        identificacao = dados_animal.get('identificacao_unica', '').strip()
-                        if not identificacao:
-                            erros_linha.append('Identificação única é obrigatória')
-                        elif Animal.objects.filter(identificacao_unica=identificacao).exists():
-                            # Animal já existe - pular esta linha sem erro
-                            animais_duplicados.append(identificacao)
-                            continue
-
-                        # Validar espécie
-                        nome_especie = dados_animal.get('especie', '').strip()
-                        especie = None
-                        if nome_especie:
-                            try:
-                                # Tentar primeiro pelo nome_display (ex: "Bovino")
-                                especie = EspecieAnimal.objects.get(nome_display__iexact=nome_especie)
-                            except EspecieAnimal.DoesNotExist:
-                                try:
-                                    # Tentar pelo nome técnico (ex: "bovino")
-                                    especie = EspecieAnimal.objects.get(nome__iexact=nome_especie)
-                                except EspecieAnimal.DoesNotExist:
-                                    erros_linha.append(f'Espécie "{nome_especie}" não encontrada')
-                        else:
-                            erros_linha.append('Espécie é obrigatória')
-
-                        # Validar sexo
-                        sexo = dados_animal.get('sexo', '').strip().upper()
-                        if sexo not in ['M', 'F', 'MACHO', 'FEMEA', 'MASCULINO', 'FEMININO', 'FÊMEA', 'FÉMEA']:
-                            erros_linha.append('Sexo deve ser M/F ou Macho/Fêmea')
-                        
-                        # Normalizar sexo
-                        if sexo in ['MACHO', 'MASCULINO']:
-                            sexo = 'M'
-                        elif sexo in ['FEMEA', 'FEMININO', 'FÊMEA', 'FÉMEA']:
-                            sexo = 'F'
-
-                        # Validar data de nascimento
-                        data_nascimento_str = dados_animal.get('data_nascimento', '').strip()
-                        data_nascimento = None
-                        if data_nascimento_str:
-                            try:
-                                # Tentar diferentes formatos de data
-                                formatos = ['%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%m/%d/%Y']
-                                for formato in formatos:
-                                    try:
-                                        data_nascimento = datetime.strptime(data_nascimento_str, formato).date()
-                                        break
-                                    except ValueError:
-                                        continue
-                                
-                                if not data_nascimento:
-                                    erros_linha.append(f'Formato de data inválido: "{data_nascimento_str}". Use dd/mm/aaaa')
-                            except Exception:
-                                erros_linha.append(f'Data de nascimento inválida: "{data_nascimento_str}"')
-                        else:
-                            erros_linha.append('Data de nascimento é obrigatória')
-
-                        # Validar categoria
-                        categoria = dados_animal.get('categoria', '').strip().lower()
-                        if not categoria:
-                            erros_linha.append('Categoria é obrigatória')
-
-                        # Validar status
-                        status_animal = dados_animal.get('status', '').strip().lower()
-                        if status_animal not in ['ativo', 'inativo', 'vendido', 'morto', 'descartado']:
-                            erros_linha.append('Status deve ser "ativo", "inativo", "vendido", "morto" ou "descartado"')
-
-                        # Validar propriedade (se especificada)
-                        propriedade_nome = dados_animal.get('propriedade', '').strip()
-                        propriedade = None
-                        if propriedade_nome:
-                            # Buscar propriedade por nome
-                            try:
-                                propriedade = propriedades_usuario.get(nome__iexact=propriedade_nome)
-                            except Propriedade.DoesNotExist:
-                                erros_linha.append(f'Propriedade "{propriedade_nome}" não encontrada')
-                        else:
-                            # Se não especificada, usar a primeira propriedade do usuário
-                            propriedade = propriedades_usuario.first()
-
-                        # Validar raça (opcional)
-                        raca = None
-                        nome_raca = dados_animal.get('raca', '').strip()
-                        if nome_raca and especie:
-                            try:
-                                raca = RacaAnimal.objects.get(nome__iexact=nome_raca, especie=especie)
-                            except RacaAnimal.DoesNotExist:
-                                # Se não encontrar a raça, apenas avisa mas não impede a importação
-                                erros_linha.append(f'Aviso: Raça "{nome_raca}" não encontrada para a espécie "{nome_especie}". Animal será importado sem raça.')
-
-                        # Validar lote (opcional)
-                        lote = None
-                        lote_nome = dados_animal.get('lote_atual', '').strip()
-                        if lote_nome and propriedade:
-                            try:
-                                lote = Lote.objects.get(nome__iexact=lote_nome, propriedade=propriedade)
-                            except Lote.DoesNotExist:
-                                # Lote não encontrado é apenas um aviso
-                                pass
-
-                        # Validar peso (opcional)
-                        peso_atual = None
-                        peso_str = dados_animal.get('peso_atual', '').strip()
-                        if peso_str:
-                            try:
-                                peso_atual = float(peso_str.replace(',', '.'))
-                                if peso_atual <= 0:
-                                    peso_atual = None  # Ignora peso inválido
-                            except ValueError:
-                                # Peso inválido é ignorado
-                                peso_atual = None
-
-                        # Separar erros críticos de avisos
-                        erros_criticos = [erro for erro in erros_linha if not erro.startswith('Aviso:')]
-                        
-                        # Se houver erros críticos nesta linha, adiciona aos erros gerais
-                        if erros_criticos:
-                            erros.extend([f'Linha {linha_num}: {erro}' for erro in erros_criticos])
-                            continue
-
-                        # Criar objeto Animal se todas as validações passaram
-                        nome_registro = dados_animal.get('nome_registro', '').strip()
-                        if not nome_registro:
-                            nome_registro = f"Animal {identificacao}"  # Nome padrão se não informado
-                        
-                        observacoes = dados_animal.get('observacoes', '').strip()
-                        if not observacoes:
-                            observacoes = "Importado da planilha Excel"  # Observação padrão
-                        
-                        animal_data = {
-                            'identificacao_unica': identificacao,
-                            'nome_registro': nome_registro,
-                            'especie': especie,
-                            'raca': raca,
-                            'sexo': sexo,
-                            'data_nascimento': data_nascimento,
-                            'categoria': categoria,
-                            'status': status_animal,
-                            'propriedade': propriedade,
-                            'lote_atual': lote,
-                            'observacoes': observacoes,
-                        }
-
-                        # Criar o animal
-                        animal = Animal.objects.create(**animal_data)
-                        
-                        # Adicionar peso inicial se especificado
-                        if peso_atual:
-                            # Criar manejo de pesagem
-                            manejo_pesagem = Manejo.objects.create(
-                                propriedade=propriedade,
-                                tipo='pesagem',
-                                data_manejo=data_nascimento or timezone.now().date(),
-                                observacoes='Peso inicial importado da planilha',
-                                usuario=request.user
-                            )
-                            
-                            # Criar a pesagem vinculada ao manejo
-                            pesagem = Pesagem.objects.create(
-                                animal=animal,
-                                manejo=manejo_pesagem,
-                                data_pesagem=data_nascimento or timezone.now().date(),
-                                peso_kg=peso_atual,
-                                observacoes='Peso inicial importado da planilha'
-                            )
-                            
-                            # Associar o animal ao manejo
-                            manejo_pesagem.animais.add(animal)
-
-                        animais_validos.append(animal.identificacao_unica)
-
-                    except Exception as e:
-                        erros.append(f'Linha {linha_num}: Erro inesperado - {str(e)}')
-
-            # Resultado da importação
-            total_processados = linha_num - 1 - len(animais_duplicados)  # Exclui duplicados do total
-            
-            resultado = {
-                'status': 'sucesso' if not erros else ('parcial' if animais_validos else 'erro'),
-                'total_registros': linha_num - 1,
-                'sucessos': len(animais_validos),
-                'erros': len(erros),
-                'duplicados': len(animais_duplicados),
-                'animais_importados': animais_validos[:10],  # Primeiros 10 para não sobrecarregar
-                'animais_duplicados': animais_duplicados[:10],  # Primeiros 10 duplicados
-                'mensagens_erro': erros[:20],  # Primeiros 20 erros
-            }
+                importador = ImportadorAnimais(
+                    request.user, propriedades_usuario, headers)
+                importador.importar(chain([primeira_linha], rows))
 
-            # Mensagens informativas
-            mensagens = []
-            if animais_validos:
-                mensagens.append(f'{len(animais_validos)} animais importados com sucesso')
-            
-            if animais_duplicados:
-                mensagens.append(f'{len(animais_duplicados)} animais ignorados por já existirem')
-            
-            if erros:
-                mensagens.append(f'{len(erros)} erros encontrados durante a importação')
-            
-            resultado['message'] = ' • '.join(mensagens) if mensagens else 'Nenhum animal foi processado'
+            resultado = importador.resumo()
 
             # Determinar status HTTP correto
-            if animais_validos:
+            if importador.importados:
                 # Se há animais importados com sucesso, retorna 201 Created
                 http_status = status.HTTP_201_CREATED
-            elif animais_duplicados and not erros:
+            elif importador.duplicados and not importador.erros:
                 # Se só há duplicados (sem erros), retorna 200 OK pois o processamento foi bem-sucedido
                 http_status = status.HTTP_200_OK
             else:
@@ -1020,6 +808,9 @@ class AnimalViewSet(BaseViewSet):
                 {'error': f'Erro ao processar arquivo: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+        finally:
+            if wb is not None:
+                wb.close()
 
     @action(detail=False, methods=['get'])
     def template_importacao(self, request):
@@ -1293,7 +1084,7 @@ class AnimalViewSet(BaseViewSet):
         return response
 
 
-class LoteViewSet(BaseViewSet):
+class LoteViewSet(HistoricoRebanhoMixin, BaseViewSet):
     """ViewSet para lotes"""
     queryset = Lote.objects.all()
     serializer_class = LoteSerializer
@@ -1303,33 +1094,53 @@ class LoteViewSet(BaseViewSet):
     search_fields = ['nome', 'descricao', 'criterio_agrupamento']
     ordering_fields = ['nome', 'data_criacao']
     ordering = ['nome']
+    nivel_resumo = 'lote'
+    campo_resumo = 'lote'
 
     def get_queryset(self):
         queryset = super().get_queryset().select_related(
             'propriedade', 'area_atual'
         )
 
-        # Adiciona campos calculados
-        for lote in queryset:
-            lote.total_animais = lote.get_total_animais()
-            lote.total_ua = lote.get_total_ua()
-            lote.peso_medio = lote.get_peso_medio()
-            lote.gmd_medio = lote.get_gmd_medio()
+        # Adiciona campos calculados via subconsultas agregadas
+        return anotar_estatisticas_lotes(queryset, [
+            nome for nome in ESTATISTICAS_LOTE if self.campo_solicitado(nome)])
 
-        return queryset
+    def _com_gmd_medio(self, lotes):
+        if not self.campo_solicitado('gmd_medio'):
+            return lotes
+        return anexar_gmd_medio(lotes)
+
+    def list(self, request, *args, **kwargs):
+        """Lista lotes calculando o GMD médio apenas da página retornada"""
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(self._com_gmd_medio(page), many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(self._com_gmd_medio(queryset), many=True)
+        return Response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        lote = self._com_gmd_medio([self.get_object()])[0]
+        serializer = self.get_serializer(lote)
+        return Response(serializer.data)
 
     @action(detail=True, methods=['get'])
     def animais(self, request, pk=None):
         """Lista animais do lote"""
         lote = self.get_object()
-        animais = lote.animais.filter(status='ativo')
+        animais = AnimalListaSerializer.otimizar_queryset(
+            lote.animais.filter(status='ativo'))
         page = self.paginate_queryset(animais)
 
         if page is not None:
-            serializer = AnimalSerializer(page, many=True)
+            serializer = AnimalListaSerializer(page, many=True)
             return self.get_paginated_response(serializer.data)
 
-        serializer = AnimalSerializer(animais, many=True)
+        serializer = AnimalListaSerializer(animais, many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=['get'])
@@ -1337,11 +1148,11 @@ class LoteViewSet(BaseViewSet):
         """Estatísticas do lote"""
         lote = self.get_object()
 
-        # Estatísticas básicas
-        total_animais = lote.get_total_animais()
-        total_ua = lote.get_total_ua()
-        peso_medio = lote.get_peso_medio()
-        gmd_medio = lote.get_gmd_medio()
+        # Estatísticas básicas (anotadas em get_queryset)
+        total_animais = lote.total_animais
+        total_ua = lote.total_ua
+        peso_medio = lote.peso_medio
+        gmd_medio = calcular_gmd_medio_lotes([lote]).get(lote.pk)
 
         # Distribuição por categoria
         por_categoria = lote.animais.filter(status='ativo').values(
@@ -1371,7 +1182,9 @@ class LoteViewSet(BaseViewSet):
         """Lista lotes disponíveis para associação"""
         propriedade_id = request.query_params.get('propriedade_id')
         
-        queryset = self.get_queryset()
+        queryset = self.get_queryset().annotate(
+            total_femeas=subquery_total_animais_lote(sexo='F')
+        )
         
         if propriedade_id:
             queryset = queryset.filter(propriedade_id=propriedade_id)
@@ -1379,13 +1192,12 @@ class LoteViewSet(BaseViewSet):
         # Retorna informações resumidas dos lotes
         lotes_data = []
         for lote in queryset:
-            total_femeas = lote.animais.filter(sexo='F', status='ativo').count()
             lotes_data.append({
                 'id': str(lote.id),
                 'nome': lote.nome,
                 'descricao': lote.descricao,
-                'total_animais': lote.get_total_animais(),
-                'total_femeas': total_femeas,
+                'total_animais': lote.total_animais,
+                'total_femeas': lote.total_femeas,
                 'aptidao': lote.aptidao,
                 'finalidade': lote.finalidade,
                 'sistema_criacao': lote.sistema_criacao,
@@ -1408,6 +1220,8 @@ class ManejoViewSet(BaseViewSet):
     search_fields = ['observacoes']
     ordering_fields = ['data_manejo', 'tipo', 'custo_total']
     ordering = ['-data_manejo']
+    pagination_class = PaginacaoCursor
+    chaves_cursor = ('-data_manejo', '-id')
 
     def get_queryset(self):
         return super().get_queryset().select_related(
@@ -1447,6 +1261,8 @@ class PesagemViewSet(BaseViewSet):
     search_fields = ['equipamento_usado', 'observacoes']
     ordering_fields = ['data_pesagem', 'peso_kg']
     ordering = ['-data_pesagem']
+    pagination_class = PaginacaoCursor
+    chaves_cursor = ('-data_pesagem', '-id')
 
     def get_queryset(self):
         return super().get_queryset().select_related(
@@ -1455,18 +1271,24 @@ class PesagemViewSet(BaseViewSet):
 
     @action(detail=False, methods=['get'])
     def evolucao_rebanho(self, request):
-        """Evolução do peso médio do rebanho"""
-        queryset = self.get_queryset()
+        """
+        Evolução do peso médio do rebanho por período.
 
-        # Agrupa por mês
-        evolucao = queryset.extra(
-            select={'mes': "DATE_FORMAT(data_pesagem, '%%Y-%%m')"}
-        ).values('mes').annotate(
-            peso_medio=Avg('peso_kg'),
-            total_pesagens=Count('id')
-        ).order_by('mes')
+        Parâmetros: granularidade (dia, semana ou mes), data_inicio,
+        data_fim e os filtros da listagem (ex.: propriedade, animal).
+        """
+        try:
+            granularidade, inicio, fim = parametros_serie(request.query_params)
+            evolucao = serie_temporal(
+                self.filter_queryset(self.get_queryset()), 'data_pesagem',
+                {'peso_medio': Avg('peso_kg'), 'total_pesagens': Count('id')},
+                granularidade, inicio, fim,
+                vazio={'peso_medio': None, 'total_pesagens': 0},
+            )
+        except ParametroSerieInvalido as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response(list(evolucao))
+        return Response(evolucao)
 
 
 # ============================================================================
@@ -1505,31 +1327,19 @@ class EstacaoMontaViewSet(BaseViewSet):
 
     @action(detail=True, methods=['get'])
     def relatorio_reproducao(self, request, pk=None):
-        """Relatório de reprodução da estação"""
+        """Relatório de reprodução da estação (em cache)"""
         estacao = self.get_object()
-
-        # Estatísticas gerais
-        total_femeas = estacao.get_total_femeas()
-        taxa_prenhez = estacao.get_taxa_prenhez()
-
-        # Inseminações realizadas
-        total_inseminacoes = estacao.inseminacao_set.count()
-
-        # Diagnósticos
-        diagnosticos = estacao.inseminacao_set.aggregate(
-            positivos=Count('diagnosticos', filter=Q(
-                diagnosticos__resultado='positivo')),
-            negativos=Count('diagnosticos', filter=Q(
-                diagnosticos__resultado='negativo')),
-            inconclusivos=Count('diagnosticos', filter=Q(
-                diagnosticos__resultado='inconclusivo'))
-        )
+        indicadores = obter_indicadores_estacao(estacao, gerar_indicadores_estacao)
+        total_femeas = indicadores['total_femeas']
+        diagnosticos = indicadores['diagnosticos']
 
         return Response({
             'estatisticas_gerais': {
                 'total_femeas': total_femeas,
-                'taxa_prenhez': taxa_prenhez,
-                'total_inseminacoes': total_inseminacoes
+                'taxa_prenhez': (
+                    diagnosticos['positivos'] / total_femeas * 100
+                    if total_femeas else 0),
+                'total_inseminacoes': indicadores['inseminacoes_realizadas']
             },
             'diagnosticos': diagnosticos
         })
@@ -1540,14 +1350,18 @@ class EstacaoMontaViewSet(BaseViewSet):
         estacao = self.get_object()
         
         # Lotes associados com informações resumidas
+        lotes = estacao.lotes_participantes.annotate(
+            total_animais=subquery_total_animais_lote(),
+            total_femeas=subquery_total_animais_lote(sexo='F'),
+        )
         lotes_data = []
-        for lote in estacao.lotes_participantes.all():
+        for lote in lotes:
             lotes_data.append({
                 'id': str(lote.id),
                 'nome': lote.nome,
                 'descricao': lote.descricao,
-                'total_animais': lote.get_total_animais(),
-                'total_femeas': lote.animais.filter(sexo='F', status='ativo').count(),
+                'total_animais': lote.total_animais,
+                'total_femeas': lote.total_femeas,
                 'aptidao': lote.aptidao,
                 'finalidade': lote.finalidade,
             })
@@ -1588,66 +1402,10 @@ class EstacaoMontaViewSet(BaseViewSet):
 
     @action(detail=True, methods=['get'])
     def dashboard(self, request, pk=None):
-        """Dashboard com estatísticas da estação"""
+        """Dashboard com estatísticas e evolução semanal da estação (em cache)"""
         estacao = self.get_object()
-        
-        # Contadores básicos
-        total_femeas = estacao.get_total_femeas()
-        inseminacoes_realizadas = estacao.inseminacao_set.count()
-        
-        # Diagnósticos
-        diagnosticos_realizados = DiagnosticoGestacao.objects.filter(
-            inseminacao__estacao_monta=estacao
-        ).count()
-        
-        diagnosticos_positivos = DiagnosticoGestacao.objects.filter(
-            inseminacao__estacao_monta=estacao,
-            resultado='positivo'
-        ).count()
-        
-        # Partos
-        partos_realizados = Parto.objects.filter(
-            mae__inseminacoes__estacao_monta=estacao
-        ).distinct().count()
-        
-        # Cálculo de pendências (estimativas baseadas em prazos)
-        from datetime import datetime, timedelta
-        
-        # Inseminações que deveriam ter diagnóstico (30-60 dias)
-        data_limite_diagnostico = datetime.now().date() - timedelta(days=30)
-        inseminacoes_sem_diagnostico = estacao.inseminacao_set.filter(
-            data_inseminacao__lte=data_limite_diagnostico
-        ).exclude(
-            diagnosticos__isnull=False
-        ).count()
-        
-        # Gestações que deveriam ter parido (período de gestação + margem)
-        gestacoes_sem_parto = DiagnosticoGestacao.objects.filter(
-            inseminacao__estacao_monta=estacao,
-            resultado='positivo'
-        ).exclude(
-            inseminacao__animal__partos__data_parto__gt=F('data_diagnostico')
-        ).count()
-        
-        # Taxas
-        taxa_prenhez = (diagnosticos_positivos / inseminacoes_realizadas * 100) if inseminacoes_realizadas > 0 else 0
-        taxa_parto = (partos_realizados / diagnosticos_positivos * 100) if diagnosticos_positivos > 0 else 0
-        
-        return Response({
-            'estacao_id': str(estacao.id),
-            'estacao_nome': estacao.nome,
-            'total_femeas': total_femeas,
-            'inseminacoes_realizadas': inseminacoes_realizadas,
-            'diagnosticos_realizados': diagnosticos_realizados,
-            'partos_realizados': partos_realizados,
-            'inseminacoes_pendentes': 0,  # Placeholder - definir lógica específica
-            'diagnosticos_pendentes': inseminacoes_sem_diagnostico,
-            'partos_pendentes': gestacoes_sem_parto,
-            'taxa_prenhez': round(taxa_prenhez, 2),
-            'taxa_parto': round(taxa_parto, 2),
-            'progresso_estacao': round((inseminacoes_realizadas / total_femeas * 100) if total_femeas > 0 else 0, 2),
-            'evolucao_temporal': []  # Placeholder - implementar dados temporais se necessário
-        })
+        return Response(
+            obter_indicadores_estacao(estacao, gerar_indicadores_estacao))
 
 
 class ProtocoloIATFViewSet(BaseViewSet):
@@ -1711,47 +1469,14 @@ class InseminacaoViewSet(BaseViewSet):
     @action(detail=False, methods=['get'])
     def opcoes_cadastro(self, request):
         """Retorna dados necessários para cadastro de inseminação"""
-        from datetime import datetime, timedelta
-        
-        # Data limite para considerar inseminações recentes (últimos 90 dias)
-        data_limite = datetime.now().date() - timedelta(days=90)
-        
-        # Buscar fêmeas que estão "ocupadas" (inseminadas e ainda não disponíveis)
-        femeas_ocupadas = set()
-        
-        # 1. Fêmeas com inseminações recentes sem diagnóstico
-        inseminacoes_sem_diagnostico = Inseminacao.objects.filter(
-            animal__propriedade__proprietario=request.user,
-            data_inseminacao__gte=data_limite,
-            diagnosticos__isnull=True
-        ).values_list('animal_id', flat=True)
-        femeas_ocupadas.update(inseminacoes_sem_diagnostico)
-        
-        # 2. Fêmeas com diagnóstico positivo que ainda não pariram
-        # Buscar diagnósticos positivos
-        diagnosticos_positivos = DiagnosticoGestacao.objects.filter(
-            inseminacao__animal__propriedade__proprietario=request.user,
-            resultado='positivo'
-        ).select_related('inseminacao__animal')
-        
-        for diagnostico in diagnosticos_positivos:
-            animal = diagnostico.inseminacao.animal
-            # Verificar se houve parto após este diagnóstico
-            parto_posterior = Parto.objects.filter(
-                mae=animal,
-                data_parto__gt=diagnostico.data_diagnostico
-            ).exists()
-            
-            if not parto_posterior:
-                femeas_ocupadas.add(animal.id)
-        
-        # Animais fêmeas disponíveis para inseminação
-        femeas = Animal.objects.filter(
+        # Fêmeas vazias: sem inseminação aguardando diagnóstico, gestação
+        # em curso nem período de espera voluntária após o parto
+        femeas = anotar_estado_reprodutivo(Animal.objects.filter(
             propriedade__proprietario=request.user,
             sexo='F',
             status='ativo'
-        ).exclude(
-            id__in=femeas_ocupadas
+        )).filter(
+            estado_reprodutivo='vazia'
         ).values('id', 'identificacao_unica', 'nome_registro', 'sexo', 'data_nascimento', 'categoria').order_by('identificacao_unica')[:50]
 
         # Reprodutores machos do usuário (limitado a 20)
@@ -1839,18 +1564,13 @@ class InseminacaoViewSet(BaseViewSet):
     @action(detail=False, methods=['get'])
     def pendentes_diagnostico(self, request):
         """Inseminações pendentes de diagnóstico"""
-        from datetime import datetime, timedelta
-        
-        # Inseminações dos últimos 30-60 dias que não têm diagnóstico
-        data_limite_inicio = datetime.now().date() - timedelta(days=60)
-        data_limite_fim = datetime.now().date() - timedelta(days=30)
-        
-        queryset = self.get_queryset().filter(
-            data_inseminacao__range=[data_limite_inicio, data_limite_fim]
-        ).exclude(
-            diagnosticos__isnull=False
-        )
-        
+        # Última inseminação de fêmeas ainda inseminadas (sem diagnóstico
+        # conclusivo) cujo prazo de diagnóstico da propriedade já passou
+        femeas = anotar_estado_reprodutivo(Animal.objects.filter(
+            propriedade__proprietario=request.user, sexo='F'
+        )).filter(prazo_diagnostico_vencido(), estado_reprodutivo='inseminada')
+        queryset = self.get_queryset().filter(da_inseminacao_atual(femeas))
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -1873,21 +1593,21 @@ class DiagnosticoGestacaoViewSet(BaseViewSet):
     @action(detail=False, methods=['get'])
     def pendentes_parto(self, request):
         """Gestações pendentes de parto"""
-        from datetime import datetime, timedelta
-        
-        # Diagnósticos positivos com parto previsto nos próximos 30 dias
-        data_limite = datetime.now().date() + timedelta(days=30)
-        
-        queryset = self.get_queryset().filter(
+        # Diagnósticos positivos da gestação em curso (fêmea ainda prenhe)
+        # com parto previsto nos próximos 30 dias
+        hoje = timezone.now().date()
+        femeas = anotar_estado_reprodutivo(Animal.objects.filter(
+            propriedade__proprietario=request.user, sexo='F'
+        )).filter(estado_reprodutivo='prenhe')
+        diagnosticos = list(self.get_queryset().filter(
+            filtro_parto_previsto(hoje, hoje + timedelta(days=30)),
+            da_inseminacao_atual(femeas, prefixo='inseminacao__'),
             resultado='positivo',
-            data_parto_prevista__lte=data_limite,
-            data_parto_prevista__gte=datetime.now().date()
-        ).exclude(
-            # Excluir os que já tiveram parto registrado
-            inseminacao__animal__partos_mae__data_parto__isnull=False
-        )
-        
-        serializer = self.get_serializer(queryset, many=True)
+        ).select_related('inseminacao__animal'))
+        for diagnostico in diagnosticos:
+            diagnostico.data_parto_prevista = data_parto_prevista(diagnostico.inseminacao)
+
+        serializer = self.get_serializer(diagnosticos, many=True)
         return Response(serializer.data)
 
 
@@ -1911,8 +1631,9 @@ class PartoViewSet(BaseViewSet):
 # VIEWSETS DE SANIDADE
 # ============================================================================
 
-class VacinaViewSet(viewsets.ModelViewSet):
+class VacinaViewSet(CacheReferenciaMixin, viewsets.ModelViewSet):
     """ViewSet para vacinas"""
+    nome_referencia = 'vacinas'
     queryset = Vacina.objects.all()
     serializer_class = VacinaSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -1924,8 +1645,9 @@ class VacinaViewSet(viewsets.ModelViewSet):
         return self.queryset.filter(ativa=True)
 
 
-class MedicamentoViewSet(viewsets.ModelViewSet):
+class MedicamentoViewSet(CacheReferenciaMixin, viewsets.ModelViewSet):
     """ViewSet para medicamentos"""
+    nome_referencia = 'medicamentos'
     queryset = Medicamento.objects.all()
     serializer_class = MedicamentoSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -2014,13 +1736,31 @@ class ContaFinanceiraViewSet(BaseViewSet):
     ordering = ['nome']
 
     def get_queryset(self):
-        queryset = super().get_queryset().select_related('propriedade')
+        # O saldo atual é mantido na própria conta pelos lançamentos
+        return super().get_queryset().select_related('propriedade')
 
-        # Adiciona saldo atual
-        for conta in queryset:
-            conta.saldo_atual = conta.get_saldo_atual()
+    @action(detail=True, methods=['get'])
+    def saldo(self, request, pk=None):
+        """
+        Saldo da conta ao fim de uma data (parâmetro data, padrão: hoje),
+        a partir dos checkpoints mensais
+        """
+        conta = self.get_object()
+        valor = request.query_params.get('data')
+        try:
+            data = parse_date(valor) if valor else timezone.now().date()
+        except ValueError:
+            data = None
+        if data is None:
+            return Response(
+                {'error': f'data inválida: "{valor}". Use aaaa-mm-dd'},
+                status=status.HTTP_400_BAD_REQUEST)
 
-        return queryset
+        return Response({
+            'conta': conta.pk,
+            'data': data,
+            'saldo': conta.get_saldo_em(data),
+        })
 
 
 class CategoriaFinanceiraViewSet(BaseViewSet):
@@ -2047,6 +1787,8 @@ class LancamentoFinanceiroViewSet(BaseViewSet):
     search_fields = ['descricao', 'observacoes']
     ordering_fields = ['data_lancamento', 'valor', 'tipo']
     ordering = ['-data_lancamento']
+    pagination_class = PaginacaoCursor
+    chaves_cursor = ('-data_lancamento', '-id')
 
     def get_queryset(self):
         return super().get_queryset().select_related(
@@ -2054,30 +1796,84 @@ class LancamentoFinanceiroViewSet(BaseViewSet):
             'manejo_relacionado', 'animal_relacionado', 'usuario'
         )
 
+    # Parâmetros que o resumo mensal consegue atender
+    PARAMETROS_RESUMO = {'propriedade', 'tipo', 'categoria', 'conta_origem',
+                         'data_inicio', 'data_fim', 'granularidade',
+                         'ordering', 'format'}
+
+    def _usar_resumo_mensal(self, granularidade, inicio, fim):
+        """Série mensal com meses inteiros e filtros suportados pelo resumo"""
+        informados = {nome for nome, valor in self.request.query_params.items() if valor}
+        return (
+            granularidade == 'mes'
+            and informados <= self.PARAMETROS_RESUMO
+            and (inicio is None or inicio.day == 1)
+            and (fim is None or fim == fim_do_mes(fim))
+        )
+
+    def _filtrar_fluxo(self, parametros, pelo_resumo):
+        """Lançamentos (ou linhas do resumo mensal) filtrados pelos parâmetros"""
+        if pelo_resumo:
+            filtro = ResumoFinanceiroFilter(
+                parametros, request=self.request,
+                queryset=ResumoFinanceiroMensal.objects.filter(
+                    propriedade__in=Propriedade.objects.filter(
+                        proprietario=self.request.user)))
+        else:
+            filtro = self.filterset_class(
+                parametros, queryset=self.get_queryset(), request=self.request)
+        if not filtro.is_valid():
+            raise translate_validation(filtro.errors)
+        if pelo_resumo:
+            return filtro.qs
+        return SearchFilter().filter_queryset(self.request, filtro.qs, self)
+
     @action(detail=False, methods=['get'])
     def fluxo_caixa(self, request):
-        """Fluxo de caixa por período"""
-        data_inicio = request.query_params.get('data_inicio')
-        data_fim = request.query_params.get('data_fim')
+        """
+        Fluxo de caixa por período com saldo acumulado.
 
-        queryset = self.get_queryset()
+        Parâmetros: granularidade (dia, semana ou mes), data_inicio,
+        data_fim e os filtros da listagem (ex.: propriedade). Com
+        data_inicio, o saldo acumulado parte do resultado dos lançamentos
+        anteriores a ela. Séries mensais de meses inteiros são lidas do
+        resumo financeiro mensal.
+        """
+        try:
+            granularidade, inicio, fim = parametros_serie(request.query_params)
+        except ParametroSerieInvalido as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        if data_inicio:
-            queryset = queryset.filter(data_lancamento__gte=data_inicio)
-        if data_fim:
-            queryset = queryset.filter(data_lancamento__lte=data_fim)
+        pelo_resumo = self._usar_resumo_mensal(granularidade, inicio, fim)
+        campo_data, campo_valor = (
+            ('mes', 'total') if pelo_resumo else ('data_lancamento', 'valor'))
+        entradas = Sum(campo_valor, filter=Q(tipo='entrada'), default=0)
+        saidas = Sum(campo_valor, filter=Q(tipo='saida'), default=0)
+
+        try:
+            fluxo = serie_temporal(
+                self._filtrar_fluxo(request.query_params, pelo_resumo), campo_data,
+                {'entradas': entradas, 'saidas': saidas},
+                granularidade, inicio, fim,
+            )
+        except ParametroSerieInvalido as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        saldo_anterior = 0
+        if inicio:
+            # Mesmos filtros, sem o limite inferior de data
+            parametros = request.query_params.copy()
+            parametros.pop('data_inicio')
+            totais = self._filtrar_fluxo(parametros, pelo_resumo).filter(
+                **{f'{campo_data}__lt': inicio}
+            ).order_by().aggregate(entradas=entradas, saidas=saidas)
+            saldo_anterior = totais['entradas'] - totais['saidas']
 
-        # Agrupa por mês
-        fluxo = queryset.extra(
-            select={'mes': "DATE_FORMAT(data_lancamento, '%%Y-%%m')"}
-        ).values('mes').annotate(
-            entradas=Sum('valor', filter=Q(tipo='entrada')),
-            saidas=Sum('valor', filter=Q(tipo='saida')),
-            saldo=Sum('valor', filter=Q(tipo='entrada')) -
-            Sum('valor', filter=Q(tipo='saida'))
-        ).order_by('mes')
+        for periodo in fluxo:
+            periodo['saldo'] = periodo['entradas'] - periodo['saidas']
+        acumular(fluxo, 'saldo', inicial=saldo_anterior)
 
-        return Response(list(fluxo))
+        return Response(fluxo)
 
 
 # ============================================================================
@@ -2128,6 +1924,8 @@ class HistoricoLoteAnimalViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['motivo_movimentacao']
     ordering_fields = ['data_entrada', 'data_saida']
     ordering = ['-data_entrada']
+    pagination_class = PaginacaoCursor
+    chaves_cursor = ('-data_entrada', '-id')
 
     def get_queryset(self):
         return self.queryset.select_related(
@@ -2157,3 +1955,145 @@ class HistoricoOcupacaoAreaViewSet(viewsets.ReadOnlyModelViewSet):
             historico.periodo_ocupacao = historico.get_periodo_ocupacao()
 
         return queryset
+
+
+# ============================================================================
+# VIEWSETS DE TAREFAS ASSÍNCRONAS
+# ============================================================================
+
+class TarefaProcessamentoViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet para tarefas assíncronas de importação e exportação.
+
+    As ações de envio apenas registram a tarefa e a enfileiram no Celery;
+    o andamento é acompanhado consultando a própria tarefa.
+    """
+    queryset = TarefaProcessamento.objects.all()
+    serializer_class = TarefaProcessamentoSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['tipo', 'status']
+    ordering_fields = ['data_criacao', 'status']
+    ordering = ['-data_criacao']
+
+    def get_queryset(self):
+        return self.queryset.select_related('propriedade').filter(
+            usuario=self.request.user)
+
+    def _enfileirar(self, tarefa, task):
+        """Enfileira a tarefa após o commit e devolve seu estado atual"""
+        from django.db import transaction
+
+        transaction.on_commit(lambda: task.delay(str(tarefa.id)))
+        tarefa.refresh_from_db()
+        serializer = self.get_serializer(tarefa)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['post'])
+    def importar_animais(self, request):
+        """Recebe uma planilha .xlsx e agenda sua importação"""
+        from django.conf import settings
+
+        from ...tasks import importar_animais_planilha
+
+        if 'arquivo' not in request.FILES:
+            return Response(
+                {'error': 'Arquivo não enviado'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        arquivo = request.FILES['arquivo']
+        if not arquivo.name.lower().endswith('.xlsx'):
+            return Response(
+                {'error': 'Formato de arquivo inválido. Use apenas .xlsx'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        tamanho_maximo = settings.TAREFAS_TAMANHO_MAXIMO_UPLOAD
+        if arquivo.size > tamanho_maximo:
+            return Response(
+                {'error': f'Arquivo muito grande. Máximo {tamanho_maximo // (1024 * 1024)}MB permitido'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not Propriedade.objects.filter(proprietario=request.user).exists():
+            return Response(
+                {'error': 'Usuário não possui propriedades cadastradas'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        tarefa = TarefaProcessamento.objects.create(
+            usuario=request.user,
+            tipo='importacao_animais',
+            arquivo_entrada=arquivo,
+        )
+        return self._enfileirar(tarefa, importar_animais_planilha)
+
+    @action(detail=False, methods=['post'])
+    def exportar_animais(self, request):
+        """Agenda a exportação de animais com os mesmos filtros de exportar_excel"""
+        from ...tasks import exportar_animais_planilha
+
+        propriedade = None
+        propriedade_id = request.data.get('propriedade_id')
+        if propriedade_id:
+            propriedade = Propriedade.objects.filter(
+                id=propriedade_id, proprietario=request.user).first()
+            if propriedade is None:
+                return Response(
+                    {'error': 'Você não tem permissão para exportar dados desta propriedade'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+
+        parametros = {
+            campo: request.data.get(campo)
+            for campo in ('especie_id', 'status', 'search',
+                          'incluir_genealogia', 'incluir_estatisticas')
+            if request.data.get(campo) not in (None, '')
+        }
+        tarefa = TarefaProcessamento.objects.create(
+            usuario=request.user,
+            propriedade=propriedade,
+            tipo='exportacao_animais',
+            parametros=parametros,
+        )
+        return self._enfileirar(tarefa, exportar_animais_planilha)
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """Baixa o arquivo gerado pela tarefa"""
+        import os
+
+        from django.http import FileResponse
+
+        tarefa = self.get_object()
+        if tarefa.status != 'concluida' or not tarefa.arquivo_resultado:
+            return Response(
+                {'error': 'Arquivo ainda não disponível'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        return FileResponse(
+            tarefa.arquivo_resultado.open('rb'),
+            as_attachment=True,
+            filename=os.path.basename(tarefa.arquivo_resultado.name)
+        )
+
+
+# ============================================================================
+# MONITORAMENTO
+# ============================================================================
+
+class MonitorConsultasViewSet(viewsets.ViewSet):
+    """Métricas de consultas SQL por endpoint (apenas administradores)"""
+    permission_classes = [permissions.IsAdminUser]
+
+    def list(self, request):
+        """Relatório por endpoint: consultas, tempos, duplicadas e orçamento"""
+        return Response(relatorio_endpoints())
+
+    @action(detail=False, methods=['post'])
+    def zerar(self, request):
+        """Apaga as métricas acumuladas"""
+        zerar_metricas()
+        return Response(status=status.HTTP_204_NO_CONTENT)
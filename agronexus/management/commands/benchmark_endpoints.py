@@ -0,0 +1,178 @@
+"""
+Comando para medir os principais endpoints com rebanhos sintéticos grandes
+"""
+import json
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from agronexus.models import Propriedade
+from agronexus.utils.benchmark import comparar_resultados, executar_benchmark
+from agronexus.utils.dados_sinteticos import gerar_propriedades
+
+USUARIO_BENCHMARK = 'benchmark'
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera dados sintéticos (opcional), mede tempo e consultas dos '
+        'principais endpoints e grava o resultado em JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--gerar',
+            action='store_true',
+            help='Gera as propriedades sintéticas antes de medir',
+        )
+        parser.add_argument('--propriedades', type=int, default=1,
+                            help='Propriedades geradas (padrão: 1)')
+        parser.add_argument('--animais', type=int, default=5000,
+                            help='Animais por propriedade (padrão: 5000)')
+        parser.add_argument('--pesagens', type=int, default=6,
+                            help='Pesagens por animal (padrão: 6)')
+        parser.add_argument('--inseminacoes', type=int, default=1000,
+                            help='Inseminações por propriedade (padrão: 1000)')
+        parser.add_argument('--lancamentos', type=int, default=2000,
+                            help='Lançamentos financeiros por propriedade (padrão: 2000)')
+        parser.add_argument('--semente', type=int, default=42,
+                            help='Semente dos dados gerados (padrão: 42)')
+        parser.add_argument('--processos', type=int, default=1,
+                            help='Processos gerando propriedades em paralelo (padrão: 1)')
+        parser.add_argument(
+            '--usuario',
+            default=USUARIO_BENCHMARK,
+            help=f'Usuário dono das propriedades medidas (padrão: {USUARIO_BENCHMARK})',
+        )
+        parser.add_argument('--propriedade', help='ID da propriedade medida')
+        parser.add_argument('--repeticoes', type=int, default=5,
+                            help='Repetições medidas por endpoint (padrão: 5)')
+        parser.add_argument(
+            '--saida',
+            help='Arquivo JSON do resultado (padrão: BENCHMARK_DIR/benchmark_<data>.json)',
+        )
+        parser.add_argument(
+            '--comparar',
+            help='JSON de uma execução anterior para detectar regressões',
+        )
+        parser.add_argument(
+            '--tolerancia',
+            type=float,
+            default=0.2,
+            help='Aumento aceito na mediana de tempo (fração, padrão: 0.2)',
+        )
+
+    def handle(self, *args, **options):
+        usuario = self._obter_usuario(options['usuario'], options['gerar'])
+
+        if options['gerar']:
+            self._gerar_dados(usuario, options)
+
+        propriedade = None
+        if options.get('propriedade'):
+            propriedade = Propriedade.objects.filter(
+                pk=options['propriedade'], proprietario=usuario).first()
+            if propriedade is None:
+                raise CommandError('Propriedade não encontrada para o usuário')
+
+        self.stdout.write(
+            f"{'Caso':<30} {'Status':>6} {'Mediana ms':>11} "
+            f"{'Máx ms':>9} {'Cons.':>6} {'Bytes':>10}")
+
+        def exibir(nome, resultado):
+            self.stdout.write(
+                f"{nome:<30} {resultado['status']:>6} "
+                f"{resultado['tempo_ms_mediana']:>11} "
+                f"{resultado['tempo_ms_max']:>9} {resultado['consultas']:>6} "
+                f"{resultado['bytes']:>10}")
+
+        try:
+            resultado = executar_benchmark(
+                usuario, propriedade, repeticoes=options['repeticoes'],
+                ao_medir=exibir)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        saida = self._gravar(resultado, options.get('saida'))
+        self.stdout.write(self.style.SUCCESS(f'Resultado gravado em {saida}'))
+
+        if options.get('comparar'):
+            self._comparar(resultado, options['comparar'], options['tolerancia'])
+
+    def _obter_usuario(self, username, criar):
+        Usuario = get_user_model()
+        if criar:
+            usuario, _ = Usuario.objects.get_or_create(
+                username=username,
+                defaults={'email': f'{username}@agronexus.local'})
+            return usuario
+        try:
+            return Usuario.objects.get(username=username)
+        except Usuario.DoesNotExist:
+            raise CommandError(
+                f'Usuário {username} não encontrado (use --gerar para criar)')
+
+    def _gerar_dados(self, usuario, options):
+        processos = options['processos']
+        if processos > 1 and connection.vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING(
+                'SQLite não suporta escrita concorrente; usando 1 processo'))
+            processos = 1
+
+        primeiro_indice = Propriedade.objects.filter(proprietario=usuario).count()
+        tarefas = [
+            {
+                'usuario_id': usuario.pk,
+                'indice': indice,
+                'animais': options['animais'],
+                'pesagens_por_animal': options['pesagens'],
+                'inseminacoes': options['inseminacoes'],
+                'lancamentos': options['lancamentos'],
+            }
+            for indice in range(primeiro_indice, primeiro_indice + options['propriedades'])
+        ]
+        inicio = time.perf_counter()
+        for totais in gerar_propriedades(tarefas, options['semente'], processos):
+            registros = sum(
+                valor for valor in totais.values() if isinstance(valor, int))
+            self.stdout.write(
+                f"Propriedade {totais['propriedade']}: {registros} registros")
+        self.stdout.write(
+            f'Dados gerados em {time.perf_counter() - inicio:.1f}s')
+
+    def _gravar(self, resultado, saida):
+        if saida:
+            caminho = Path(saida)
+        else:
+            caminho = Path(settings.BENCHMARK_DIR) / (
+                f"benchmark_{timezone.now().strftime('%Y%m%d_%H%M%S')}.json")
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        caminho.write_text(json.dumps(resultado, indent=2, ensure_ascii=False))
+        return caminho
+
+    def _comparar(self, resultado, arquivo, tolerancia):
+        try:
+            anterior = json.loads(Path(arquivo).read_text())
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Não foi possível ler {arquivo}: {e}')
+
+        comparacao = comparar_resultados(resultado, anterior, tolerancia)
+        regressoes = [item for item in comparacao if item['regressao']]
+        for item in comparacao:
+            linha = (
+                f"{item['caso']:<30} {item['tempo_ms_anterior']:>9} -> "
+                f"{item['tempo_ms_atual']:>9} ms ({item['variacao']:+.1%}), "
+                f"consultas {item['consultas_anterior']} -> {item['consultas_atual']}"
+            )
+            self.stdout.write(
+                self.style.WARNING(linha) if item['regressao'] else linha)
+
+        if regressoes:
+            raise CommandError(
+                f'{len(regressoes)} caso(s) com regressão acima da tolerância')
+        self.stdout.write(self.style.SUCCESS('Nenhuma regressão detectada'))
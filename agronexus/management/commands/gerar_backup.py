@@ -0,0 +1,41 @@
+"""
+Comando para gerar backup dos dados em JSON Lines compactado
+"""
+from django.core.management.base import BaseCommand
+
+from agronexus.utils.backup import EXTENSOES_COMPRESSAO, gerar_backup
+
+
+class Command(BaseCommand):
+    help = 'Gera backup completo ou incremental dos dados principais'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Inclui apenas registros alterados desde o último backup',
+        )
+        parser.add_argument(
+            '--compressao',
+            choices=sorted(EXTENSOES_COMPRESSAO),
+            help='Formato de compressão (padrão: BACKUP_COMPRESSAO)',
+        )
+        parser.add_argument(
+            '--destino',
+            help='Diretório dos backups (padrão: BACKUP_DIR)',
+        )
+
+    def handle(self, *args, **options):
+        manifesto = gerar_backup(
+            diretorio=options.get('destino'),
+            incremental=options['incremental'],
+            compressao=options.get('compressao'),
+        )
+
+        for nome, info in manifesto['modelos'].items():
+            self.stdout.write(f"  {nome}: {info['registros']} registros")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Backup {manifesto['tipo']} criado em {manifesto['diretorio']}")
+        )
@@ -0,0 +1,50 @@
+"""
+Comando para gerar (ou reconstruir) o resumo diário do rebanho de um período
+"""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from agronexus.models import Propriedade
+from agronexus.utils.resumo_rebanho import reconstruir_resumo_rebanho
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera o resumo diário do rebanho (animais, UA, peso médio e taxa de '
+        'ocupação por propriedade, lote e área) a partir dos históricos e '
+        'das pesagens'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--inicio', type=date.fromisoformat,
+            help='Primeiro dia (aaaa-mm-dd; padrão: ontem)',
+        )
+        parser.add_argument(
+            '--fim', type=date.fromisoformat,
+            help='Último dia (aaaa-mm-dd; padrão: ontem)',
+        )
+        parser.add_argument(
+            '--propriedade',
+            help='ID da propriedade (gera todas se não informado)',
+        )
+
+    def handle(self, *args, **options):
+        ontem = timezone.now().date() - timedelta(days=1)
+        inicio = options.get('inicio') or ontem
+        fim = options.get('fim') or max(inicio, ontem)
+        if inicio > fim:
+            raise CommandError('--inicio deve ser anterior a --fim')
+
+        propriedades = None
+        if options.get('propriedade'):
+            propriedades = list(Propriedade.objects.filter(
+                pk=options['propriedade']).values_list('pk', flat=True))
+
+        total = reconstruir_resumo_rebanho(inicio, fim, propriedades)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{total} linhas de resumo gravadas de {inicio} a {fim}!')
+        )
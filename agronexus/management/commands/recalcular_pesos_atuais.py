@@ -0,0 +1,31 @@
+"""
+Comando para reconstruir o snapshot de pesagens dos animais
+"""
+from django.core.management.base import BaseCommand
+
+from agronexus.models import Animal
+from agronexus.utils.cache import invalidar_propriedade
+from agronexus.utils.estatisticas import recalcular_pesos_atuais
+
+
+class Command(BaseCommand):
+    help = 'Recalcula peso atual e pesagem anterior dos animais a partir das pesagens'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--propriedade',
+            help='ID da propriedade (recalcula todas se não informado)',
+        )
+
+    def handle(self, *args, **options):
+        animais = Animal.objects.all()
+        if options.get('propriedade'):
+            animais = animais.filter(propriedade_id=options['propriedade'])
+
+        total = recalcular_pesos_atuais(animais)
+        # O peso atual entra na taxa de ocupação do dashboard
+        invalidar_propriedade(*animais.order_by().values_list(
+            'propriedade_id', flat=True).distinct())
+        self.stdout.write(
+            self.style.SUCCESS(f'{total} animais recalculados com sucesso!')
+        )
@@ -0,0 +1,35 @@
+"""
+Comando para reconstruir o resumo financeiro mensal a partir dos lançamentos
+"""
+from django.core.management.base import BaseCommand
+
+from agronexus.models import Propriedade
+from agronexus.utils.cache import invalidar_propriedade
+from agronexus.utils.resumo_financeiro import reconstruir_resumo_financeiro
+
+
+class Command(BaseCommand):
+    help = (
+        'Reconstrói os totais mensais por conta, categoria e tipo dos '
+        'lançamentos financeiros e o livro de saldos das contas'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--propriedade',
+            help='ID da propriedade (reconstrói todas se não informado)',
+        )
+
+    def handle(self, *args, **options):
+        propriedades = Propriedade.objects.all()
+        if options.get('propriedade'):
+            propriedades = propriedades.filter(pk=options['propriedade'])
+
+        ids = list(propriedades.values_list('pk', flat=True))
+        total = reconstruir_resumo_financeiro(
+            ids if options.get('propriedade') else None)
+        # O resumo alimenta o financeiro do dashboard
+        invalidar_propriedade(*ids)
+        self.stdout.write(
+            self.style.SUCCESS(f'{total} linhas de resumo gravadas com sucesso!')
+        )
@@ -0,0 +1,114 @@
+"""
+Comando para exibir as métricas de consultas SQL por endpoint
+"""
+import json
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+from agronexus.middleware import nome_endpoint
+from agronexus.utils.monitoramento import (RegistroConsultas,
+                                           orcamento_excedido,
+                                           registrar_requisicao,
+                                           relatorio_endpoints, zerar_metricas)
+
+
+class Command(BaseCommand):
+    help = (
+        'Mostra consultas, tempo de SQL e consultas duplicadas por endpoint '
+        'registrados pelo MonitorConsultasMiddleware'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            action='append',
+            default=[],
+            help='Executa um GET na URL e registra as métricas (pode repetir)',
+        )
+        parser.add_argument(
+            '--usuario',
+            help='Usuário autenticado nas requisições de --url',
+        )
+        parser.add_argument(
+            '--limite',
+            type=int,
+            default=20,
+            help='Quantidade de endpoints exibidos',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Exibe o relatório completo em JSON',
+        )
+        parser.add_argument(
+            '--zerar',
+            action='store_true',
+            help='Apaga as métricas acumuladas',
+        )
+
+    def handle(self, *args, **options):
+        if options['zerar']:
+            zerar_metricas()
+            self.stdout.write(self.style.SUCCESS('Métricas zeradas'))
+            return
+
+        if options['url']:
+            self._medir_urls(options['url'], options.get('usuario'))
+
+        relatorio = relatorio_endpoints()[:options['limite']]
+        if options['json']:
+            self.stdout.write(json.dumps(relatorio, indent=2, ensure_ascii=False))
+            return
+
+        if not relatorio:
+            self.stdout.write('Nenhuma métrica registrada')
+            return
+
+        self.stdout.write(
+            f"{'Endpoint':<45} {'Req':>5} {'Cons.':>7} {'Máx':>5} "
+            f"{'SQL ms':>9} {'Resp. ms':>9} {'Orç.':>5}"
+        )
+        for item in relatorio:
+            linha = (
+                f"{item['endpoint']:<45} {item['requisicoes']:>5} "
+                f"{item['consultas_media']:>7} {item['consultas_max']:>5} "
+                f"{item['tempo_sql_ms_medio']:>9} "
+                f"{item['tempo_resposta_ms_medio']:>9} "
+                f"{item['orcamento'] if item['orcamento'] is not None else '-':>5}"
+            )
+            if item['orcamento_excedido']:
+                linha = self.style.WARNING(linha)
+            self.stdout.write(linha)
+            for duplicada in item['duplicadas'].values():
+                self.stdout.write(
+                    f"    {duplicada['ocorrencias_max']}x {duplicada['sql'][:100]}")
+
+    def _medir_urls(self, urls, username):
+        cliente = Client(SERVER_NAME='localhost')
+        if username:
+            try:
+                usuario = get_user_model().objects.get(username=username)
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'Usuário {username} não encontrado')
+            cliente.force_login(usuario)
+
+        for url in urls:
+            registro = RegistroConsultas()
+            inicio = time.perf_counter()
+            with connection.execute_wrapper(registro):
+                response = cliente.get(url)
+            tempo_resposta = time.perf_counter() - inicio
+
+            # Com o middleware ativo a requisição já foi registrada por ele
+            endpoint = nome_endpoint(response.resolver_match, 'GET') or url
+            if not settings.MONITOR_CONSULTAS_ATIVO:
+                registrar_requisicao(
+                    endpoint, registro, tempo_resposta,
+                    orcamento_excedido(endpoint, registro))
+            self.stdout.write(
+                f'{url} -> {response.status_code}, {registro.total} consultas')
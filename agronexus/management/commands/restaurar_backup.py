@@ -0,0 +1,40 @@
+"""
+Comando para restaurar um backup gerado por gerar_backup
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from agronexus.utils.backup import restaurar_backup
+
+
+class Command(BaseCommand):
+    help = (
+        'Restaura um backup (completo ou incremental) com inserções em lote, '
+        'em um banco vazio (após migrate) ou no banco de origem'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'diretorio',
+            help='Diretório do backup (contém manifesto.json)',
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=1000,
+            help='Quantidade de registros por bulk_create (padrão: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        def informar(nome, total):
+            self.stdout.write(f'  {nome}: {total} registros restaurados')
+
+        try:
+            restaurar_backup(
+                options['diretorio'],
+                tamanho_lote=options['lote'],
+                ao_restaurar_modelo=informar,
+            )
+        except FileNotFoundError as e:
+            raise CommandError(f'Backup não encontrado: {e}')
+
+        self.stdout.write(self.style.SUCCESS('Backup restaurado com sucesso!'))
@@ -0,0 +1,38 @@
+"""
+Comando para conferir, via EXPLAIN, o uso dos índices nas consultas frequentes
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from agronexus.utils.indices import verificar_indices
+
+
+class Command(BaseCommand):
+    help = (
+        'Executa EXPLAIN das consultas mais frequentes e falha se alguma '
+        'não usar os índices projetados para ela'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--planos',
+            action='store_true',
+            help='Exibe o plano completo de cada consulta',
+        )
+
+    def handle(self, *args, **options):
+        sem_indice = []
+        for resultado in verificar_indices():
+            if resultado['indice_usado']:
+                self.stdout.write(
+                    f"✅ {resultado['consulta']}: {resultado['indice_usado']}")
+            else:
+                sem_indice.append(resultado['consulta'])
+                self.stdout.write(self.style.WARNING(
+                    f"⚠️  {resultado['consulta']}: nenhum de "
+                    f"{', '.join(resultado['indices_esperados'])}"))
+            if options['planos'] or not resultado['indice_usado']:
+                self.stdout.write(f"    {resultado['plano']}")
+
+        if sem_indice:
+            raise CommandError(
+                f'{len(sem_indice)} consulta(s) sem o índice esperado')
@@ -0,0 +1,59 @@
+"""
+AgroNexus - Sistema
+Middlewares do sistema
+"""
+
+import time
+
+from django.db import connection
+
+from .utils.monitoramento import (RegistroConsultas, orcamento_excedido,
+                                  registrar_requisicao,
+                                  reportar_orcamento_excedido)
+
+
+def nome_endpoint(resolver_match, metodo):
+    """'ViewSet.acao' para views do DRF, nome da rota para as demais"""
+    if resolver_match is None:
+        return None
+
+    view = resolver_match.func
+    classe = getattr(view, 'cls', None)
+    if classe is None:
+        return resolver_match.view_name or view.__name__
+
+    acoes = getattr(view, 'actions', None) or {}
+    acao = acoes.get(metodo.lower(), metodo.lower())
+    return f'{classe.__name__}.{acao}'
+
+
+class MonitorConsultasMiddleware:
+    """
+    Mede consultas SQL, tempo de SQL e tempo de resposta de cada requisição.
+
+    Ativado com MONITOR_CONSULTAS_ATIVO. As métricas são acumuladas por
+    endpoint (viewset e ação) e os orçamentos de ORCAMENTO_CONSULTAS são
+    verificados ao fim de cada requisição.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        registro = RegistroConsultas()
+        inicio = time.perf_counter()
+        with connection.execute_wrapper(registro):
+            response = self.get_response(request)
+        tempo_resposta = time.perf_counter() - inicio
+
+        endpoint = nome_endpoint(request.resolver_match, request.method)
+        if endpoint is None:
+            return response
+
+        response['X-Consultas-SQL'] = str(registro.total)
+        response['X-Tempo-SQL-ms'] = f'{registro.tempo * 1000:.2f}'
+        excedeu = orcamento_excedido(endpoint, registro)
+        registrar_requisicao(endpoint, registro, tempo_resposta, excedeu)
+        if excedeu:
+            reportar_orcamento_excedido(endpoint, registro)
+        return response
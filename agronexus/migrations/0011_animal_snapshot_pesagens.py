@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:29
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def preencher_snapshot_pesagens(apps, schema_editor):
+    """Preenche o snapshot de pesagens com um único UPDATE por coluna"""
+    Animal = apps.get_model('agronexus', 'Animal')
+    Pesagem = apps.get_model('agronexus', 'Pesagem')
+
+    def pesagem(campo, posicao=0):
+        return Subquery(
+            Pesagem.objects.filter(animal=OuterRef('pk'))
+            .order_by('-data_pesagem').values(campo)[posicao:posicao + 1]
+        )
+
+    Animal.objects.update(
+        peso_atual=pesagem('peso_kg'),
+        data_ultima_pesagem=pesagem('data_pesagem'),
+        peso_anterior=pesagem('peso_kg', 1),
+        data_pesagem_anterior=pesagem('data_pesagem', 1),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agronexus', '0010_alter_animal_categoria'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='animal',
+            name='data_pesagem_anterior',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='animal',
+            name='data_ultima_pesagem',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='animal',
+            name='peso_anterior',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=6, null=True),
+        ),
+        migrations.AddField(
+            model_name='animal',
+            name='peso_atual',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=6, null=True),
+        ),
+        migrations.RunPython(preencher_snapshot_pesagens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:36
+
+import django.core.validators
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agronexus', '0011_animal_snapshot_pesagens'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TarefaProcessamento',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('tipo', models.CharField(choices=[('importacao_animais', 'Importação de Animais'), ('exportacao_animais', 'Exportação de Animais')], max_length=30)),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('concluida', 'Concluída'), ('erro', 'Erro')], default='pendente', max_length=20)),
+                ('progresso', models.PositiveSmallIntegerField(default=0, help_text='Percentual concluído', validators=[django.core.validators.MaxValueValidator(100)])),
+                ('parametros', models.JSONField(blank=True, default=dict)),
+                ('arquivo_entrada', models.FileField(blank=True, upload_to='tarefas/entrada/')),
+                ('arquivo_resultado', models.FileField(blank=True, upload_to='tarefas/resultados/')),
+                ('resultado', models.JSONField(blank=True, default=dict)),
+                ('mensagem_erro', models.TextField(blank=True)),
+                ('task_id', models.CharField(blank=True, max_length=255)),
+                ('data_criacao', models.DateTimeField(auto_now_add=True)),
+                ('data_inicio', models.DateTimeField(blank=True, null=True)),
+                ('data_conclusao', models.DateTimeField(blank=True, null=True)),
+                ('propriedade', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tarefas_processamento', to='agronexus.propriedade')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tarefas_processamento', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Tarefa de Processamento',
+                'verbose_name_plural': 'Tarefas de Processamento',
+                'db_table': 'tarefas_processamento',
+                'ordering': ['-data_criacao'],
+            },
+        ),
+    ]
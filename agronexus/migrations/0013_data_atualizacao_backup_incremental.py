@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agronexus', '0012_tarefaprocessamento'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lancamentofinanceiro',
+            name='data_atualizacao',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='manejo',
+            name='data_atualizacao',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='pesagem',
+            name='data_atualizacao',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='propriedade',
+            name='data_atualizacao',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
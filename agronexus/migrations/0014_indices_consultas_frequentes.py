@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agronexus', '0013_data_atualizacao_backup_incremental'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='animal',
+            index=models.Index(fields=['propriedade', 'status', 'identificacao_unica'], name='animal_prop_status_ident_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='animal',
+            index=models.Index(fields=['propriedade', 'sexo', 'status'], name='animal_prop_sexo_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='animal',
+            index=models.Index(fields=['lote_atual', 'status', 'identificacao_unica'], name='animal_lote_status_ident_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='animal',
+            index=models.Index(condition=models.Q(('status', 'ativo')), fields=['propriedade', 'categoria'], name='animal_ativo_prop_cat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='animal',
+            index=models.Index(condition=models.Q(('status', 'ativo')), fields=['lote_atual', 'sexo'], name='animal_ativo_lote_sexo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='calendariosanitario',
+            index=models.Index(fields=['propriedade', 'status', 'data_agendada'], name='calend_prop_status_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lancamentofinanceiro',
+            index=models.Index(fields=['propriedade', 'data_lancamento', 'tipo'], name='lanc_prop_data_tipo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='manejo',
+            index=models.Index(fields=['propriedade', 'data_manejo'], name='manejo_prop_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pesagem',
+            index=models.Index(fields=['animal', '-data_pesagem'], name='pesagem_animal_data_idx'),
+        ),
+    ]
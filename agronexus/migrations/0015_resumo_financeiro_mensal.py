@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:06
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import TruncMonth
+
+
+def preencher_resumo_financeiro(apps, schema_editor):
+    """Agrega os lançamentos existentes em uma consulta e grava o resumo em lotes"""
+    LancamentoFinanceiro = apps.get_model('agronexus', 'LancamentoFinanceiro')
+    ResumoFinanceiroMensal = apps.get_model('agronexus', 'ResumoFinanceiroMensal')
+
+    agregados = (
+        LancamentoFinanceiro.objects.order_by()
+        .annotate(mes_lancamento=TruncMonth('data_lancamento', output_field=DateField()))
+        .values('propriedade_id', 'conta_origem_id', 'categoria_id',
+                'mes_lancamento', 'tipo')
+        .annotate(soma=Sum('valor'), registros=Count('id'))
+    )
+    ResumoFinanceiroMensal.objects.bulk_create(
+        (
+            ResumoFinanceiroMensal(
+                propriedade_id=linha['propriedade_id'],
+                conta_id=linha['conta_origem_id'],
+                categoria_id=linha['categoria_id'],
+                mes=linha['mes_lancamento'],
+                tipo=linha['tipo'],
+                total=linha['soma'],
+                quantidade=linha['registros'],
+            )
+            for linha in agregados.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agronexus', '0014_indices_consultas_frequentes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumoFinanceiroMensal',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('mes', models.DateField(help_text='Primeiro dia do mês')),
+                ('tipo', models.CharField(choices=[('entrada', 'Entrada'), ('saida', 'Saída'), ('transferencia', 'Transferência')], max_length=15)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('quantidade', models.PositiveIntegerField(default=0)),
+                ('categoria', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='agronexus.categoriafinanceira')),
+                ('conta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumos_mensais', to='agronexus.contafinanceira')),
+                ('propriedade', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumos_financeiros', to='agronexus.propriedade')),
+            ],
+            options={
+                'verbose_name': 'Resumo Financeiro Mensal',
+                'verbose_name_plural': 'Resumos Financeiros Mensais',
+                'db_table': 'resumos_financeiros_mensais',
+                'ordering': ['propriedade', 'mes'],
+                'indexes': [models.Index(fields=['propriedade', 'mes', 'tipo'], name='resumo_fin_prop_mes_idx'), models.Index(fields=['conta', 'mes'], name='resumo_fin_conta_mes_idx')],
+            },
+        ),
+        migrations.RunPython(preencher_resumo_financeiro, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:09
+
+import django.db.models.deletion
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Case, DateField, F, Sum, When
+from django.db.models.functions import TruncMonth
+
+
+def preencher_saldos_contas(apps, schema_editor):
+    """Calcula saldo das contas e checkpoints mensais a partir dos lançamentos"""
+    ContaFinanceira = apps.get_model('agronexus', 'ContaFinanceira')
+    LancamentoFinanceiro = apps.get_model('agronexus', 'LancamentoFinanceiro')
+    SaldoMensalConta = apps.get_model('agronexus', 'SaldoMensalConta')
+
+    lancamentos = LancamentoFinanceiro.objects.order_by().annotate(
+        mes=TruncMonth('data_lancamento', output_field=DateField()))
+    valor = models.DecimalField(max_digits=16, decimal_places=2)
+
+    por_mes = defaultdict(Decimal)
+    for linha in lancamentos.values('conta_origem_id', 'mes').annotate(total=Sum(Case(
+            When(tipo='entrada', then=F('valor')), default=-F('valor'),
+            output_field=valor))):
+        por_mes[(str(linha['conta_origem_id']), linha['mes'])] += linha['total']
+    for linha in lancamentos.filter(
+            tipo='transferencia', conta_destino__isnull=False
+    ).values('conta_destino_id', 'mes').annotate(total=Sum('valor')):
+        por_mes[(str(linha['conta_destino_id']), linha['mes'])] += linha['total']
+
+    checkpoints = []
+    saldos = defaultdict(Decimal)
+    for (conta_id, mes), movimentacao in sorted(por_mes.items()):
+        saldos[conta_id] += movimentacao
+        checkpoints.append(SaldoMensalConta(
+            conta_id=conta_id, mes=mes, movimentacao=movimentacao,
+            saldo_acumulado=saldos[conta_id]))
+    SaldoMensalConta.objects.bulk_create(checkpoints, batch_size=1000)
+    for conta_id, saldo in saldos.items():
+        ContaFinanceira.objects.filter(pk=conta_id).update(saldo_movimentacoes=saldo)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agronexus', '0015_resumo_financeiro_mensal'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaldoMensalConta',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('mes', models.DateField(help_text='Primeiro dia do mês')),
+                ('movimentacao', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('saldo_acumulado', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+            ],
+            options={
+                'verbose_name': 'Saldo Mensal da Conta',
+                'verbose_name_plural': 'Saldos Mensais das Contas',
+                'db_table': 'saldos_mensais_contas',
+                'ordering': ['conta', 'mes'],
+            },
+        ),
+        migrations.AddField(
+            model_name='contafinanceira',
+            name='saldo_movimentacoes',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=16),
+        ),
+        migrations.AddIndex(
+            model_name='lancamentofinanceiro',
+            index=models.Index(fields=['conta_origem', 'data_lancamento'], name='lanc_origem_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lancamentofinanceiro',
+            index=models.Index(fields=['conta_destino', 'data_lancamento'], name='lanc_destino_data_idx'),
+        ),
+        migrations.AddField(
+            model_name='saldomensalconta',
+            name='conta',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saldos_mensais', to='agronexus.contafinanceira'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='saldomensalconta',
+            unique_together={('conta', 'mes')},
+        ),
+        migrations.RunPython(preencher_saldos_contas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agronexus', '0016_livro_saldos_contas'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='historicoloteanimal',
+            index=models.Index(fields=['data_entrada', 'id'], name='hist_lote_data_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lancamentofinanceiro',
+            index=models.Index(fields=['data_lancamento', 'id'], name='lanc_data_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='manejo',
+            index=models.Index(fields=['data_manejo', 'id'], name='manejo_data_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pesagem',
+            index=models.Index(fields=['data_pesagem', 'id'], name='pesagem_data_id_idx'),
+        ),
+    ]
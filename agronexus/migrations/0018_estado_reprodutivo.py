@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agronexus', '0017_indices_paginacao_cursor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='configuracaosistema',
+            name='dias_espera_voluntaria',
+            field=models.IntegerField(default=45, help_text='Período de espera voluntária após o parto'),
+        ),
+        migrations.AddIndex(
+            model_name='diagnosticogestacao',
+            index=models.Index(fields=['inseminacao', '-data_diagnostico'], name='diag_insem_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inseminacao',
+            index=models.Index(fields=['animal', '-data_inseminacao'], name='insem_animal_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='parto',
+            index=models.Index(fields=['mae', '-data_parto'], name='parto_mae_data_idx'),
+        ),
+    ]
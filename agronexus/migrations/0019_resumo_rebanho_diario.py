@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:28
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agronexus', '0018_estado_reprodutivo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumoRebanhoDiario',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('nivel', models.CharField(choices=[('propriedade', 'Propriedade'), ('lote', 'Lote'), ('area', 'Área')], max_length=15)),
+                ('data', models.DateField()),
+                ('total_animais', models.PositiveIntegerField(default=0)),
+                ('total_ua', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('peso_medio', models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True)),
+                ('taxa_ocupacao', models.DecimalField(blank=True, decimal_places=3, help_text='UA/ha (nulo para lotes fora de área)', max_digits=10, null=True)),
+                ('area', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='resumos_diarios', to='agronexus.area')),
+                ('lote', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='resumos_diarios', to='agronexus.lote')),
+                ('propriedade', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumos_rebanho', to='agronexus.propriedade')),
+            ],
+            options={
+                'verbose_name': 'Resumo Diário do Rebanho',
+                'verbose_name_plural': 'Resumos Diários do Rebanho',
+                'db_table': 'resumos_rebanho_diarios',
+                'ordering': ['propriedade', 'data'],
+                'indexes': [models.Index(fields=['propriedade', 'nivel', 'data'], name='resumo_reb_prop_data_idx'), models.Index(fields=['lote', 'data'], name='resumo_reb_lote_data_idx'), models.Index(fields=['area', 'nivel', 'data'], name='resumo_reb_area_data_idx')],
+            },
+        ),
+    ]
@@ -12,9 +12,28 @@ from decimal import Decimal
 from django.contrib.auth.models import AbstractUser, Group
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
+
+def sem_campos_derivados(instancia, campos, kwargs):
+    """
+    kwargs de save() que, em atualizações, não regravam `campos`: valores
+    mantidos por sinais com UPDATE, que uma instância carregada antes
+    sobrescreveria com o valor antigo.
+    """
+    if instancia._state.adding or kwargs.get('force_insert'):
+        return kwargs
+    update_fields = kwargs.get('update_fields')
+    if update_fields is None:
+        update_fields = [
+            campo.name for campo in instancia._meta.concrete_fields
+            if not campo.primary_key
+        ]
+    return {**kwargs, 'update_fields': [
+        campo for campo in update_fields if campo not in campos]}
+
+
 # ============================================================================
 # USUÁRIOS E AUTENTICAÇÃO
 # ============================================================================
@@ -112,6 +131,7 @@ class Propriedade(models.Model):
     cnpj_cpf = models.CharField(max_length=18, blank=True, null=True)
     ativa = models.BooleanField(default=True)
     data_criacao = models.DateTimeField(auto_now_add=True)
+    data_atualizacao = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'propriedades'
@@ -128,11 +148,10 @@ class Propriedade(models.Model):
 
     def get_taxa_ocupacao_global(self):
         """Calcula a taxa de ocupação global da propriedade em UA/ha"""
-        total_ua = sum(lote.get_total_ua()
-                       for lote in self.lotes.filter(ativo=True))
-        if self.area_total_ha > 0:
-            return total_ua / float(self.area_total_ha)
-        return 0
+        from .utils.ocupacao import anotar_ocupacao_propriedades
+        return anotar_ocupacao_propriedades(
+            Propriedade.objects.filter(pk=self.pk), ['taxa_ocupacao_global']
+        ).values_list('taxa_ocupacao_global', flat=True).get()
 
 
 class Area(models.Model):
@@ -183,14 +202,17 @@ class Area(models.Model):
 
     def get_lote_atual(self):
         """Retorna o lote que está ocupando esta área atualmente"""
+        if hasattr(self, 'lotes_ativos'):
+            # Carregados por utils.ocupacao.anexar_lotes_ativos
+            return self.lotes_ativos[0] if self.lotes_ativos else None
         return self.lotes.filter(ativo=True).first()
 
     def get_taxa_ocupacao_atual(self):
-        """Calcula a taxa de ocupação atual da área em UA/ha"""
-        lote_atual = self.get_lote_atual()
-        if lote_atual and self.tamanho_ha > 0:
-            return lote_atual.get_total_ua() / float(self.tamanho_ha)
-        return 0
+        """Calcula a taxa de ocupação atual da área em UA/ha (todos os lotes ativos)"""
+        from .utils.ocupacao import anotar_ocupacao_areas
+        return anotar_ocupacao_areas(
+            Area.objects.filter(pk=self.pk), ['taxa_ocupacao_atual']
+        ).values_list('taxa_ocupacao_atual', flat=True).get()
 
     def get_periodo_ocupacao_atual(self):
         """Retorna há quantos dias a área está ocupada"""
@@ -217,6 +239,43 @@ class EspecieAnimal(models.Model):
         ('suino', 'Suíno'),
     ]
 
+    # Categorias válidas por espécie
+    CATEGORIAS_POR_ESPECIE = {
+        'bovino': [
+            ('bezerro', 'Bezerro'),
+            ('bezerra', 'Bezerra'),
+            ('novilho', 'Novilho'),
+            ('novilha', 'Novilha'),
+            ('touro', 'Touro'),
+            ('vaca', 'Vaca'),
+        ],
+        'caprino': [
+            ('cabrito', 'Cabrito'),
+            ('cabrita', 'Cabrita'),
+            ('bode_jovem', 'Bode Jovem'),
+            ('cabra_jovem', 'Cabra Jovem'),
+            ('bode', 'Bode'),
+            ('cabra', 'Cabra'),
+        ],
+        'ovino': [
+            ('cordeiro', 'Cordeiro'),
+            ('cordeira', 'Cordeira'),
+            ('carneiro_jovem', 'Carneiro Jovem'),
+            ('ovelha_jovem', 'Ovelha Jovem'),
+            ('carneiro', 'Carneiro'),
+            ('ovelha', 'Ovelha'),
+        ],
+        'equino': [
+            ('cavalo', 'Cavalo'),
+            ('égu', 'Égua'),
+            ('potro', 'Potro'),
+        ],
+        'suino': [
+            ('porco', 'Porco'),
+            ('leitão', 'Leitão'),
+        ],
+    }
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     nome = models.CharField(
         max_length=20, choices=ESPECIES_CHOICES, unique=True)
@@ -246,42 +305,7 @@ class EspecieAnimal(models.Model):
 
     def get_categorias(self):
         """Retorna categorias disponíveis para esta espécie"""
-        categorias_por_especie = {
-            'bovino': [
-                ('bezerro', 'Bezerro'),
-                ('bezerra', 'Bezerra'),
-                ('novilho', 'Novilho'),
-                ('novilha', 'Novilha'),
-                ('touro', 'Touro'),
-                ('vaca', 'Vaca'),
-            ],
-            'caprino': [
-                ('cabrito', 'Cabrito'),
-                ('cabrita', 'Cabrita'),
-                ('bode_jovem', 'Bode Jovem'),
-                ('cabra_jovem', 'Cabra Jovem'),
-                ('bode', 'Bode'),
-                ('cabra', 'Cabra'),
-            ],
-            'ovino': [
-                ('cordeiro', 'Cordeiro'),
-                ('cordeira', 'Cordeira'),
-                ('carneiro_jovem', 'Carneiro Jovem'),
-                ('ovelha_jovem', 'Ovelha Jovem'),
-                ('carneiro', 'Carneiro'),
-                ('ovelha', 'Ovelha'),
-            ],
-            'equino': [
-                ('cavalo', 'Cavalo'),
-                ('égu', 'Égua'),
-                ('potro', 'Potro'),
-            ],
-            'suino': [
-                ('porco', 'Porco'),
-                ('leitão', 'Leitão'),
-            ],
-        }
-        return categorias_por_especie.get(self.nome, [])
+        return self.CATEGORIAS_POR_ESPECIE.get(self.nome, [])
 
 
 class RacaAnimal(models.Model):
@@ -380,6 +404,20 @@ class Animal(models.Model):
         ('outro', 'Outro'),
     ]
 
+    # Valores padrão de UA por espécie quando não há pesagem
+    UA_PADRAO_POR_ESPECIE = {
+        'bovino': 0.5,
+        'caprino': 0.1,
+        'ovino': 0.1,
+        'equino': 0.8,
+        'suino': 0.3,
+    }
+    UA_PADRAO = 0.5
+
+    # Campos do snapshot de pesagens, gravados só por recalcular_pesos_atuais
+    CAMPOS_SNAPSHOT_PESAGEM = (
+        'peso_atual', 'data_ultima_pesagem', 'peso_anterior', 'data_pesagem_anterior')
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
     # Espécie e raça
@@ -429,6 +467,16 @@ class Animal(models.Model):
     lote_atual = models.ForeignKey(
         'Lote', on_delete=models.SET_NULL, null=True, blank=True, related_name='animais')
 
+    # Snapshot das últimas pesagens (mantido pelos sinais de Pesagem)
+    peso_atual = models.DecimalField(
+        max_digits=6, decimal_places=2, blank=True, null=True, editable=False)
+    data_ultima_pesagem = models.DateField(
+        blank=True, null=True, editable=False)
+    peso_anterior = models.DecimalField(
+        max_digits=6, decimal_places=2, blank=True, null=True, editable=False)
+    data_pesagem_anterior = models.DateField(
+        blank=True, null=True, editable=False)
+
     # Metadados
     fotos_evolucao = models.JSONField(
         default=list, blank=True, help_text="Lista de URLs das fotos com datas")
@@ -442,10 +490,31 @@ class Animal(models.Model):
         verbose_name_plural = 'Animais'
         ordering = ['identificacao_unica']
         unique_together = ['propriedade', 'identificacao_unica']
+        indexes = [
+            # Listagem por propriedade + status já na ordenação padrão
+            models.Index(fields=['propriedade', 'status', 'identificacao_unica'],
+                         name='animal_prop_status_ident_idx'),
+            models.Index(fields=['propriedade', 'sexo', 'status'],
+                         name='animal_prop_sexo_status_idx'),
+            models.Index(fields=['lote_atual', 'status', 'identificacao_unica'],
+                         name='animal_lote_status_ident_idx'),
+            # Parciais: só o rebanho ativo (PostgreSQL/SQLite; ignorados no MySQL)
+            models.Index(fields=['propriedade', 'categoria'],
+                         condition=models.Q(status='ativo'),
+                         name='animal_ativo_prop_cat_idx'),
+            models.Index(fields=['lote_atual', 'sexo'],
+                         condition=models.Q(status='ativo'),
+                         name='animal_ativo_lote_sexo_idx'),
+        ]
 
     def __str__(self):
         return f"{self.identificacao_unica} - {self.nome_registro or 'Sem nome'}"
 
+    def save(self, *args, **kwargs):
+        """O snapshot de pesagens é gravado só pelos sinais de Pesagem"""
+        super().save(*args, **sem_campos_derivados(
+            self, self.CAMPOS_SNAPSHOT_PESAGEM, kwargs))
+
     def clean(self):
         """Validações customizadas"""
         if self.pai and self.pai.sexo != 'M':
@@ -456,21 +525,28 @@ class Animal(models.Model):
             raise ValidationError('Data de nascimento não pode ser futura')
 
         # Validações de espécie
-        if self.pai and self.pai.especie != self.especie:
+        if self.pai and self.pai.especie_id != self.especie_id:
             raise ValidationError('O pai deve ser da mesma espécie')
-        if self.mae and self.mae.especie != self.especie:
+        if self.mae and self.mae.especie_id != self.especie_id:
             raise ValidationError('A mãe deve ser da mesma espécie')
 
+        # Espécies e raças vêm do catálogo em memória (sem consultas)
+        from .utils.catalogo import obter_catalogo
+        catalogo = obter_catalogo()
+
         # Validar categoria por espécie
         if self.categoria:
-            categorias_validas = [cat[0]
-                                  for cat in self.get_categorias_disponiveis()]
+            especie = catalogo.especie(self.especie_id) or self.especie
+            categorias_validas = [cat[0] for cat in especie.get_categorias()]
             if self.categoria not in categorias_validas:
                 raise ValidationError(
-                    f'Categoria "{self.categoria}" não é válida para {self.especie.nome_display}')
+                    f'Categoria "{self.categoria}" não é válida para {especie.nome_display}')
 
         # Validar raça por espécie
-        if self.raca and self.raca.especie != self.especie:
+        raca = None
+        if self.raca_id:
+            raca = catalogo.raca(self.raca_id) or self.raca
+        if raca and raca.especie_id != self.especie_id:
             raise ValidationError(
                 'A raça deve pertencer à espécie selecionada')
 
@@ -485,25 +561,20 @@ class Animal(models.Model):
         return self.get_idade_dias() // 30
 
     def get_peso_atual(self):
-        """Retorna o peso mais recente do animal"""
-        ultima_pesagem = self.pesagens.order_by('-data_pesagem').first()
-        return ultima_pesagem.peso_kg if ultima_pesagem else None
+        """Retorna o peso mais recente do animal (snapshot desnormalizado)"""
+        return self.peso_atual
 
     def get_ua_value(self):
-        """Calcula o valor em UA baseado na espécie"""
+        """Calcula o valor em UA baseado na espécie e na UA de referência da propriedade"""
+        from .utils.estatisticas import fator_ua_propriedade
+
         peso = self.get_peso_atual()
         if peso:
-            return float(peso) / float(self.especie.peso_ua_referencia)
+            referencia = float(self.especie.peso_ua_referencia)
+            return float(peso) / (referencia * fator_ua_propriedade(self.propriedade))
 
         # Valores padrão por espécie se não houver pesagem
-        valores_padrao = {
-            'bovino': 0.5,
-            'caprino': 0.1,
-            'ovino': 0.1,
-            'equino': 0.8,
-            'suino': 0.3,
-        }
-        return valores_padrao.get(self.especie.nome, 0.5)
+        return self.UA_PADRAO_POR_ESPECIE.get(self.especie.nome, self.UA_PADRAO)
 
     def get_categorias_disponiveis(self):
         """Retorna categorias baseadas na espécie"""
@@ -621,24 +692,23 @@ class Lote(models.Model):
 
     def get_total_ua(self):
         """Retorna o total de UA (Unidades Animais) do lote"""
-        return sum(animal.get_ua_value() for animal in self.animais.filter(status='ativo'))
+        return self._get_estatisticas()['total_ua']
 
     def get_peso_medio(self):
         """Calcula o peso médio dos animais do lote"""
-        animais_com_peso = [animal for animal in self.animais.filter(
-            status='ativo') if animal.get_peso_atual()]
-        if animais_com_peso:
-            return sum(animal.get_peso_atual() for animal in animais_com_peso) / len(animais_com_peso)
-        return None
+        return self._get_estatisticas()['peso_medio']
 
     def get_gmd_medio(self, dias=30):
         """Calcula o GMD médio do lote"""
-        gmds = [animal.get_gmd_periodo(
-            dias) for animal in self.animais.filter(status='ativo')]
-        gmds_validos = [gmd for gmd in gmds if gmd is not None]
-        if gmds_validos:
-            return sum(gmds_validos) / len(gmds_validos)
-        return None
+        from .utils.estatisticas import calcular_gmd_medio_lotes
+        return calcular_gmd_medio_lotes([self], dias).get(self.pk)
+
+    def _get_estatisticas(self):
+        """Busca as estatísticas agregadas do lote em uma única consulta"""
+        from .utils.estatisticas import anotar_estatisticas_lotes
+        return anotar_estatisticas_lotes(
+            Lote.objects.filter(pk=self.pk)
+        ).values('total_ua', 'peso_medio').get()
 
 
 class HistoricoLoteAnimal(models.Model):
@@ -660,6 +730,11 @@ class HistoricoLoteAnimal(models.Model):
         verbose_name = 'Histórico Lote-Animal'
         verbose_name_plural = 'Históricos Lote-Animal'
         ordering = ['-data_entrada']
+        indexes = [
+            # Paginação por cursor (data, id)
+            models.Index(fields=['data_entrada', 'id'],
+                         name='hist_lote_data_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.animal} -> {self.lote} ({self.data_entrada})"
@@ -694,6 +769,58 @@ class HistoricoOcupacaoArea(models.Model):
         return (data_fim - self.data_entrada).days
 
 
+class ResumoRebanhoDiario(models.Model):
+    """
+    Situação do rebanho ao fim de um dia por propriedade, lote ou área.
+
+    Reconstruída dos históricos de lote e de ocupação e das pesagens até a
+    data. Gerada diariamente pela tarefa gerar_resumos_rebanho e
+    reconstruível com o comando gerar_resumo_rebanho. Linhas de lote trazem
+    também a área que o lote ocupava no dia.
+    """
+    NIVEL_CHOICES = [
+        ('propriedade', 'Propriedade'),
+        ('lote', 'Lote'),
+        ('area', 'Área'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    propriedade = models.ForeignKey(
+        Propriedade, on_delete=models.CASCADE, related_name='resumos_rebanho')
+    nivel = models.CharField(max_length=15, choices=NIVEL_CHOICES)
+    lote = models.ForeignKey(
+        Lote, on_delete=models.CASCADE, null=True, blank=True,
+        related_name='resumos_diarios')
+    area = models.ForeignKey(
+        Area, on_delete=models.CASCADE, null=True, blank=True,
+        related_name='resumos_diarios')
+    data = models.DateField()
+    total_animais = models.PositiveIntegerField(default=0)
+    total_ua = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    peso_medio = models.DecimalField(
+        max_digits=8, decimal_places=2, blank=True, null=True)
+    taxa_ocupacao = models.DecimalField(
+        max_digits=10, decimal_places=3, blank=True, null=True,
+        help_text='UA/ha (nulo para lotes fora de área)')
+
+    class Meta:
+        db_table = 'resumos_rebanho_diarios'
+        verbose_name = 'Resumo Diário do Rebanho'
+        verbose_name_plural = 'Resumos Diários do Rebanho'
+        ordering = ['propriedade', 'data']
+        indexes = [
+            models.Index(fields=['propriedade', 'nivel', 'data'],
+                         name='resumo_reb_prop_data_idx'),
+            models.Index(fields=['lote', 'data'],
+                         name='resumo_reb_lote_data_idx'),
+            models.Index(fields=['area', 'nivel', 'data'],
+                         name='resumo_reb_area_data_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.data:%d/%m/%Y} - {self.get_nivel_display()} - {self.total_animais} animais"
+
+
 # ============================================================================
 # MANEJOS
 # ============================================================================
@@ -737,12 +864,20 @@ class Manejo(models.Model):
     observacoes = models.TextField(blank=True)
     usuario = models.ForeignKey(Usuario, on_delete=models.SET_NULL, null=True)
     data_criacao = models.DateTimeField(auto_now_add=True)
+    data_atualizacao = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'manejos'
         verbose_name = 'Manejo'
         verbose_name_plural = 'Manejos'
         ordering = ['-data_manejo']
+        indexes = [
+            models.Index(fields=['propriedade', 'data_manejo'],
+                         name='manejo_prop_data_idx'),
+            # Paginação por cursor (data, id)
+            models.Index(fields=['data_manejo', 'id'],
+                         name='manejo_data_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_tipo_display()} - {self.data_manejo}"
@@ -788,12 +923,21 @@ class Pesagem(models.Model):
     data_pesagem = models.DateField()
     equipamento_usado = models.CharField(max_length=100, blank=True)
     observacoes = models.TextField(blank=True)
+    data_atualizacao = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'pesagens'
         verbose_name = 'Pesagem'
         verbose_name_plural = 'Pesagens'
         ordering = ['-data_pesagem']
+        indexes = [
+            # Última pesagem / série do animal
+            models.Index(fields=['animal', '-data_pesagem'],
+                         name='pesagem_animal_data_idx'),
+            # Paginação por cursor (data, id)
+            models.Index(fields=['data_pesagem', 'id'],
+                         name='pesagem_data_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.animal} - {self.peso_kg}kg ({self.data_pesagem})"
@@ -844,10 +988,8 @@ class EstacaoMonta(models.Model):
 
     def get_total_femeas(self):
         """Retorna o total de fêmeas participantes"""
-        total = 0
-        for lote in self.lotes_participantes.all():
-            total += lote.animais.filter(sexo='F', status='ativo').count()
-        return total
+        from .utils.estacao_monta import femeas_estacao
+        return femeas_estacao(self).count()
 
     def get_taxa_prenhez(self):
         """Calcula a taxa de prenhez da estação"""
@@ -920,6 +1062,11 @@ class Inseminacao(models.Model):
         verbose_name = 'Inseminação'
         verbose_name_plural = 'Inseminações'
         ordering = ['-data_inseminacao']
+        indexes = [
+            # Última inseminação da fêmea (estado reprodutivo)
+            models.Index(fields=['animal', '-data_inseminacao'],
+                         name='insem_animal_data_idx'),
+        ]
 
     def __str__(self):
         return f"{self.animal} - {self.get_tipo_display()} ({self.data_inseminacao})"
@@ -955,6 +1102,11 @@ class DiagnosticoGestacao(models.Model):
         verbose_name = 'Diagnóstico de Gestação'
         verbose_name_plural = 'Diagnósticos de Gestação'
         ordering = ['-data_diagnostico']
+        indexes = [
+            # Último diagnóstico da inseminação (estado reprodutivo)
+            models.Index(fields=['inseminacao', '-data_diagnostico'],
+                         name='diag_insem_data_idx'),
+        ]
 
     def __str__(self):
         return f"{self.inseminacao.animal} - {self.get_resultado_display()} ({self.data_diagnostico})"
@@ -1011,6 +1163,11 @@ class Parto(models.Model):
         verbose_name = 'Parto'
         verbose_name_plural = 'Partos'
         ordering = ['-data_parto']
+        indexes = [
+            # Último parto da fêmea (estado reprodutivo)
+            models.Index(fields=['mae', '-data_parto'],
+                         name='parto_mae_data_idx'),
+        ]
 
     def __str__(self):
         return f"{self.mae} - {self.get_resultado_display()} ({self.data_parto})"
@@ -1169,6 +1326,10 @@ class CalendarioSanitario(models.Model):
         verbose_name = 'Calendário Sanitário'
         verbose_name_plural = 'Calendários Sanitários'
         ordering = ['data_agendada']
+        indexes = [
+            models.Index(fields=['propriedade', 'status', 'data_agendada'],
+                         name='calend_prop_status_data_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_tipo_manejo_display()} - {self.data_agendada}"
@@ -1199,6 +1360,9 @@ class ContaFinanceira(models.Model):
     conta = models.CharField(max_length=20, blank=True)
     saldo_inicial = models.DecimalField(
         max_digits=12, decimal_places=2, default=0)
+    # Efeito acumulado dos lançamentos, mantido pelos sinais de LancamentoFinanceiro
+    saldo_movimentacoes = models.DecimalField(
+        max_digits=16, decimal_places=2, default=0, editable=False)
     ativa = models.BooleanField(default=True)
     data_criacao = models.DateTimeField(auto_now_add=True)
 
@@ -1211,13 +1375,20 @@ class ContaFinanceira(models.Model):
     def __str__(self):
         return f"{self.propriedade.nome} - {self.nome}"
 
+    def save(self, *args, **kwargs):
+        """O saldo das movimentações é gravado só pelos sinais dos lançamentos"""
+        super().save(*args, **sem_campos_derivados(
+            self, ('saldo_movimentacoes',), kwargs))
+
     def get_saldo_atual(self):
-        """Calcula o saldo atual da conta"""
-        entradas = self.lancamentos_entrada.aggregate(
-            total=models.Sum('valor'))['total'] or 0
-        saidas = self.lancamentos_saida.aggregate(
-            total=models.Sum('valor'))['total'] or 0
-        return self.saldo_inicial + entradas - saidas
+        """Saldo atual da conta (sem consulta, a partir do saldo mantido pelos sinais)"""
+        return self.saldo_inicial + self.saldo_movimentacoes
+
+    def get_saldo_em(self, data):
+        """Saldo da conta ao fim do dia `data`"""
+        from .utils.resumo_financeiro import saldo_conta_em
+
+        return saldo_conta_em(self, data)
 
 
 class CategoriaFinanceira(models.Model):
@@ -1287,12 +1458,24 @@ class LancamentoFinanceiro(models.Model):
         upload_to='comprovantes/', blank=True, null=True)
     usuario = models.ForeignKey(Usuario, on_delete=models.SET_NULL, null=True)
     data_criacao = models.DateTimeField(auto_now_add=True)
+    data_atualizacao = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'lancamentos_financeiros'
         verbose_name = 'Lançamento Financeiro'
         verbose_name_plural = 'Lançamentos Financeiros'
         ordering = ['-data_lancamento']
+        indexes = [
+            models.Index(fields=['propriedade', 'data_lancamento', 'tipo'],
+                         name='lanc_prop_data_tipo_idx'),
+            models.Index(fields=['conta_origem', 'data_lancamento'],
+                         name='lanc_origem_data_idx'),
+            models.Index(fields=['conta_destino', 'data_lancamento'],
+                         name='lanc_destino_data_idx'),
+            # Paginação por cursor (data, id)
+            models.Index(fields=['data_lancamento', 'id'],
+                         name='lanc_data_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_tipo_display()} - R$ {self.valor} ({self.data_lancamento})"
@@ -1305,6 +1488,77 @@ class LancamentoFinanceiro(models.Model):
             raise ValidationError(
                 'Apenas transferências podem ter conta de destino')
 
+    def save(self, *args, **kwargs):
+        """Lançamento, resumo mensal e saldo das contas (sinais) na mesma transação"""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
+
+
+class ResumoFinanceiroMensal(models.Model):
+    """
+    Totais mensais dos lançamentos por conta de origem, categoria e tipo.
+
+    Mantido pelos sinais de LancamentoFinanceiro (cada alteração recalcula
+    a conta e o mês afetados) e reconstruível com o comando
+    reconstruir_resumo_financeiro.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    propriedade = models.ForeignKey(
+        Propriedade, on_delete=models.CASCADE, related_name='resumos_financeiros')
+    conta = models.ForeignKey(
+        ContaFinanceira, on_delete=models.CASCADE, related_name='resumos_mensais')
+    categoria = models.ForeignKey(
+        CategoriaFinanceira, on_delete=models.SET_NULL, null=True, blank=True)
+    mes = models.DateField(help_text='Primeiro dia do mês')
+    tipo = models.CharField(max_length=15, choices=LancamentoFinanceiro.TIPO_CHOICES)
+    total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    quantidade = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'resumos_financeiros_mensais'
+        verbose_name = 'Resumo Financeiro Mensal'
+        verbose_name_plural = 'Resumos Financeiros Mensais'
+        ordering = ['propriedade', 'mes']
+        indexes = [
+            models.Index(fields=['propriedade', 'mes', 'tipo'],
+                         name='resumo_fin_prop_mes_idx'),
+            models.Index(fields=['conta', 'mes'],
+                         name='resumo_fin_conta_mes_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.mes:%m/%Y} - {self.get_tipo_display()} - R$ {self.total}"
+
+
+class SaldoMensalConta(models.Model):
+    """
+    Checkpoint mensal do saldo de uma conta financeira.
+
+    `movimentacao` é o efeito líquido dos lançamentos do mês na conta e
+    `saldo_acumulado` a soma das movimentações até o fim do mês, sem o
+    saldo inicial da conta. Mantido pelos sinais de LancamentoFinanceiro.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    conta = models.ForeignKey(
+        ContaFinanceira, on_delete=models.CASCADE, related_name='saldos_mensais')
+    mes = models.DateField(help_text='Primeiro dia do mês')
+    movimentacao = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    saldo_acumulado = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = 'saldos_mensais_contas'
+        verbose_name = 'Saldo Mensal da Conta'
+        verbose_name_plural = 'Saldos Mensais das Contas'
+        ordering = ['conta', 'mes']
+        unique_together = ['conta', 'mes']
+
+    def __str__(self):
+        return f"{self.conta.nome} - {self.mes:%m/%Y}: R$ {self.saldo_acumulado}"
+
 
 # ============================================================================
 # RELATÓRIOS E DASHBOARDS
@@ -1365,6 +1619,8 @@ class ConfiguracaoSistema(models.Model):
         default=35, help_text="Dias após IA para diagnóstico")
     dias_gestacao = models.IntegerField(
         default=285, help_text="Período de gestação em dias")
+    dias_espera_voluntaria = models.IntegerField(
+        default=45, help_text="Período de espera voluntária após o parto")
 
     # Configurações de notificações
     notificar_calendario_sanitario = models.BooleanField(default=True)
@@ -1383,3 +1639,58 @@ class ConfiguracaoSistema(models.Model):
 
     def __str__(self):
         return f"Configurações - {self.propriedade.nome}"
+
+
+class TarefaProcessamento(models.Model):
+    """
+    Tarefas assíncronas de importação e exportação executadas pelo Celery
+    """
+    TIPO_CHOICES = [
+        ('importacao_animais', 'Importação de Animais'),
+        ('exportacao_animais', 'Exportação de Animais'),
+    ]
+
+    STATUS_CHOICES = [
+        ('pendente', 'Pendente'),
+        ('processando', 'Processando'),
+        ('concluida', 'Concluída'),
+        ('erro', 'Erro'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    usuario = models.ForeignKey(
+        Usuario, on_delete=models.CASCADE, related_name='tarefas_processamento')
+    propriedade = models.ForeignKey(
+        Propriedade, on_delete=models.CASCADE, null=True, blank=True,
+        related_name='tarefas_processamento')
+    tipo = models.CharField(max_length=30, choices=TIPO_CHOICES)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default='pendente')
+    progresso = models.PositiveSmallIntegerField(
+        default=0, validators=[MaxValueValidator(100)], help_text="Percentual concluído")
+    parametros = models.JSONField(default=dict, blank=True)
+    arquivo_entrada = models.FileField(
+        upload_to='tarefas/entrada/', blank=True)
+    arquivo_resultado = models.FileField(
+        upload_to='tarefas/resultados/', blank=True)
+    resultado = models.JSONField(default=dict, blank=True)
+    mensagem_erro = models.TextField(blank=True)
+    task_id = models.CharField(max_length=255, blank=True)
+    data_criacao = models.DateTimeField(auto_now_add=True)
+    data_inicio = models.DateTimeField(null=True, blank=True)
+    data_conclusao = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'tarefas_processamento'
+        verbose_name = 'Tarefa de Processamento'
+        verbose_name_plural = 'Tarefas de Processamento'
+        ordering = ['-data_criacao']
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} - {self.get_status_display()}"
+
+    def atualizar_progresso(self, progresso):
+        """Grava o progresso sem sobrescrever os demais campos"""
+        self.progresso = max(0, min(int(progresso), 100))
+        TarefaProcessamento.objects.filter(pk=self.pk).update(
+            progresso=self.progresso)
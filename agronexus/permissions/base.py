@@ -7,36 +7,40 @@ from django.core.exceptions import ObjectDoesNotExist
 from rest_framework import permissions
 
 from ..models import Propriedade
+from ..utils.cache import obter_grupos_usuario
 
 
 def get_user_groups(user):
     """
     Retorna os nomes dos grupos aos quais o usuário pertence.
+
+    O resultado fica no cache de permissões e também no próprio objeto do
+    usuário, então as várias verificações de uma requisição não consultam
+    o banco.
     """
     if not user.is_authenticated:
         return []
 
-    return list(user.groups.values_list('name', flat=True))
+    grupos = getattr(user, '_grupos_cache', None)
+    if grupos is None:
+        grupos = obter_grupos_usuario(user)
+        user._grupos_cache = grupos
+    return grupos
 
 
 def user_has_group(user, group_name):
     """
     Verifica se o usuário pertence ao grupo especificado.
     """
-    if not user.is_authenticated:
-        return False
-
-    return user.groups.filter(name=group_name).exists()
+    return group_name in get_user_groups(user)
 
 
 def user_has_any_group(user, group_names):
     """
     Verifica se o usuário pertence a qualquer um dos grupos especificados.
     """
-    if not user.is_authenticated:
-        return False
-
-    return user.groups.filter(name__in=group_names).exists()
+    grupos = get_user_groups(user)
+    return any(group_name in grupos for group_name in group_names)
 
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
@@ -0,0 +1,241 @@
+"""
+AgroNexus - Sistema
+Sinais para manter dados denormalizados e caches em sincronia
+"""
+
+from decimal import Decimal
+
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_save)
+from django.dispatch import receiver
+
+from .models import (Animal, Area, ConfiguracaoSistema, DiagnosticoGestacao,
+                     EspecieAnimal, EstacaoMonta, Inseminacao,
+                     LancamentoFinanceiro, Lote, Medicamento, Parto, Pesagem,
+                     Propriedade, RacaAnimal, Usuario, Vacina)
+from .utils.cache import (invalidar_estacoes, invalidar_grupos,
+                          invalidar_propriedade, invalidar_referencia)
+from .utils.catalogo import invalidar_catalogo
+from .utils.estatisticas import recalcular_pesos_atuais
+from .utils.resumo_financeiro import (aplicar_movimentos,
+                                      atualizar_resumo_financeiro,
+                                      efeitos_lancamento)
+
+
+def _propriedade_da_pesagem(pesagem):
+    """Propriedade do animal pesado, sem consulta se o animal já foi carregado"""
+    if Pesagem.animal.is_cached(pesagem):
+        return pesagem.animal.propriedade_id
+    return Animal.objects.filter(pk=pesagem.animal_id).values_list(
+        'propriedade_id', flat=True).first()
+
+
+# ============================================================================
+# SNAPSHOT DE PESAGENS DO ANIMAL
+# ============================================================================
+
+@receiver(pre_save, sender=Pesagem)
+def guardar_animal_anterior_pesagem(sender, instance, **kwargs):
+    """Guarda o animal original para detectar troca de animal na edição"""
+    instance._animal_anterior_id = None
+    if instance.pk:
+        instance._animal_anterior_id = (
+            Pesagem.objects.filter(pk=instance.pk)
+            .values_list('animal_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Pesagem)
+def atualizar_peso_atual_ao_salvar(sender, instance, raw=False, **kwargs):
+    """Recalcula o snapshot de pesagens do animal após salvar uma pesagem"""
+    if raw:
+        return
+    animal_ids = {instance.animal_id}
+    animal_anterior_id = getattr(instance, '_animal_anterior_id', None)
+    if animal_anterior_id:
+        animal_ids.add(animal_anterior_id)
+    recalcular_pesos_atuais(Animal.objects.filter(pk__in=animal_ids))
+    invalidar_propriedade(_propriedade_da_pesagem(instance))
+
+
+@receiver(post_delete, sender=Pesagem)
+def atualizar_peso_atual_ao_excluir(sender, instance, **kwargs):
+    """Recalcula o snapshot de pesagens do animal após excluir uma pesagem"""
+    recalcular_pesos_atuais(Animal.objects.filter(pk=instance.animal_id))
+    invalidar_propriedade(_propriedade_da_pesagem(instance))
+
+
+# ============================================================================
+# RESUMO FINANCEIRO MENSAL E SALDO DAS CONTAS
+# ============================================================================
+
+@receiver(pre_save, sender=LancamentoFinanceiro)
+def guardar_lancamento_anterior(sender, instance, **kwargs):
+    """Guarda os valores originais para desfazer o efeito anterior do lançamento"""
+    instance._lancamento_anterior = None
+    if instance.pk:
+        instance._lancamento_anterior = (
+            LancamentoFinanceiro.objects.filter(pk=instance.pk)
+            .values('tipo', 'valor', 'conta_origem_id', 'conta_destino_id',
+                    'data_lancamento').first()
+        )
+
+
+def _movimentos_lancamento(valores, sinal=1):
+    """Movimentos (conta, data, valor) do lançamento no livro de saldos"""
+    return [
+        (conta_id, valores['data_lancamento'], sinal * valor)
+        for conta_id, valor in efeitos_lancamento(
+            valores['tipo'], Decimal(str(valores['valor'])),
+            valores['conta_origem_id'], valores['conta_destino_id'])
+    ]
+
+
+def _valores_lancamento(instance):
+    return {
+        'tipo': instance.tipo,
+        'valor': instance.valor,
+        'conta_origem_id': instance.conta_origem_id,
+        'conta_destino_id': instance.conta_destino_id,
+        'data_lancamento': instance.data_lancamento,
+    }
+
+
+@receiver(post_save, sender=LancamentoFinanceiro)
+def atualizar_resumo_ao_salvar_lancamento(sender, instance, raw=False, **kwargs):
+    """Atualiza o resumo mensal e o saldo das contas com o lançamento salvo"""
+    if raw:
+        return
+    atual = _valores_lancamento(instance)
+    celulas = [(atual['conta_origem_id'], atual['data_lancamento'])]
+    movimentos = _movimentos_lancamento(atual)
+    anterior = getattr(instance, '_lancamento_anterior', None)
+    if anterior:
+        celulas.append((anterior['conta_origem_id'], anterior['data_lancamento']))
+        movimentos += _movimentos_lancamento(anterior, -1)
+    with transaction.atomic():
+        aplicar_movimentos(movimentos)
+        atualizar_resumo_financeiro(celulas)
+
+
+@receiver(post_delete, sender=LancamentoFinanceiro)
+def atualizar_resumo_ao_excluir_lancamento(sender, instance, **kwargs):
+    atual = _valores_lancamento(instance)
+    with transaction.atomic():
+        aplicar_movimentos(_movimentos_lancamento(atual, -1), criar_checkpoints=False)
+        atualizar_resumo_financeiro(
+            [(atual['conta_origem_id'], atual['data_lancamento'])])
+
+
+# ============================================================================
+# CACHE DA PROPRIEDADE
+# ============================================================================
+
+@receiver(post_save, sender=Animal)
+@receiver(post_delete, sender=Animal)
+@receiver(post_save, sender=Lote)
+@receiver(post_delete, sender=Lote)
+@receiver(post_save, sender=Area)
+@receiver(post_delete, sender=Area)
+@receiver(post_save, sender=LancamentoFinanceiro)
+@receiver(post_delete, sender=LancamentoFinanceiro)
+@receiver(post_save, sender=ConfiguracaoSistema)
+@receiver(post_delete, sender=ConfiguracaoSistema)
+def invalidar_cache_propriedade(sender, instance, **kwargs):
+    """Descarta o cache (dashboard, índices) da propriedade do registro alterado"""
+    invalidar_propriedade(instance.propriedade_id)
+
+
+@receiver(post_save, sender=Propriedade)
+@receiver(post_delete, sender=Propriedade)
+def invalidar_cache_da_propria_propriedade(sender, instance, **kwargs):
+    invalidar_propriedade(instance.pk)
+
+
+# ============================================================================
+# CACHE DAS ESTAÇÕES DE MONTA
+# ============================================================================
+
+def _estacoes_da_femea(animal_id):
+    """
+    Estações da propriedade da fêmea: o estado reprodutivo dela depende dos
+    registros de qualquer estação, não só da que recebeu o registro.
+    """
+    return EstacaoMonta.objects.filter(
+        propriedade__in=Animal.objects.filter(pk=animal_id).values('propriedade')
+    ).values_list('pk', flat=True)
+
+
+@receiver(post_save, sender=Inseminacao)
+@receiver(post_delete, sender=Inseminacao)
+def invalidar_estacoes_inseminacao(sender, instance, **kwargs):
+    invalidar_estacoes(instance.estacao_monta_id, *_estacoes_da_femea(instance.animal_id))
+
+
+@receiver(post_save, sender=DiagnosticoGestacao)
+@receiver(post_delete, sender=DiagnosticoGestacao)
+def invalidar_estacoes_diagnostico(sender, instance, **kwargs):
+    femea = Inseminacao.objects.filter(pk=instance.inseminacao_id).values('animal')[:1]
+    invalidar_estacoes(*_estacoes_da_femea(femea))
+
+
+@receiver(post_save, sender=Parto)
+@receiver(post_delete, sender=Parto)
+def invalidar_estacoes_parto(sender, instance, **kwargs):
+    invalidar_estacoes(*_estacoes_da_femea(instance.mae_id))
+
+
+@receiver(post_save, sender=EstacaoMonta)
+@receiver(post_delete, sender=EstacaoMonta)
+def invalidar_estacao(sender, instance, **kwargs):
+    invalidar_estacoes(instance.pk)
+
+
+@receiver(m2m_changed, sender=EstacaoMonta.lotes_participantes.through)
+def invalidar_estacoes_lotes(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        invalidar_estacoes(instance.pk)
+    elif action == 'pre_clear':
+        invalidar_estacoes(*instance.estacoes_monta.values_list('pk', flat=True))
+    else:
+        invalidar_estacoes(*pk_set)
+
+
+# ============================================================================
+# CACHE DE REFERÊNCIA E PERMISSÕES
+# ============================================================================
+
+@receiver(post_save, sender=EspecieAnimal)
+@receiver(post_delete, sender=EspecieAnimal)
+@receiver(post_save, sender=RacaAnimal)
+@receiver(post_delete, sender=RacaAnimal)
+def recarregar_catalogo_referencia(sender, **kwargs):
+    invalidar_catalogo()
+
+
+@receiver(post_save, sender=Vacina)
+@receiver(post_delete, sender=Vacina)
+def invalidar_cache_vacinas(sender, **kwargs):
+    invalidar_referencia('vacinas')
+
+
+@receiver(post_save, sender=Medicamento)
+@receiver(post_delete, sender=Medicamento)
+def invalidar_cache_medicamentos(sender, **kwargs):
+    invalidar_referencia('medicamentos')
+
+
+@receiver(m2m_changed, sender=Usuario.groups.through)
+def invalidar_cache_grupos_usuario(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidar_grupos()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidar_cache_grupos(sender, **kwargs):
+    invalidar_grupos()
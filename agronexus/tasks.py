@@ -6,19 +6,20 @@ Tarefas Celery para processamento assíncrono
 import json
 import logging
 import os
+import tempfile
 from datetime import date, timedelta
 
 from celery import shared_task
 from django.contrib.auth import get_user_model
+from django.core.files import File
 from django.core.mail import send_mail
 from django.db.models import Count, Q, Sum
 from django.utils import timezone
 
 from .models import (Animal, CalendarioSanitario, ConfiguracaoSistema,
-                     LancamentoFinanceiro, Manejo, Pesagem, Propriedade,
-                     Usuario)
-from .utils.helpers import (create_backup_filename, export_to_excel,
-                            generate_report_data, serialize_for_backup)
+                     Pesagem, Propriedade, TarefaProcessamento, Usuario)
+from .utils.helpers import export_to_excel, generate_report_data
+from .utils.resumo_financeiro import totais_periodo
 
 logger = logging.getLogger(__name__)
 
@@ -135,48 +136,26 @@ def enviar_notificacao_calendario(self, propriedade_id, itens_ids):
 
 
 @shared_task(bind=True)
-def backup_automatico(self):
+def backup_automatico(self, incremental=False):
     """
-    Realiza backup automático dos dados
+    Realiza backup automático dos dados em JSON Lines compactado por modelo
     """
-    try:
-        hoje = timezone.now().date()
-        backup_data = {
-            'data_backup': hoje.isoformat(),
-            'versao': '1.0',
-            'dados': {}
-        }
-
-        # Modelos para backup
-        models_to_backup = [
-            ('propriedades', Propriedade),
-            ('animais', Animal),
-            ('manejos', Manejo),
-            ('pesagens', Pesagem),
-            ('lancamentos_financeiros', LancamentoFinanceiro),
-        ]
-
-        for model_name, model_class in models_to_backup:
-            objects = model_class.objects.all()
-            backup_data['dados'][model_name] = [
-                serialize_for_backup(obj) for obj in objects
-            ]
+    from .utils.backup import gerar_backup
 
-        # Salva backup
-        backup_filename = create_backup_filename('sistema_completo')
-        backup_path = os.path.join('media', 'backups', backup_filename)
-
-        os.makedirs(os.path.dirname(backup_path), exist_ok=True)
-
-        with open(backup_path, 'w') as f:
-            json.dump(backup_data, f, indent=2)
+    try:
+        manifesto = gerar_backup(incremental=incremental)
 
-        logger.info(f"Backup criado: {backup_filename}")
+        logger.info(f"Backup {manifesto['tipo']} criado: {manifesto['diretorio']}")
 
         return {
             'status': 'success',
-            'backup_file': backup_filename,
-            'data_backup': hoje.isoformat()
+            'tipo': manifesto['tipo'],
+            'backup_dir': manifesto['diretorio'],
+            'data_backup': manifesto['data_inicio'],
+            'registros': {
+                nome: info['registros']
+                for nome, info in manifesto['modelos'].items()
+            }
         }
 
     except Exception as e:
@@ -273,68 +252,53 @@ def limpar_logs_antigos(self):
 @shared_task(bind=True)
 def calcular_indices_zootecnicos(self, propriedade_id):
     """
-    Calcula índices zootécnicos para uma propriedade
+    Calcula índices zootécnicos para uma propriedade e atualiza o cache
     """
+    from .utils.zootecnicos import obter_indices_zootecnicos
+
     try:
         propriedade = Propriedade.objects.get(id=propriedade_id)
-        hoje = timezone.now().date()
-
-        # Calcula diversos índices
-        indices = {
-            'data_calculo': hoje.isoformat(),
-            'propriedade': propriedade.nome,
-            'indices': {}
-        }
+        indices = obter_indices_zootecnicos(propriedade, recalcular=True)
 
-        # Taxa de natalidade
-        total_femeas = propriedade.animais.filter(
-            sexo='F',
-            status='ativo',
-            categoria__in=['vaca', 'novilha']
-        ).count()
+        logger.info(f"Índices calculados para {propriedade.nome}")
 
-        nascimentos_ano = propriedade.animais.filter(
-            data_nascimento__year=hoje.year,
-            status='ativo'
-        ).count()
+        return indices
 
-        if total_femeas > 0:
-            indices['indices']['taxa_natalidade'] = (
-                nascimentos_ano / total_femeas) * 100
+    except Exception as e:
+        logger.error(f"Erro no cálculo de índices: {str(e)}")
+        raise
 
-        # Taxa de mortalidade
-        total_animais = propriedade.animais.filter(status='ativo').count()
-        mortes_ano = propriedade.animais.filter(
-            data_morte__year=hoje.year,
-            status='morto'
-        ).count()
 
-        if total_animais > 0:
-            indices['indices']['taxa_mortalidade'] = (
-                mortes_ano / total_animais) * 100
+@shared_task(bind=True)
+def gerar_resumos_rebanho(self, data=None, dias=None):
+    """
+    Grava o resumo diário do rebanho das propriedades ativas.
 
-        # GMD médio do rebanho
-        pesagens_recentes = Pesagem.objects.filter(
-            animal__propriedade=propriedade,
-            data_pesagem__gte=hoje - timedelta(days=30)
-        )
+    Sem data, regenera os últimos DIAS_REVISAO_RESUMO dias até ontem para
+    incorporar pesagens e movimentações lançadas com atraso.
+    """
+    from .utils.resumo_rebanho import (DIAS_REVISAO_RESUMO,
+                                       reconstruir_resumo_rebanho)
 
-        if pesagens_recentes.exists():
-            gmds = []
-            for pesagem in pesagens_recentes:
-                gmd = pesagem.get_gmd_anterior()
-                if gmd:
-                    gmds.append(gmd)
+    try:
+        fim = date.fromisoformat(data) if data else (
+            timezone.now().date() - timedelta(days=1))
+        inicio = fim - timedelta(days=(dias or DIAS_REVISAO_RESUMO) - 1)
+        propriedades = list(
+            Propriedade.objects.filter(ativa=True).values_list('pk', flat=True))
 
-            if gmds:
-                indices['indices']['gmd_medio'] = sum(gmds) / len(gmds)
+        total = reconstruir_resumo_rebanho(inicio, fim, propriedades)
 
-        logger.info(f"Índices calculados para {propriedade.nome}")
+        logger.info(f"Resumo do rebanho gerado de {inicio} a {fim}: {total} linhas")
 
-        return indices
+        return {
+            'status': 'success',
+            'linhas': total,
+            'periodo': f"{inicio} a {fim}"
+        }
 
     except Exception as e:
-        logger.error(f"Erro no cálculo de índices: {str(e)}")
+        logger.error(f"Erro na geração do resumo do rebanho: {str(e)}")
         raise
 
 
@@ -448,10 +412,8 @@ def gerar_relatorio_propriedade(propriedade, data_inicio, data_fim):
             data_pesagem__range=[data_inicio, data_fim]
         )
 
-        # Lançamentos financeiros
-        lancamentos = propriedade.lancamentos_financeiros.filter(
-            data_lancamento__range=[data_inicio, data_fim]
-        )
+        # Lançamentos financeiros (meses completos vêm do resumo mensal)
+        financeiro = totais_periodo(propriedade, data_inicio, data_fim)
 
         relatorio = {
             'propriedade': propriedade.nome,
@@ -460,12 +422,8 @@ def gerar_relatorio_propriedade(propriedade, data_inicio, data_fim):
                 'total_animais': total_animais,
                 'total_manejos': manejos.count(),
                 'total_pesagens': pesagens.count(),
-                'total_receitas': lancamentos.filter(tipo='entrada').aggregate(
-                    total=Sum('valor')
-                )['total'] or 0,
-                'total_despesas': lancamentos.filter(tipo='saida').aggregate(
-                    total=Sum('valor')
-                )['total'] or 0,
+                'total_receitas': financeiro['entrada'],
+                'total_despesas': financeiro['saida'],
             },
             'manejos_por_tipo': list(manejos.values('tipo').annotate(
                 total=Count('id')
@@ -480,3 +438,138 @@ def gerar_relatorio_propriedade(propriedade, data_inicio, data_fim):
     except Exception as e:
         logger.error(f"Erro na geração do relatório: {str(e)}")
         return None
+
+
+def _iniciar_tarefa(tarefa, task_id):
+    """Marca a tarefa de processamento como em andamento"""
+    tarefa.status = 'processando'
+    tarefa.progresso = 0
+    tarefa.task_id = task_id or ''
+    tarefa.data_inicio = timezone.now()
+    tarefa.save(update_fields=['status', 'progresso', 'task_id', 'data_inicio'])
+
+
+def _finalizar_tarefa(tarefa, status, **campos):
+    """Grava o desfecho da tarefa de processamento"""
+    tarefa.status = status
+    tarefa.data_conclusao = timezone.now()
+    for campo, valor in campos.items():
+        setattr(tarefa, campo, valor)
+    if status == 'concluida':
+        tarefa.progresso = 100
+    tarefa.save()
+
+
+def _registrar_progresso(tarefa, total):
+    """Cria o callback que converte linhas processadas em percentual"""
+    def registrar(processadas):
+        if total:
+            # 100% só é gravado quando a tarefa é finalizada
+            tarefa.atualizar_progresso(min(processadas * 100 // total, 99))
+    return registrar
+
+
+@shared_task(bind=True)
+def importar_animais_planilha(self, tarefa_id):
+    """
+    Importa a planilha enviada para uma tarefa de processamento.
+
+    Cada bloco de linhas é gravado em sua própria transação, então o
+    progresso fica visível para quem consulta a tarefa.
+    """
+    import openpyxl
+
+    from .utils.planilhas import (CABECALHOS_OBRIGATORIOS_IMPORTACAO,
+                                  ImportadorAnimais,
+                                  mapear_cabecalhos_importacao)
+
+    tarefa = TarefaProcessamento.objects.select_related('usuario').get(id=tarefa_id)
+    _iniciar_tarefa(tarefa, self.request.id)
+
+    try:
+        with tarefa.arquivo_entrada.open('rb') as arquivo:
+            wb = openpyxl.load_workbook(arquivo, read_only=True, data_only=True)
+            try:
+                ws = wb.active
+                total_linhas = max((ws.max_row or 0) - 1, 0)
+                rows = ws.iter_rows(values_only=True)
+
+                headers = mapear_cabecalhos_importacao(next(rows, None) or [])
+                headers_faltantes = [
+                    header for header in CABECALHOS_OBRIGATORIOS_IMPORTACAO
+                    if header not in headers
+                ]
+                if headers_faltantes:
+                    raise ValueError(
+                        f'Colunas obrigatórias ausentes: {", ".join(headers_faltantes)}')
+
+                importador = ImportadorAnimais(
+                    tarefa.usuario,
+                    Propriedade.objects.filter(proprietario=tarefa.usuario),
+                    headers
+                )
+                importador.importar(
+                    rows, _registrar_progresso(tarefa, total_linhas))
+            finally:
+                wb.close()
+
+        resultado = importador.resumo()
+        _finalizar_tarefa(tarefa, 'concluida', resultado=resultado)
+        logger.info(f"Importação concluída: {tarefa.id} - {resultado['message']}")
+        return resultado
+
+    except Exception as e:
+        logger.error(f"Erro na importação de animais: {str(e)}")
+        _finalizar_tarefa(tarefa, 'erro', mensagem_erro=str(e))
+        raise
+
+
+@shared_task(bind=True)
+def exportar_animais_planilha(self, tarefa_id):
+    """
+    Gera a planilha de exportação de animais de uma tarefa de processamento
+    e a grava em MEDIA_ROOT.
+    """
+    from .utils.planilhas import (filtrar_animais_exportacao,
+                                  gerar_planilha_animais)
+
+    tarefa = TarefaProcessamento.objects.select_related('usuario').get(id=tarefa_id)
+    _iniciar_tarefa(tarefa, self.request.id)
+    parametros = tarefa.parametros
+
+    try:
+        queryset = Animal.objects.filter(
+            propriedade__in=Propriedade.objects.filter(proprietario=tarefa.usuario)
+        )
+        if tarefa.propriedade_id:
+            queryset = queryset.filter(propriedade_id=tarefa.propriedade_id)
+        queryset = filtrar_animais_exportacao(queryset, parametros)
+        total_animais = queryset.count()
+
+        propriedade_nome = ''
+        if tarefa.propriedade_id:
+            propriedade_nome = f'_{tarefa.propriedade.nome.replace(" ", "_")}'
+        timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
+        filename = f'animais_export{propriedade_nome}_{timestamp}.xlsx'
+
+        # A planilha é escrita em blocos em um arquivo temporário
+        with tempfile.TemporaryFile() as destino:
+            for bloco in gerar_planilha_animais(
+                queryset,
+                parametros.get('incluir_genealogia', False),
+                parametros.get('incluir_estatisticas', False),
+                _registrar_progresso(tarefa, total_animais)
+            ):
+                destino.write(bloco)
+            destino.seek(0)
+            tarefa.arquivo_resultado.save(filename, File(destino), save=False)
+
+        resultado = {'total_animais': total_animais, 'arquivo': filename}
+        _finalizar_tarefa(tarefa, 'concluida', resultado=resultado)
+        logger.info(f"Exportação concluída: {tarefa.id} - {filename}")
+        return resultado
+
+    except Exception as e:
+        logger.error(f"Erro na exportação de animais: {str(e)}")
+        _finalizar_tarefa(tarefa, 'erro', mensagem_erro=str(e))
+        raise
@@ -1,3 +1,314 @@
-from django.test import TestCase
+"""
+AgroNexus - Sistema
+Testes de regressão (consultas, índices e cálculos sobre dados sintéticos)
+"""
 
-# Create your tests here.
+import tempfile
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+
+from .models import (Animal, Area, ContaFinanceira, HistoricoLoteAnimal,
+                     LancamentoFinanceiro, Lote, Pesagem, Propriedade, Usuario)
+from .utils.backup import MODELOS_BACKUP, gerar_backup, restaurar_backup
+from .utils.catalogo import obter_catalogo
+from .utils.dados_sinteticos import GeradorDadosSinteticos
+from .utils.estatisticas import (anotar_estatisticas_lotes,
+                                 calcular_total_ua_propriedade,
+                                 gerar_dashboard_propriedade)
+from .utils.indices import verificar_indices
+from .utils.resumo_financeiro import fim_do_mes, reconstruir_saldos_contas
+from .utils.monitoramento import (RegistroConsultas, registrar_requisicao,
+                                  relatorio_endpoints, zerar_metricas)
+from .utils.ocupacao import anotar_ocupacao_areas
+from .utils.resumo_rebanho import calcular_resumo_rebanho
+from .utils.zootecnicos import calcular_indices_zootecnicos
+
+
+class DadosSinteticosTestCase(TestCase):
+    """Uma propriedade sintética pequena (espécies e raças carregadas)"""
+    total_animais = 60
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('carregar_especies_racas', stdout=StringIO())
+        cls.usuario = Usuario.objects.create_user(
+            'teste', 'teste@agronexus.com', 'senha-teste')
+        GeradorDadosSinteticos(cls.usuario, semente=1).gerar_propriedade(
+            0, animais=cls.total_animais, pesagens_por_animal=3,
+            inseminacoes=10, lancamentos=10, areas=2, lotes=2)
+        cls.propriedade = Propriedade.objects.get(proprietario=cls.usuario)
+
+
+class ConsultasApiTestCase(DadosSinteticosTestCase):
+    """Cliente autenticado e catálogo de espécies/raças já carregado"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.usuario)
+        obter_catalogo()
+
+    def assertConsultasConstantes(self, consultas, url, tamanhos=(10, 40)):
+        """A listagem executa `consultas` consultas com qualquer tamanho de página"""
+        for tamanho in tamanhos:
+            with self.subTest(url=url, tamanho=tamanho), \
+                    mock.patch.object(PageNumberPagination, 'page_size', tamanho):
+                with self.assertNumQueries(consultas):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data['results']), tamanho)
+
+
+class ListagemAnimaisConsultasTest(ConsultasApiTestCase):
+
+    def test_listagem_de_animais(self):
+        # Contagem e página
+        self.assertConsultasConstantes(2, '/api/v1/animais/')
+
+    def test_animais_do_lote(self):
+        lote = max(Lote.objects.all(), key=lambda lote: lote.animais.count())
+        # Lote, proprietário (permissão), contagem e página
+        self.assertConsultasConstantes(4, f'/api/v1/lotes/{lote.pk}/animais/', (10, 20))
+
+
+class CamposDinamicosConsultasTest(ConsultasApiTestCase):
+
+    def test_fields_e_expand_mantem_os_joins_da_listagem(self):
+        # ua_value e lote_atual dependem de relações que o serializer não declara
+        for parametros in ('fields=id,ua_value', 'fields=id,lote_atual',
+                           'expand=especie', 'expand=propriedade',
+                           'fields=id,pai.identificacao_unica&expand=propriedade'):
+            self.assertConsultasConstantes(2, f'/api/v1/animais/?{parametros}')
+
+
+def _copiar_pesagem(pesagem, **campos):
+    """Nova pesagem (com manejo próprio) a partir de uma existente"""
+    manejo = pesagem.manejo
+    manejo.pk = None
+    manejo.save()
+    pesagem.pk = None
+    pesagem.manejo = manejo
+    for campo, valor in campos.items():
+        setattr(pesagem, campo, valor)
+    pesagem.save()
+    return pesagem
+
+
+class SnapshotPesagemTest(DadosSinteticosTestCase):
+
+    def test_instancia_antiga_nao_sobrescreve_snapshot(self):
+        pesagem = Pesagem.objects.filter(animal__propriedade=self.propriedade).first()
+        animal = Animal.objects.get(pk=pesagem.animal_id)
+        data = animal.data_ultima_pesagem + timedelta(days=1)
+        _copiar_pesagem(pesagem, peso_kg=999, data_pesagem=data)
+
+        animal.observacoes = 'editado'
+        animal.save()
+
+        animal.refresh_from_db()
+        self.assertEqual(animal.observacoes, 'editado')
+        self.assertEqual(animal.peso_atual, 999)
+        self.assertEqual(animal.data_ultima_pesagem, data)
+
+
+class BackupTest(DadosSinteticosTestCase):
+
+    def _registros(self):
+        return {
+            nome: sorted(modelo.objects.values_list('pk', *[
+                campo.attname for campo in modelo._meta.concrete_fields
+                if campo.name in ('data_criacao', 'data_atualizacao')]))
+            for nome, modelo in MODELOS_BACKUP
+        }
+
+    def test_restaura_em_banco_vazio(self):
+        antes = self._registros()
+        with tempfile.TemporaryDirectory() as diretorio:
+            manifesto = gerar_backup(diretorio)
+            for _, modelo in reversed(MODELOS_BACKUP):
+                modelo.objects.all().delete()
+            self.assertFalse(any(modelo.objects.exists() for _, modelo in MODELOS_BACKUP))
+
+            restaurados = restaurar_backup(manifesto['diretorio'])
+
+        connection.check_constraints()
+        self.assertEqual(restaurados, {nome: len(pks) for nome, pks in antes.items()})
+        # Mesmos registros e mesmas datas de criação/atualização
+        self.assertEqual(self._registros(), antes)
+        self.assertTrue(Animal.objects.filter(peso_atual__isnull=False).exists())
+
+
+class SaldoContasTest(DadosSinteticosTestCase):
+    """Saldos mantidos pelos sinais contra a reconstrução completa"""
+
+    def setUp(self):
+        self.conta = ContaFinanceira.objects.filter(propriedade=self.propriedade).first()
+        self.outra = ContaFinanceira.objects.create(
+            propriedade=self.propriedade, nome='Caixa', tipo='caixa')
+        self.hoje = timezone.now().date()
+
+    def _saldos(self):
+        datas = [fim_do_mes(self.hoje - timedelta(days=30 * meses)) for meses in range(4)]
+        return {
+            conta.pk: (conta.saldo_movimentacoes,
+                       [conta.get_saldo_em(data) for data in datas])
+            for conta in ContaFinanceira.objects.filter(propriedade=self.propriedade)
+        }
+
+    def assertSaldosReconstruidos(self):
+        incrementais = self._saldos()
+        reconstruir_saldos_contas()
+        self.assertEqual(incrementais, self._saldos())
+
+    def _lancamento(self, **campos):
+        return LancamentoFinanceiro.objects.create(**{
+            'propriedade': self.propriedade, 'conta_origem': self.conta,
+            'tipo': 'entrada', 'valor': 50, 'descricao': 'Teste',
+            'data_lancamento': self.hoje, **campos})
+
+    def test_criar_editar_mover_e_excluir(self):
+        lancamento = self._lancamento()
+        transferencia = self._lancamento(
+            tipo='transferencia', valor=30, conta_destino=self.outra,
+            data_lancamento=self.hoje - timedelta(days=40))
+        self.assertSaldosReconstruidos()
+
+        lancamento.valor = 80
+        lancamento.tipo = 'saida'
+        lancamento.save()
+        self.assertSaldosReconstruidos()
+
+        lancamento.conta_origem = self.outra
+        lancamento.data_lancamento = self.hoje - timedelta(days=70)
+        lancamento.save()
+        self.assertSaldosReconstruidos()
+
+        transferencia.delete()
+        lancamento.delete()
+        self.assertSaldosReconstruidos()
+
+    def test_conta_antiga_nao_sobrescreve_saldo(self):
+        conta = ContaFinanceira.objects.get(pk=self.conta.pk)
+        saldo = conta.saldo_movimentacoes
+        self._lancamento()
+
+        conta.nome = 'Renomeada'
+        conta.save()
+
+        conta.refresh_from_db()
+        self.assertEqual(conta.nome, 'Renomeada')
+        self.assertEqual(conta.saldo_movimentacoes, saldo + 50)
+        self.assertSaldosReconstruidos()
+
+    def test_erro_no_saldo_desfaz_o_lancamento(self):
+        total = LancamentoFinanceiro.objects.count()
+        with mock.patch('agronexus.signals.aplicar_movimentos', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self._lancamento()
+        self.assertEqual(LancamentoFinanceiro.objects.count(), total)
+        self.assertSaldosReconstruidos()
+
+
+class ResumoRebanhoTest(DadosSinteticosTestCase):
+    """O resumo de hoje continua os números das estatísticas ao vivo"""
+
+    def setUp(self):
+        # Um lote inativo com animais e alguns animais sem lote
+        lote = Lote.objects.filter(propriedade=self.propriedade, animais__isnull=False).first()
+        Lote.objects.filter(pk=lote.pk).update(ativo=False)
+        sem_lote = Animal.objects.filter(
+            propriedade=self.propriedade, status='ativo'
+        ).exclude(lote_atual=lote).values_list('pk', flat=True)[:5]
+        HistoricoLoteAnimal.objects.filter(animal__in=list(sem_lote)).delete()
+        Animal.objects.filter(pk__in=list(sem_lote)).update(lote_atual=None)
+
+    def test_resumo_de_hoje_igual_as_estatisticas(self):
+        linhas = {}
+        for linha in calcular_resumo_rebanho(timezone.now().date(), [self.propriedade.pk]):
+            linhas[(linha.nivel, linha.lote_id or linha.area_id)] = linha
+
+        propriedade = linhas['propriedade', None]
+        dashboard = gerar_dashboard_propriedade(self.propriedade)['estatisticas_gerais']
+        self.assertEqual(propriedade.total_animais, dashboard['total_animais'])
+        self.assertEqual(float(propriedade.total_ua),
+                         round(calcular_total_ua_propriedade(self.propriedade), 2))
+        self.assertEqual(float(propriedade.taxa_ocupacao),
+                         round(dashboard['taxa_ocupacao_global'], 3))
+
+        for lote in anotar_estatisticas_lotes(Lote.objects.filter(
+                propriedade=self.propriedade, ativo=True)):
+            with self.subTest(lote=lote.nome):
+                linha = linhas['lote', lote.pk]
+                self.assertEqual(linha.total_animais, lote.total_animais)
+                self.assertEqual(float(linha.total_ua), round(lote.total_ua, 2))
+
+        for area in anotar_ocupacao_areas(Area.objects.filter(propriedade=self.propriedade)):
+            with self.subTest(area=area.nome):
+                linha = linhas.get(('area', area.pk))
+                self.assertEqual(float(linha.total_ua) if linha else 0,
+                                 round(area.total_ua, 2))
+
+
+class IndicesZootecnicosTest(DadosSinteticosTestCase):
+
+    def test_data_referencia_ignora_registros_posteriores(self):
+        data = timezone.now().date() - timedelta(days=30)
+        antes = calcular_indices_zootecnicos(self.propriedade, data)
+
+        pesagem = _copiar_pesagem(
+            Pesagem.objects.filter(animal__propriedade=self.propriedade).first(),
+            data_pesagem=data + timedelta(days=10))
+        pesagem.peso_kg += 50
+        pesagem.save()
+        Animal.objects.filter(pk=pesagem.animal_id).update(
+            status='morto', data_morte=data + timedelta(days=5))
+
+        self.assertEqual(calcular_indices_zootecnicos(self.propriedade, data), antes)
+
+
+class IndicesConsultasTest(DadosSinteticosTestCase):
+
+    def test_consultas_frequentes_usam_indices(self):
+        for resultado in verificar_indices():
+            with self.subTest(consulta=resultado['consulta']):
+                self.assertIsNotNone(resultado['indice_usado'], resultado['plano'])
+
+    def test_comando_verificar_indices(self):
+        call_command('verificar_indices', stdout=StringIO())
+
+
+class MonitoramentoConsultasTest(SimpleTestCase):
+
+    def setUp(self):
+        zerar_metricas()
+        self.addCleanup(zerar_metricas)
+
+    def test_requisicoes_simultaneas_nao_perdem_contagens(self):
+        def requisicoes(total_consultas):
+            registro = RegistroConsultas()
+            registro.total = total_consultas
+            for indice in range(50):
+                registrar_requisicao(
+                    f'Endpoint{indice % 2}', registro, 0.01, excedeu=indice < 10)
+
+        threads = [threading.Thread(target=requisicoes, args=(i,)) for i in range(1, 9)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        relatorio = {item['endpoint']: item for item in relatorio_endpoints()}
+        self.assertEqual(set(relatorio), {'Endpoint0', 'Endpoint1'})
+        for item in relatorio.values():
+            self.assertEqual(item['requisicoes'], 200)
+            self.assertEqual(item['consultas_total'], 25 * sum(range(1, 9)))
+            self.assertEqual(item['consultas_max'], 8)
+            self.assertEqual(item['orcamento_excedido'], 40)
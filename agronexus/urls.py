@@ -15,10 +15,12 @@ from .api.v1.views import (AdministracaoMedicamentoViewSet, AnimalViewSet,
                            HistoricoLoteAnimalViewSet,
                            HistoricoOcupacaoAreaViewSet, InseminacaoViewSet,
                            LancamentoFinanceiroViewSet, LoteViewSet,
-                           ManejoViewSet, MedicamentoViewSet, PartoViewSet,
+                           ManejoViewSet, MedicamentoViewSet,
+                           MonitorConsultasViewSet, PartoViewSet,
                            PesagemViewSet, PropriedadeViewSet,
                            ProtocoloIATFViewSet, RacaAnimalViewSet,
                            RelatorioPersonalizadoViewSet,
+                           TarefaProcessamentoViewSet,
                            UsuarioViewSet, VacinacaoViewSet, VacinaViewSet)
 
 # Configuração do router
@@ -51,6 +53,9 @@ router.register(r'relatorios-personalizados', RelatorioPersonalizadoViewSet)
 router.register(r'configuracoes-sistema', ConfiguracaoSistemaViewSet)
 router.register(r'historico-lote-animal', HistoricoLoteAnimalViewSet)
 router.register(r'historico-ocupacao-area', HistoricoOcupacaoAreaViewSet)
+router.register(r'tarefas', TarefaProcessamentoViewSet)
+router.register(r'monitor-consultas', MonitorConsultasViewSet,
+                basename='monitor-consultas')
 
 urlpatterns = [
     # API v1 endpoints
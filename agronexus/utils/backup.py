@@ -0,0 +1,288 @@
+"""
+AgroNexus - Sistema
+Backup em streaming (JSON Lines compactado por modelo) e restauração em lote
+"""
+
+import datetime
+import gzip
+import io
+import json
+import os
+from itertools import islice
+
+from django.apps import apps
+from django.conf import settings
+from django.core import serializers
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import (Animal, AnimalManejo, Area, CategoriaFinanceira,
+                      ConfiguracaoSistema, ContaFinanceira, EspecieAnimal,
+                      HistoricoLoteAnimal, HistoricoOcupacaoArea,
+                      LancamentoFinanceiro, Lote, Manejo, Pesagem,
+                      Propriedade, RacaAnimal, Usuario)
+
+VERSAO_BACKUP = '2.0'
+ARQUIVO_MANIFESTO = 'manifesto.json'
+TAMANHO_LOTE_BACKUP = 2000
+
+# Ordem de dependência: a restauração segue a mesma sequência. Todas as
+# chaves estrangeiras dos modelos apontam para modelos anteriores da lista
+# (ou para o próprio modelo), então um banco vazio pode ser restaurado.
+MODELOS_BACKUP = [
+    ('usuarios', Usuario),
+    ('especies_animais', EspecieAnimal),
+    ('racas_animais', RacaAnimal),
+    ('propriedades', Propriedade),
+    ('configuracoes_sistema', ConfiguracaoSistema),
+    ('areas', Area),
+    ('lotes', Lote),
+    ('animais', Animal),
+    ('historico_lote_animal', HistoricoLoteAnimal),
+    ('historico_ocupacao_area', HistoricoOcupacaoArea),
+    ('manejos', Manejo),
+    ('animal_manejo', AnimalManejo),
+    ('pesagens', Pesagem),
+    ('contas_financeiras', ContaFinanceira),
+    ('categorias_financeiras', CategoriaFinanceira),
+    ('lancamentos_financeiros', LancamentoFinanceiro),
+]
+
+EXTENSOES_COMPRESSAO = {
+    'gzip': 'jsonl.gz',
+    'zstd': 'jsonl.zst',
+}
+
+
+class _CodificadorBackup(DjangoJSONEncoder):
+    """Mantém os microssegundos que o DjangoJSONEncoder descarta"""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _modulo_zstd():
+    """Importa o pacote opcional zstandard"""
+    try:
+        import zstandard
+    except ImportError:
+        raise ImproperlyConfigured(
+            'Compressão zstd requer o pacote zstandard instalado')
+    return zstandard
+
+
+def _abrir_arquivo(caminho, modo, compressao):
+    """Abre um arquivo JSON Lines compactado em modo texto ('r' ou 'w')"""
+    if compressao == 'gzip':
+        return gzip.open(caminho, f'{modo}t', encoding='utf-8')
+    if compressao == 'zstd':
+        zstandard = _modulo_zstd()
+        arquivo = open(caminho, f'{modo}b')
+        if modo == 'w':
+            fluxo = zstandard.ZstdCompressor().stream_writer(arquivo)
+        else:
+            fluxo = zstandard.ZstdDecompressor().stream_reader(arquivo)
+        return io.TextIOWrapper(fluxo, encoding='utf-8')
+    raise ImproperlyConfigured(f'Compressão de backup desconhecida: {compressao}')
+
+
+def _campo_alteracao(modelo):
+    """
+    Campo de data usado para selecionar registros no backup incremental
+    (None: modelo sem data de alteração, sempre copiado por inteiro)
+    """
+    campos = {campo.name for campo in modelo._meta.get_fields()}
+    for campo in ('data_atualizacao', 'data_criacao'):
+        if campo in campos:
+            return campo
+    return None
+
+
+def _em_lotes(iteravel, tamanho):
+    iterador = iter(iteravel)
+    while True:
+        lote = list(islice(iterador, tamanho))
+        if not lote:
+            return
+        yield lote
+
+
+def listar_backups(diretorio=None):
+    """Manifestos dos backups existentes, do mais antigo para o mais recente"""
+    diretorio = diretorio or settings.BACKUP_DIR
+    if not os.path.isdir(diretorio):
+        return []
+
+    manifestos = []
+    for nome in os.listdir(diretorio):
+        caminho = os.path.join(diretorio, nome, ARQUIVO_MANIFESTO)
+        if os.path.isfile(caminho):
+            with open(caminho, encoding='utf-8') as arquivo:
+                manifesto = json.load(arquivo)
+            manifesto['diretorio'] = os.path.join(diretorio, nome)
+            manifestos.append(manifesto)
+    return sorted(manifestos, key=lambda manifesto: manifesto['data_inicio'])
+
+
+def gerar_backup(diretorio=None, incremental=False, compressao=None,
+                 tamanho_lote=TAMANHO_LOTE_BACKUP):
+    """
+    Gera um backup com um arquivo JSON Lines compactado por modelo.
+
+    Os registros são lidos com iterator() e gravados lote a lote, então a
+    memória usada não depende do tamanho do banco. No modo incremental
+    só entram os registros alterados desde o início do último backup
+    (modelos sem data de alteração entram por inteiro); exclusões não são
+    registradas e exigem um backup completo.
+    """
+    diretorio = diretorio or settings.BACKUP_DIR
+    compressao = compressao or settings.BACKUP_COMPRESSAO
+    extensao = EXTENSOES_COMPRESSAO.get(compressao)
+    if extensao is None:
+        raise ImproperlyConfigured(f'Compressão de backup desconhecida: {compressao}')
+    if compressao == 'zstd':
+        _modulo_zstd()
+
+    desde = None
+    if incremental:
+        anteriores = listar_backups(diretorio)
+        if anteriores:
+            desde = parse_datetime(anteriores[-1]['data_inicio'])
+
+    data_inicio = timezone.now()
+    tipo = 'incremental' if desde else 'completo'
+    destino = os.path.join(
+        diretorio, f"backup_{tipo}_{data_inicio.strftime('%Y%m%d_%H%M%S')}")
+    os.makedirs(destino, exist_ok=True)
+
+    serializador = serializers.get_serializer('python')()
+    modelos = {}
+    for nome, modelo in MODELOS_BACKUP:
+        queryset = modelo.objects.order_by('pk')
+        campo_alteracao = _campo_alteracao(modelo)
+        if desde and campo_alteracao:
+            queryset = queryset.filter(**{f'{campo_alteracao}__gte': desde})
+
+        arquivo_modelo = f'{nome}.{extensao}'
+        registros = 0
+        with _abrir_arquivo(os.path.join(destino, arquivo_modelo), 'w', compressao) as arquivo:
+            for lote in _em_lotes(queryset.iterator(chunk_size=tamanho_lote), tamanho_lote):
+                for registro in serializador.serialize(lote):
+                    arquivo.write(json.dumps(registro, cls=_CodificadorBackup))
+                    arquivo.write('\n')
+                registros += len(lote)
+
+        modelos[nome] = {
+            'modelo': modelo._meta.label_lower,
+            'arquivo': arquivo_modelo,
+            'registros': registros,
+        }
+
+    manifesto = {
+        'versao': VERSAO_BACKUP,
+        'tipo': tipo,
+        'compressao': compressao,
+        'data_inicio': data_inicio.isoformat(),
+        'data_fim': timezone.now().isoformat(),
+        'desde': desde.isoformat() if desde else None,
+        'modelos': modelos,
+    }
+    with open(os.path.join(destino, ARQUIVO_MANIFESTO), 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo, indent=2)
+
+    manifesto['diretorio'] = destino
+    return manifesto
+
+
+def _campos_data_automatica(modelo):
+    return [
+        campo.attname for campo in modelo._meta.concrete_fields
+        if getattr(campo, 'auto_now', False) or getattr(campo, 'auto_now_add', False)
+    ]
+
+
+def _gravar_lote_restauracao(modelo, registros):
+    """
+    Insere ou atualiza (upsert pela chave primária) um lote de registros.
+
+    bulk_create preenche auto_now/auto_now_add com o momento atual; as
+    datas do backup são regravadas em seguida com bulk_update.
+    """
+    objetos = [
+        desserializado.object
+        for desserializado in serializers.deserialize('python', registros)
+    ]
+    opcoes = modelo._meta
+    campos_data = _campos_data_automatica(modelo)
+    datas = [[getattr(objeto, campo) for campo in campos_data] for objeto in objetos]
+
+    campos_atualizacao = [
+        campo.name for campo in opcoes.concrete_fields if not campo.primary_key
+    ]
+    argumentos = {
+        'update_conflicts': True,
+        'update_fields': campos_atualizacao,
+    }
+    if connection.features.supports_update_conflicts_with_target:
+        argumentos['unique_fields'] = [opcoes.pk.name]
+    modelo.objects.bulk_create(objetos, **argumentos)
+
+    if campos_data:
+        for objeto, valores in zip(objetos, datas):
+            for campo, valor in zip(campos_data, valores):
+                setattr(objeto, campo, valor)
+        modelo.objects.bulk_update(objetos, campos_data)
+
+
+def restaurar_backup(diretorio, tamanho_lote=1000, ao_restaurar_modelo=None):
+    """
+    Restaura um backup gerado por gerar_backup.
+
+    Os arquivos são lidos linha a linha e gravados com bulk_create em lotes,
+    atualizando registros já existentes. Tudo roda em uma única transação.
+    O destino pode ser um banco vazio (só com as migrações) ou o próprio
+    banco de origem; dados de referência recriados à parte (ex.: espécies
+    de carregar_especies_racas) têm outras chaves e conflitam com os do
+    backup. Grupos e permissões dos usuários não fazem parte do backup
+    (recrie-os com setup_groups).
+    Retorna {nome_modelo: registros_restaurados}.
+    """
+    from .cache import invalidar_propriedade
+    from .catalogo import invalidar_catalogo
+    from .estatisticas import recalcular_pesos_atuais
+    from .resumo_financeiro import reconstruir_resumo_financeiro
+
+    with open(os.path.join(diretorio, ARQUIVO_MANIFESTO), encoding='utf-8') as arquivo:
+        manifesto = json.load(arquivo)
+
+    restaurados = {}
+    with transaction.atomic():
+        for nome, info in manifesto['modelos'].items():
+            modelo = apps.get_model(info['modelo'])
+            caminho = os.path.join(diretorio, info['arquivo'])
+            total = 0
+            with _abrir_arquivo(caminho, 'r', manifesto['compressao']) as arquivo:
+                linhas = (json.loads(linha) for linha in arquivo if linha.strip())
+                for lote in _em_lotes(linhas, tamanho_lote):
+                    _gravar_lote_restauracao(modelo, lote)
+                    total += len(lote)
+            restaurados[nome] = total
+            if ao_restaurar_modelo:
+                ao_restaurar_modelo(nome, total)
+
+        # bulk_create não dispara os sinais que mantêm o snapshot de
+        # pesagens, os saldos das contas e o catálogo de espécies e raças
+        if restaurados.get('pesagens'):
+            recalcular_pesos_atuais()
+        if restaurados.get('lancamentos_financeiros') or restaurados.get('contas_financeiras'):
+            reconstruir_resumo_financeiro()
+        if restaurados.get('especies_animais') or restaurados.get('racas_animais'):
+            invalidar_catalogo()
+        invalidar_propriedade(*Propriedade.objects.values_list('pk', flat=True))
+
+    return restaurados
@@ -0,0 +1,230 @@
+"""
+AgroNexus - Sistema
+Medição de tempo e consultas dos principais endpoints da API
+"""
+
+import io
+import json
+import platform
+import statistics
+import time
+from dataclasses import dataclass, field
+
+import django
+from django.conf import settings
+from django.db import connection, transaction
+from django.test import Client
+from django.utils import timezone
+
+from ..models import (Animal, EstacaoMonta, Inseminacao, LancamentoFinanceiro,
+                      Lote, Pesagem, Propriedade)
+from .cache import (NAMESPACE_DASHBOARDS, escopo_propriedade,
+                    incrementar_versao)
+from .monitoramento import RegistroConsultas
+from .planilhas import PlanilhaXlsxStreaming
+
+PREFIXO_API = '/api/v1'
+LINHAS_IMPORTACAO = 500
+
+
+@dataclass
+class CasoBenchmark:
+    """Requisição medida pelo benchmark"""
+    nome: str
+    url: str
+    metodo: str = 'get'
+    dados: dict = field(default_factory=dict)
+    # Gera os dados a cada repetição (ex.: arquivo de upload)
+    gerar_dados: object = None
+    # Executado antes de cada repetição, fora da medição
+    preparar: object = None
+    # Desfaz as gravações da requisição ao final
+    desfazer: bool = False
+
+
+def _planilha_importacao(propriedade, linhas, sufixo):
+    """Planilha .xlsx no formato do template de importação"""
+    cabecalho = ['ID Único', 'Propriedade', 'Espécie', 'Sexo',
+                 'Data Nascimento', 'Categoria', 'Status', 'Peso Atual (kg)']
+    dados = (
+        [f'IMP{sufixo}-{numero:06d}', propriedade.nome, 'bovino',
+         'F' if numero % 2 else 'M', '01/01/2023',
+         'novilha' if numero % 2 else 'novilho', 'ativo', '320,5']
+        for numero in range(linhas)
+    )
+    planilha = PlanilhaXlsxStreaming()
+    conteudo = b''.join(planilha.escrever_aba('Animais', dados, cabecalho))
+    conteudo += b''.join(planilha.finalizar())
+    arquivo = io.BytesIO(conteudo)
+    arquivo.name = 'benchmark.xlsx'
+    return arquivo
+
+
+def casos_padrao(propriedade, linhas_importacao=LINHAS_IMPORTACAO):
+    """Endpoints medidos para a propriedade informada"""
+    filtro = f'propriedade={propriedade.pk}'
+    estacao = EstacaoMonta.objects.filter(propriedade=propriedade).first()
+
+    def dashboard_frio():
+        incrementar_versao(NAMESPACE_DASHBOARDS, escopo_propriedade(propriedade.pk))
+
+    casos = [
+        CasoBenchmark('animais_lista', f'{PREFIXO_API}/animais/?{filtro}'),
+        CasoBenchmark('lotes_lista', f'{PREFIXO_API}/lotes/?{filtro}'),
+        CasoBenchmark(
+            'dashboard_propriedade',
+            f'{PREFIXO_API}/propriedades/{propriedade.pk}/dashboard/',
+            preparar=dashboard_frio),
+        CasoBenchmark(
+            'dashboard_propriedade_cache',
+            f'{PREFIXO_API}/propriedades/{propriedade.pk}/dashboard/'),
+        CasoBenchmark(
+            'fluxo_caixa',
+            f'{PREFIXO_API}/lancamentos-financeiros/fluxo_caixa/?{filtro}'),
+        CasoBenchmark(
+            'exportar_excel', f'{PREFIXO_API}/animais/exportar_excel/',
+            metodo='post',
+            dados={'propriedade_id': str(propriedade.pk),
+                   'incluir_estatisticas': True}),
+        CasoBenchmark(
+            'importar_planilha', f'{PREFIXO_API}/animais/importar_planilha/',
+            metodo='post', desfazer=True,
+            gerar_dados=lambda repeticao: {'arquivo': _planilha_importacao(
+                propriedade, linhas_importacao, repeticao)}),
+    ]
+    if estacao is not None:
+        casos.insert(4, CasoBenchmark(
+            'dashboard_estacao_monta',
+            f'{PREFIXO_API}/estacoes-monta/{estacao.pk}/dashboard/'))
+    return casos
+
+
+def _executar(cliente, caso, repeticao):
+    """Executa uma repetição e retorna (status, tempo, consultas, bytes)"""
+    if caso.preparar:
+        caso.preparar()
+    dados = caso.gerar_dados(repeticao) if caso.gerar_dados else caso.dados
+    requisicao = getattr(cliente, caso.metodo)
+    if caso.metodo == 'post' and not caso.gerar_dados:
+        parametros = {'data': json.dumps(dados), 'content_type': 'application/json'}
+    else:
+        parametros = {'data': dados}
+
+    registro = RegistroConsultas()
+    with transaction.atomic():
+        inicio = time.perf_counter()
+        with connection.execute_wrapper(registro):
+            response = requisicao(caso.url, **parametros)
+            # Respostas em streaming só são geradas ao serem consumidas
+            if response.streaming:
+                tamanho = sum(len(bloco) for bloco in response.streaming_content)
+            else:
+                tamanho = len(response.content)
+        tempo = time.perf_counter() - inicio
+        if caso.desfazer:
+            transaction.set_rollback(True)
+    return response.status_code, tempo, registro.total, tamanho
+
+
+def medir_caso(cliente, caso, repeticoes=5, aquecimento=1):
+    """Mede um caso; as repetições de aquecimento são descartadas"""
+    for numero in range(aquecimento):
+        _executar(cliente, caso, f'a{numero}')
+
+    tempos = []
+    consultas = []
+    for numero in range(repeticoes):
+        status, tempo, total_consultas, tamanho = _executar(cliente, caso, numero)
+        tempos.append(tempo * 1000)
+        consultas.append(total_consultas)
+
+    return {
+        'url': caso.url,
+        'metodo': caso.metodo.upper(),
+        'status': status,
+        'repeticoes': repeticoes,
+        'tempo_ms_min': round(min(tempos), 2),
+        'tempo_ms_mediana': round(statistics.median(tempos), 2),
+        'tempo_ms_medio': round(statistics.mean(tempos), 2),
+        'tempo_ms_max': round(max(tempos), 2),
+        'consultas': max(consultas),
+        'bytes': tamanho,
+    }
+
+
+def volume_dados(propriedade):
+    """Quantidade de registros da propriedade medida"""
+    return {
+        'animais': Animal.objects.filter(propriedade=propriedade).count(),
+        'pesagens': Pesagem.objects.filter(animal__propriedade=propriedade).count(),
+        'lotes': Lote.objects.filter(propriedade=propriedade).count(),
+        'inseminacoes': Inseminacao.objects.filter(
+            animal__propriedade=propriedade).count(),
+        'lancamentos': LancamentoFinanceiro.objects.filter(
+            propriedade=propriedade).count(),
+    }
+
+
+def executar_benchmark(usuario, propriedade=None, repeticoes=5, aquecimento=1,
+                       casos=None, ao_medir=None):
+    """
+    Mede os endpoints autenticado como `usuario` e retorna o resultado no
+    formato gravado em JSON. `ao_medir`, se informado, é chamado com o nome
+    e o resultado de cada caso.
+    """
+    if propriedade is None:
+        propriedade = (Propriedade.objects.filter(proprietario=usuario)
+                       .order_by('data_criacao').first())
+        if propriedade is None:
+            raise ValueError(f'Usuário {usuario} não possui propriedades')
+
+    # Um endpoint com erro é registrado com status 500 sem interromper os demais
+    cliente = Client(SERVER_NAME='localhost', raise_request_exception=False)
+    cliente.force_login(usuario)
+
+    resultados = {}
+    for caso in casos or casos_padrao(propriedade):
+        resultados[caso.nome] = medir_caso(cliente, caso, repeticoes, aquecimento)
+        if ao_medir:
+            ao_medir(caso.nome, resultados[caso.nome])
+
+    return {
+        'data_execucao': timezone.now().isoformat(),
+        'ambiente': {
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'banco': connection.vendor,
+            'cache': settings.CACHES[NAMESPACE_DASHBOARDS]['BACKEND'],
+        },
+        'propriedade': str(propriedade.pk),
+        'volume': volume_dados(propriedade),
+        'resultados': resultados,
+    }
+
+
+def comparar_resultados(atual, anterior, tolerancia=0.2):
+    """
+    Compara duas execuções caso a caso.
+
+    Um caso regrediu quando a mediana de tempo aumentou mais que
+    `tolerancia` (fração) ou quando passou a executar mais consultas.
+    """
+    comparacao = []
+    for nome, resultado in atual['resultados'].items():
+        base = anterior.get('resultados', {}).get(nome)
+        if base is None:
+            continue
+        tempo_atual = resultado['tempo_ms_mediana']
+        tempo_base = base['tempo_ms_mediana']
+        variacao = (tempo_atual - tempo_base) / tempo_base if tempo_base else 0
+        comparacao.append({
+            'caso': nome,
+            'tempo_ms_anterior': tempo_base,
+            'tempo_ms_atual': tempo_atual,
+            'variacao': round(variacao, 3),
+            'consultas_anterior': base['consultas'],
+            'consultas_atual': resultado['consultas'],
+            'regressao': (variacao > tolerancia
+                          or resultado['consultas'] > base['consultas']),
+        })
+    return comparacao
@@ -0,0 +1,221 @@
+"""
+AgroNexus - Sistema
+Camada de cache por namespace com chaves versionadas
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+# Namespaces configurados em settings.CACHE_NAMESPACES
+NAMESPACE_DASHBOARDS = 'dashboards'
+NAMESPACE_REFERENCIA = 'referencia'
+NAMESPACE_PERMISSOES = 'permissoes'
+
+# Namespaces com entradas agrupadas por propriedade
+NAMESPACES_PROPRIEDADE = (NAMESPACE_DASHBOARDS,)
+
+CHAVE_ACERTOS = 'dashboard:estatisticas:acertos'
+CHAVE_FALHAS = 'dashboard:estatisticas:falhas'
+
+
+def cache_namespace(namespace):
+    """Backend do namespace (LocMem por processo ou Redis compartilhado)"""
+    return caches[namespace]
+
+
+# ============================================================================
+# VERSÕES E CHAVES
+# ============================================================================
+
+def _nova_versao():
+    # Versão inicial baseada no relógio: se a chave de versão expirar ou for
+    # descartada, a nova versão nunca coincide com uma já usada
+    return time.time_ns()
+
+
+def _incrementar(cache, chave, inicial=0):
+    try:
+        return cache.incr(chave)
+    except ValueError:
+        # Chave ainda não existe (ou foi descartada)
+        cache.add(chave, inicial, timeout=None)
+        return cache.incr(chave)
+
+
+def obter_versao(namespace, escopo):
+    """Versão atual de um escopo (ex.: 'propriedade:<id>', 'vacinas')"""
+    cache = cache_namespace(namespace)
+    chave = f'versao:{escopo}'
+    versao = cache.get(chave)
+    if versao is None:
+        cache.add(chave, _nova_versao(), timeout=None)
+        versao = cache.get(chave, 0)
+    return versao
+
+
+def incrementar_versao(namespace, escopo):
+    """Invalida de uma vez todas as chaves do escopo no namespace"""
+    _incrementar(cache_namespace(namespace), f'versao:{escopo}', _nova_versao())
+
+
+def chave_versionada(namespace, escopo, *partes):
+    """Chave com a versão atual do escopo: escopo:v<versao>:partes..."""
+    return ':'.join(
+        [escopo, f'v{obter_versao(namespace, escopo)}', *map(str, partes)])
+
+
+def escopo_propriedade(propriedade_id):
+    return f'propriedade:{propriedade_id}'
+
+
+def invalidar_propriedade(*propriedade_ids):
+    """
+    Invalida todas as entradas das propriedades (dashboard, índices, ...)
+    após o commit da transação atual, para que uma leitura concorrente não
+    guarde dados antigos.
+    """
+    ids = {propriedade_id for propriedade_id in propriedade_ids if propriedade_id}
+    if not ids:
+        return
+
+    def invalidar():
+        for namespace in NAMESPACES_PROPRIEDADE:
+            for propriedade_id in ids:
+                incrementar_versao(namespace, escopo_propriedade(propriedade_id))
+
+    transaction.on_commit(invalidar)
+
+
+# ============================================================================
+# DASHBOARD DAS PROPRIEDADES
+# ============================================================================
+
+def _obter_contabilizado(chave, gerar):
+    cache = cache_namespace(NAMESPACE_DASHBOARDS)
+    dados = cache.get(chave)
+    if dados is not None:
+        _incrementar(cache, CHAVE_ACERTOS)
+        return dados
+
+    _incrementar(cache, CHAVE_FALHAS)
+    dados = gerar()
+    cache.set(chave, dados)
+    return dados
+
+
+def obter_dashboard(propriedade, gerar):
+    """
+    Retorna o dashboard da propriedade do cache ou o gera com `gerar` e
+    guarda o resultado. Acertos e falhas são contabilizados.
+    """
+    chave = chave_versionada(
+        NAMESPACE_DASHBOARDS, escopo_propriedade(propriedade.pk), 'dashboard')
+    return _obter_contabilizado(chave, lambda: gerar(propriedade))
+
+
+def estatisticas_cache_dashboard():
+    """Contadores de acerto/falha do cache do dashboard"""
+    valores = cache_namespace(NAMESPACE_DASHBOARDS).get_many(
+        [CHAVE_ACERTOS, CHAVE_FALHAS])
+    acertos = valores.get(CHAVE_ACERTOS, 0)
+    falhas = valores.get(CHAVE_FALHAS, 0)
+    total = acertos + falhas
+    return {
+        'backend': settings.CACHES[NAMESPACE_DASHBOARDS]['BACKEND'],
+        'acertos': acertos,
+        'falhas': falhas,
+        'taxa_acerto': round(acertos / total * 100, 2) if total else None,
+    }
+
+
+def zerar_estatisticas_cache_dashboard():
+    cache_namespace(NAMESPACE_DASHBOARDS).delete_many([CHAVE_ACERTOS, CHAVE_FALHAS])
+
+
+# ============================================================================
+# ESTAÇÕES DE MONTA
+# ============================================================================
+
+def escopo_estacao(estacao_id):
+    return f'estacao:{estacao_id}'
+
+
+def obter_indicadores_estacao(estacao, gerar):
+    """
+    Indicadores da estação de monta do cache ou gerados com `gerar`.
+
+    A chave leva a versão da estação (registros de reprodução), a da
+    propriedade (animais e lotes) e a data, já que pendências e estados
+    reprodutivos mudam com o passar dos dias.
+    """
+    chave = chave_versionada(
+        NAMESPACE_DASHBOARDS, escopo_estacao(estacao.pk), 'indicadores',
+        obter_versao(NAMESPACE_DASHBOARDS, escopo_propriedade(estacao.propriedade_id)),
+        timezone.now().date().isoformat())
+    return _obter_contabilizado(chave, lambda: gerar(estacao))
+
+
+def invalidar_estacoes(*estacao_ids):
+    """Invalida os indicadores das estações após o commit da transação atual"""
+    ids = {estacao_id for estacao_id in estacao_ids if estacao_id}
+    if not ids:
+        return
+
+    def invalidar():
+        for estacao_id in ids:
+            incrementar_versao(NAMESPACE_DASHBOARDS, escopo_estacao(estacao_id))
+
+    transaction.on_commit(invalidar)
+
+
+# ============================================================================
+# DADOS DE REFERÊNCIA (espécies, raças, vacinas, medicamentos)
+# ============================================================================
+
+def chave_referencia(nome, *partes):
+    """Chave versionada de um conjunto de dados de referência"""
+    return chave_versionada(NAMESPACE_REFERENCIA, nome, *partes)
+
+
+def chave_consulta(request):
+    """Resumo estável de host, caminho e query string da requisição"""
+    parametros = request.GET
+    itens = sorted(
+        (chave, valor)
+        for chave in parametros for valor in parametros.getlist(chave)
+    )
+    consulta = (request.get_host(), request.path, itens)
+    return hashlib.md5(repr(consulta).encode()).hexdigest()
+
+
+def invalidar_referencia(*nomes):
+    def invalidar():
+        for nome in nomes:
+            incrementar_versao(NAMESPACE_REFERENCIA, nome)
+
+    transaction.on_commit(invalidar)
+
+
+# ============================================================================
+# PERMISSÕES
+# ============================================================================
+
+def obter_grupos_usuario(usuario):
+    """Nomes dos grupos do usuário, compartilhados entre os processos"""
+    cache = cache_namespace(NAMESPACE_PERMISSOES)
+    chave = chave_versionada(NAMESPACE_PERMISSOES, 'grupos', usuario.pk)
+    grupos = cache.get(chave)
+    if grupos is None:
+        grupos = list(usuario.groups.values_list('name', flat=True))
+        cache.set(chave, grupos)
+    return grupos
+
+
+def invalidar_grupos():
+    transaction.on_commit(
+        lambda: incrementar_versao(NAMESPACE_PERMISSOES, 'grupos'))
@@ -0,0 +1,219 @@
+"""
+AgroNexus - Sistema
+Representações enxutas: seleção de campos (?fields=) e expansão de
+relações (?expand=) com o queryset ajustado aos campos pedidos
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+PARAMETRO_CAMPOS = 'fields'
+PARAMETRO_EXPANDIR = 'expand'
+
+
+def arvore_campos(valor):
+    """'id,animal.sexo,animal.raca' -> {'id': {}, 'animal': {'sexo': {}, 'raca': {}}}"""
+    arvore = {}
+    for caminho in (valor or '').split(','):
+        no = arvore
+        for parte in caminho.strip().split('.'):
+            if parte:
+                no = no.setdefault(parte, {})
+    return arvore
+
+
+def _modelo(serializer):
+    meta = getattr(serializer, 'Meta', None)
+    return getattr(meta, 'model', None)
+
+
+def _relacao(modelo, nome, campo):
+    """Relação do modelo servida pelo campo (pelo source ou pelo nome)"""
+    if modelo is None:
+        return None
+    fonte = campo.source
+    candidatos = [nome] if fonte in (None, '*') else [fonte.split('.')[0], nome]
+    for candidato in candidatos:
+        try:
+            relacao = modelo._meta.get_field(candidato)
+        except FieldDoesNotExist:
+            continue
+        if relacao.is_relation:
+            return relacao
+    return None
+
+
+def _aninhado(campo):
+    """Serializer aninhado do campo (o filho, para listas) ou None"""
+    if isinstance(campo, serializers.ListSerializer):
+        return campo.child
+    if isinstance(campo, serializers.BaseSerializer):
+        return campo
+    return None
+
+
+def _nome_relacao(relacao):
+    """Nome do atributo da relação no modelo (accessor nas reversas)"""
+    return relacao.name if relacao.concrete else relacao.get_accessor_name()
+
+
+def _raiz(serializer):
+    aninhado = _aninhado(serializer)
+    return serializer if aninhado is None else aninhado
+
+
+def _recolhido(relacao, nome):
+    """Campo que representa a relação apenas pelo(s) id(s)"""
+    if relacao.many_to_many or relacao.one_to_many:
+        fonte = _nome_relacao(relacao)
+        return serializers.PrimaryKeyRelatedField(
+            many=True, read_only=True, **({} if fonte == nome else {'source': fonte}))
+    if relacao.many_to_one or (relacao.one_to_one and relacao.concrete):
+        return serializers.ReadOnlyField(source=relacao.attname)
+    return None
+
+
+def _e_multipla(relacao):
+    return relacao.many_to_many or relacao.one_to_many or not relacao.concrete
+
+
+class SelecaoCampos:
+    """
+    Campos e expansões pedidos em uma leitura.
+
+    Com `fields` só os campos listados são retornados (campos aninhados com
+    ponto: animal.identificacao_unica). Relações não expandidas em `expand`
+    (ou por um campo aninhado em `fields`) são retornadas apenas pelo id.
+    """
+
+    def __init__(self, campos=None, expandir=None):
+        self.campos = campos or {}
+        self.expandir = expandir or {}
+
+    @classmethod
+    def da_requisicao(cls, request):
+        """Seleção dos parâmetros da requisição ou None (representação completa)"""
+        if request is None:
+            return None
+        parametros = request.query_params
+        if PARAMETRO_CAMPOS not in parametros and PARAMETRO_EXPANDIR not in parametros:
+            return None
+        return cls(arvore_campos(parametros.get(PARAMETRO_CAMPOS)),
+                   arvore_campos(parametros.get(PARAMETRO_EXPANDIR)))
+
+    def inclui(self, nome):
+        return not self.campos or nome in self.campos
+
+    def aplicar(self, serializer):
+        """Remove os campos não pedidos e recolhe as relações não expandidas"""
+        self._aplicar(_raiz(serializer), self.campos, self.expandir)
+        return serializer
+
+    def _aplicar(self, serializer, campos, expandir):
+        modelo = _modelo(serializer)
+        for nome in list(serializer.fields):
+            campo = serializer.fields[nome]
+            if campos and nome not in campos:
+                del serializer.fields[nome]
+                continue
+            if campo.write_only or nome in expandir:
+                expandido = True
+            else:
+                # Pedir subcampos de uma relação também a expande
+                expandido = bool(campos.get(nome))
+
+            aninhado = _aninhado(campo)
+            if expandido:
+                if aninhado is not None:
+                    self._aplicar(aninhado, campos.get(nome, {}), expandir.get(nome, {}))
+                continue
+            if aninhado is None and isinstance(campo, (
+                    serializers.PrimaryKeyRelatedField, serializers.ReadOnlyField,
+                    serializers.ManyRelatedField)):
+                continue
+            relacao = _relacao(modelo, nome, campo)
+            if relacao is None or (campo.source and '.' in campo.source):
+                continue
+            recolhido = _recolhido(relacao, nome)
+            if recolhido is not None:
+                serializer.fields[nome] = recolhido
+
+    # ------------------------------------------------------------------
+    # Queryset
+    # ------------------------------------------------------------------
+
+    def relacoes(self, serializer):
+        """Caminhos de select_related e de prefetch usados pelo serializer"""
+        selects, prefetches = set(), {}
+        self._relacoes(_raiz(serializer), '', False, selects, prefetches)
+        return selects, prefetches
+
+    def _relacoes(self, serializer, prefixo, em_prefetch, selects, prefetches):
+        modelo = _modelo(serializer)
+        for nome, campo in serializer.fields.items():
+            if campo.write_only:
+                continue
+            relacao = _relacao(modelo, nome, campo)
+            if relacao is None:
+                continue
+            # Lida só pela coluna da FK (id recolhido, catálogo)
+            if not _e_multipla(relacao) and campo.source == relacao.attname:
+                continue
+            caminho = prefixo + _nome_relacao(relacao)
+            multipla = em_prefetch or _e_multipla(relacao)
+            aninhado = _aninhado(campo)
+            if not multipla:
+                selects.add(caminho)
+            elif aninhado is None and isinstance(campo, serializers.ManyRelatedField):
+                # Só os ids dos relacionados
+                prefetches.setdefault(caminho, Prefetch(
+                    caminho, queryset=relacao.related_model.objects.only('pk')))
+            else:
+                prefetches[caminho] = caminho
+            if aninhado is not None:
+                self._relacoes(aninhado, caminho + '__', multipla, selects, prefetches)
+
+    def otimizar_queryset(self, queryset, serializer):
+        """
+        Acrescenta ao queryset os joins e prefetches das relações que os
+        campos pedidos usam. Os da view são mantidos: campos de método
+        (ua_value, lote_atual...) dependem de relações que o serializer
+        não declara.
+        """
+        selects, prefetches = self.relacoes(serializer)
+
+        atuais = queryset.query.select_related
+        if atuais is not True:
+            caminhos = _sem_prefixos(set(_caminhos_select(atuais or {})) | selects)
+            if caminhos:
+                queryset = queryset.select_related(None).select_related(*caminhos)
+
+        cobertos = set()
+        for lookup in queryset._prefetch_related_lookups:
+            partes = _caminho_prefetch(lookup).split('__')
+            cobertos.update('__'.join(partes[:i]) for i in range(1, len(partes) + 1))
+        extras = [lookup for caminho, lookup in sorted(prefetches.items())
+                  if caminho not in cobertos]
+        return queryset.prefetch_related(*extras) if extras else queryset
+
+
+def _caminhos_select(arvore, prefixo=''):
+    for nome, filhos in arvore.items():
+        caminho = prefixo + nome
+        if filhos:
+            yield from _caminhos_select(filhos, caminho + '__')
+        else:
+            yield caminho
+
+
+def _sem_prefixos(caminhos):
+    """Remove caminhos já cobertos por outro mais longo (a__b cobre a)"""
+    return sorted(
+        c for c in caminhos
+        if not any(outro.startswith(c + '__') for outro in caminhos)
+    )
+
+
+def _caminho_prefetch(lookup):
+    return lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
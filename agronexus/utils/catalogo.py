@@ -0,0 +1,131 @@
+"""
+AgroNexus - Sistema
+Catálogo de referência (espécies, raças e categorias) mantido em memória
+"""
+
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from ..models import EspecieAnimal, RacaAnimal
+from .cache import NAMESPACE_REFERENCIA, incrementar_versao, obter_versao
+
+ESCOPO_CATALOGO = 'catalogo'
+
+
+class CatalogoReferencia:
+    """
+    Fotografia das espécies e raças carregada com duas consultas.
+
+    Guarda as instâncias indexadas por id e as representações da API já
+    serializadas, de forma que serializers, validações e filtros do admin
+    não precisem consultar o banco.
+    """
+
+    def __init__(self):
+        especies = list(EspecieAnimal.objects.order_by('nome'))
+        racas = list(RacaAnimal.objects.order_by('especie__nome', 'nome'))
+
+        self.especies = {especie.pk: especie for especie in especies}
+        self.especies_por_nome = {especie.nome: especie for especie in especies}
+        self.racas = {raca.pk: raca for raca in racas}
+        self.racas_por_especie = {especie.pk: [] for especie in especies}
+        for raca in racas:
+            raca.especie = self.especies[raca.especie_id]
+            self.racas_por_especie[raca.especie_id].append(raca)
+
+        self.etag = hashlib.md5(repr([
+            (str(registro.pk), registro.data_atualizacao.isoformat())
+            for registro in especies + racas
+        ]).encode()).hexdigest()
+        self._representacoes_especies = {}
+
+    def especie(self, especie_id):
+        return self.especies.get(especie_id)
+
+    def raca(self, raca_id):
+        return self.racas.get(raca_id)
+
+    def especies_ativas(self):
+        return [especie for especie in self.especies.values() if especie.ativo]
+
+    def racas_ativas(self, especie_id):
+        return [raca for raca in self.racas_por_especie.get(especie_id, [])
+                if raca.ativo]
+
+    def categorias(self, especie_id):
+        especie = self.especie(especie_id)
+        return especie.get_categorias() if especie else []
+
+    def representacao_especie(self, especie_id):
+        """Espécie serializada como em EspecieAnimalSerializer"""
+        from ..api.v1.serializers import EspecieAnimalSerializer
+
+        if especie_id not in self._representacoes_especies:
+            especie = self.especie(especie_id)
+            self._representacoes_especies[especie_id] = (
+                EspecieAnimalSerializer(especie).data if especie else None)
+        return self._representacoes_especies[especie_id]
+
+    def representacao_especie_resumo(self, especie_id):
+        """Espécie no formato resumido (id, nome, nome_display)"""
+        especie = self.especie(especie_id)
+        if especie is None:
+            return None
+        return {'id': especie.pk, 'nome': especie.nome,
+                'nome_display': especie.nome_display}
+
+    def representacao_raca(self, raca_id):
+        """Raça no formato resumido (id, nome, especie)"""
+        raca = self.raca(raca_id)
+        if raca is None:
+            return None
+        return {'id': raca.pk, 'nome': raca.nome, 'especie': raca.especie_id}
+
+
+_catalogo = None
+_versao_catalogo = None
+_ultima_verificacao = 0.0
+_trava = threading.Lock()
+
+
+def obter_catalogo():
+    """
+    Catálogo do processo, recarregado quando outro processo o invalida.
+
+    A versão compartilhada (namespace 'referencia') é conferida no máximo a
+    cada CATALOGO_VERIFICACAO_SEGUNDOS para não custar uma ida ao cache em
+    cada acesso.
+    """
+    global _catalogo, _versao_catalogo, _ultima_verificacao
+
+    agora = time.monotonic()
+    if _catalogo is not None and \
+            agora - _ultima_verificacao < settings.CATALOGO_VERIFICACAO_SEGUNDOS:
+        return _catalogo
+
+    with _trava:
+        versao = obter_versao(NAMESPACE_REFERENCIA, ESCOPO_CATALOGO)
+        if _catalogo is None or versao != _versao_catalogo:
+            _catalogo = CatalogoReferencia()
+            _versao_catalogo = versao
+        _ultima_verificacao = agora
+    return _catalogo
+
+
+def descartar_catalogo():
+    """Força a recarga do catálogo no próximo acesso deste processo"""
+    global _catalogo
+    _catalogo = None
+
+
+def invalidar_catalogo():
+    """Descarta o catálogo deste e dos demais processos após o commit"""
+    def invalidar():
+        incrementar_versao(NAMESPACE_REFERENCIA, ESCOPO_CATALOGO)
+        descartar_catalogo()
+
+    transaction.on_commit(invalidar)
@@ -0,0 +1,465 @@
+"""
+AgroNexus - Sistema
+Geração em massa de dados sintéticos para benchmarks e ambientes de teste
+"""
+
+import multiprocessing
+import random
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+from decimal import Decimal
+
+import django
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import (Animal, AnimalManejo, Area, CategoriaFinanceira,
+                      ContaFinanceira, DiagnosticoGestacao, EspecieAnimal,
+                      EstacaoMonta, Inseminacao, LancamentoFinanceiro, Lote,
+                      Manejo, Pesagem, Propriedade, RacaAnimal, Usuario,
+                      Vacina, Vacinacao)
+from .cache import invalidar_propriedade
+from .resumo_financeiro import reconstruir_resumo_financeiro
+
+TAMANHO_LOTE_GERACAO = 2000
+INTERVALO_PESAGENS_DIAS = 30
+IDADE_MAXIMA_DIAS = 8 * 365
+MAXIMO_ANIMAIS_MANEJO = 30
+
+CATEGORIAS_POR_IDADE = [
+    # (idade máxima em dias, categoria macho, categoria fêmea)
+    (365, 'bezerro', 'bezerra'),
+    (730, 'novilho', 'novilha'),
+    (None, 'touro', 'vaca'),
+]
+
+NOMES_AREAS = [
+    'Piquete', 'Pasto Alto', 'Pasto Baixo', 'Piquete do Fundo',
+    'Pasto da Sede', 'Piquete Novo', 'Área de Reserva',
+]
+
+TIPOS_FORRAGEM = [
+    'Brachiaria Brizantha', 'Brachiaria Decumbens', 'Panicum Maximum',
+    'Cynodon Dactylon', 'Andropogon Gayanus', 'Pennisetum Purpureum',
+]
+
+NOMES_LOTES = [
+    'Bezerros', 'Novilhas Solteiras', 'Vacas Secas', 'Vacas Prenhas',
+    'Touros', 'Novilhos Engorda', 'Bezerras Desmamadas', 'Engorda Final',
+]
+
+CATEGORIAS_FINANCEIRAS = [
+    ('Venda de Animais', 'receita'),
+    ('Venda de Leite', 'receita'),
+    ('Medicamentos', 'despesa'),
+    ('Ração', 'despesa'),
+    ('Combustível', 'despesa'),
+    ('Mão de Obra', 'despesa'),
+]
+
+
+def _categoria(sexo, idade_dias):
+    for idade_maxima, macho, femea in CATEGORIAS_POR_IDADE:
+        if idade_maxima is None or idade_dias <= idade_maxima:
+            return macho if sexo == 'M' else femea
+
+
+def _em_blocos(sequencia, tamanho):
+    for inicio in range(0, len(sequencia), tamanho):
+        yield sequencia[inicio:inicio + tamanho]
+
+
+class GeradorDadosSinteticos:
+    """
+    Gera propriedades completas (áreas, lotes, animais, pesagens, manejos
+    sanitários, inseminações e lançamentos) com bulk_create.
+
+    Os UUIDs são gerados pelo próprio gerador, então o grafo de chaves
+    estrangeiras é montado em memória antes de gravar. Cada propriedade usa
+    um gerador aleatório derivado de `semente` e do índice da propriedade:
+    a mesma semente reproduz os mesmos dados (inclusive as chaves) em um
+    banco vazio, independente da ordem em que as propriedades são geradas.
+    """
+
+    def __init__(self, usuario, semente=None, tamanho_lote=TAMANHO_LOTE_GERACAO,
+                 data_referencia=None):
+        self.usuario = usuario
+        self.semente = semente if semente is not None else random.randrange(2 ** 32)
+        self.tamanho_lote = tamanho_lote
+        self.hoje = data_referencia or timezone.now().date()
+
+        self.especie = EspecieAnimal.objects.filter(nome='bovino').first()
+        if self.especie is None:
+            raise ValueError('Espécie "bovino" não cadastrada')
+        self.racas = list(
+            RacaAnimal.objects.filter(especie=self.especie, ativo=True).order_by('nome'))
+        self.vacinas = list(Vacina.objects.filter(ativa=True).order_by('nome'))
+
+    def _uuid(self):
+        return uuid.UUID(int=self.aleatorio.getrandbits(128), version=4)
+
+    def _data_recente(self, dias):
+        return self.hoje - timedelta(days=self.aleatorio.randrange(dias))
+
+    def gerar_propriedade(self, indice, animais=1000, pesagens_por_animal=5,
+                          inseminacoes=200, lancamentos=500, areas=10, lotes=8,
+                          vacinacoes=0, manejos=0, nome=None):
+        """Gera uma propriedade e retorna a contagem de registros criados"""
+        self.aleatorio = random.Random(f'{self.semente}:{indice}')
+        self.indice = indice
+        self.totais = {}
+
+        with transaction.atomic():
+            propriedade = self._criar_propriedade(indice, nome, areas, lotes)
+            animais_criados = self._criar_animais(
+                propriedade, animais, pesagens_por_animal)
+            self._criar_manejos_sanitarios(
+                propriedade, animais_criados, vacinacoes, manejos)
+            femeas = [
+                animal_id for animal_id, sexo, categoria in animais_criados
+                if categoria in ('vaca', 'novilha')
+            ]
+            self._criar_reproducao(propriedade, femeas, inseminacoes)
+            self._criar_financeiro(propriedade, lancamentos)
+            invalidar_propriedade(propriedade.pk)
+
+        return {'propriedade': str(propriedade.pk), 'nome': propriedade.nome,
+                **self.totais}
+
+    def _gravar(self, modelo, objetos):
+        for bloco in _em_blocos(objetos, self.tamanho_lote):
+            modelo.objects.bulk_create(bloco)
+        chave = modelo._meta.db_table
+        self.totais[chave] = self.totais.get(chave, 0) + len(objetos)
+
+    # ------------------------------------------------------------------
+    # Estrutura da propriedade
+    # ------------------------------------------------------------------
+
+    def _criar_propriedade(self, indice, nome, total_areas, total_lotes):
+        propriedade = Propriedade(
+            id=self._uuid(),
+            nome=nome or f'Fazenda Sintética {indice + 1:03d}',
+            proprietario=self.usuario,
+            localizacao=f'Estrada Rural {indice + 1}, Cidade Fictícia - SP',
+            area_total_ha=Decimal(self.aleatorio.randrange(500, 5000)),
+            coordenadas_gps={
+                'latitude': round(-23.0 + self.aleatorio.uniform(-2, 2), 6),
+                'longitude': round(-47.0 + self.aleatorio.uniform(-2, 2), 6),
+            },
+        )
+        self._gravar(Propriedade, [propriedade])
+
+        self.areas = [
+            Area(
+                id=self._uuid(),
+                propriedade=propriedade,
+                nome=f'{NOMES_AREAS[numero % len(NOMES_AREAS)]} {numero + 1:02d}',
+                tipo='piquete',
+                tamanho_ha=Decimal(self.aleatorio.randrange(20, 200)),
+                tipo_forragem=self.aleatorio.choice(TIPOS_FORRAGEM),
+                status=self.aleatorio.choice(['em_uso', 'em_uso', 'descanso']),
+            )
+            for numero in range(total_areas)
+        ]
+        self._gravar(Area, self.areas)
+
+        self.lotes = [
+            Lote(
+                id=self._uuid(),
+                propriedade=propriedade,
+                nome=f'{NOMES_LOTES[numero % len(NOMES_LOTES)]} {numero + 1:02d}',
+                area_atual=self.areas[numero] if numero < len(self.areas) else None,
+            )
+            for numero in range(total_lotes)
+        ]
+        self._gravar(Lote, self.lotes)
+        return propriedade
+
+    # ------------------------------------------------------------------
+    # Animais e pesagens
+    # ------------------------------------------------------------------
+
+    def _criar_animais(self, propriedade, total, pesagens_por_animal):
+        """
+        Cria animais em blocos, cada um com sua série de pesagens, e retorna
+        (id, sexo, categoria) dos animais ativos.
+        """
+        ativos = []
+        for inicio in range(0, total, self.tamanho_lote):
+            bloco = [
+                self._novo_animal(propriedade, numero)
+                for numero in range(inicio, min(inicio + self.tamanho_lote, total))
+            ]
+            manejos, pesagens, vinculos = self._novas_pesagens(
+                propriedade, bloco, pesagens_por_animal)
+            self._gravar(Animal, bloco)
+            self._gravar(Manejo, manejos)
+            self._gravar(Pesagem, pesagens)
+            self._gravar(AnimalManejo, vinculos)
+            ativos.extend(
+                (animal.pk, animal.sexo, animal.categoria) for animal in bloco
+                if animal.status == 'ativo'
+            )
+        return ativos
+
+    def _novo_animal(self, propriedade, numero):
+        sexo = self.aleatorio.choice('MF')
+        idade = self.aleatorio.randrange(30, IDADE_MAXIMA_DIAS)
+        data_nascimento = self.hoje - timedelta(days=idade)
+        animal = Animal(
+            id=self._uuid(),
+            propriedade=propriedade,
+            identificacao_unica=f'P{self.indice + 1:03d}-{numero + 1:06d}',
+            especie=self.especie,
+            raca=self.aleatorio.choice(self.racas) if self.racas else None,
+            sexo=sexo,
+            data_nascimento=data_nascimento,
+            categoria=_categoria(sexo, idade),
+            status='ativo' if self.aleatorio.random() < 0.95 else 'vendido',
+            origem='proprio',
+            lote_atual=self.aleatorio.choice(self.lotes) if self.lotes else None,
+        )
+        if self.aleatorio.random() < 0.3:
+            animal.origem = 'compra'
+            animal.data_compra = data_nascimento + timedelta(
+                days=self.aleatorio.randrange(min(idade, 365)))
+            animal.valor_compra = Decimal(self.aleatorio.randrange(800, 3000))
+        return animal
+
+    def _novas_pesagens(self, propriedade, animais, pesagens_por_animal):
+        """Série de pesagens mensais terminando perto da data de referência"""
+        manejos = []
+        pesagens = []
+        vinculos = []
+        for animal in animais:
+            idade = (self.hoje - animal.data_nascimento).days
+            quantidade = min(pesagens_por_animal, idade // INTERVALO_PESAGENS_DIAS + 1)
+            ultima = self.hoje - timedelta(days=self.aleatorio.randrange(15))
+            gmd = self.aleatorio.uniform(0.3, 0.9)
+            serie = []
+            for ordem in range(quantidade):
+                data = ultima - timedelta(
+                    days=INTERVALO_PESAGENS_DIAS * (quantidade - 1 - ordem))
+                idade_pesagem = max((data - animal.data_nascimento).days, 0)
+                peso = Decimal(min(30 + idade_pesagem * gmd, 900)).quantize(Decimal('0.01'))
+                manejo = Manejo(
+                    id=self._uuid(),
+                    propriedade=propriedade,
+                    tipo='pesagem',
+                    data_manejo=data,
+                    custo_pessoal=Decimal('50'),
+                    usuario=self.usuario,
+                )
+                manejos.append(manejo)
+                pesagens.append(Pesagem(
+                    id=self._uuid(), animal=animal, manejo=manejo,
+                    peso_kg=peso, data_pesagem=data,
+                ))
+                vinculos.append(AnimalManejo(animal=animal, manejo=manejo))
+                serie.append((data, peso))
+
+            # Snapshot desnormalizado (bulk_create não dispara os sinais)
+            if serie:
+                animal.data_ultima_pesagem, animal.peso_atual = serie[-1]
+            if len(serie) > 1:
+                animal.data_pesagem_anterior, animal.peso_anterior = serie[-2]
+        return manejos, pesagens, vinculos
+
+    # ------------------------------------------------------------------
+    # Manejos sanitários
+    # ------------------------------------------------------------------
+
+    def _criar_manejos_sanitarios(self, propriedade, animais, vacinacoes, avulsos):
+        """Vacinações e manejos avulsos aplicados a grupos de animais"""
+        if not animais:
+            return
+
+        manejos = []
+        registros_vacinacao = []
+        vinculos = []
+
+        tipos = ['vacinacao'] * (vacinacoes if self.vacinas else 0) + \
+            [self.aleatorio.choice(['medicamento', 'outro']) for _ in range(avulsos)]
+        for tipo in tipos:
+            data = self._data_recente(365)
+            manejo = Manejo(
+                id=self._uuid(), propriedade=propriedade, tipo=tipo,
+                data_manejo=data,
+                lote=self.aleatorio.choice(self.lotes) if self.lotes else None,
+                custo_material=Decimal(self.aleatorio.randrange(50, 500)),
+                custo_pessoal=Decimal(self.aleatorio.randrange(50, 300)),
+                usuario=self.usuario,
+            )
+            manejos.append(manejo)
+
+            quantidade = self.aleatorio.randint(
+                1, min(MAXIMO_ANIMAIS_MANEJO, len(animais)))
+            vinculos.extend(
+                AnimalManejo(animal_id=animal_id, manejo=manejo)
+                for animal_id, _sexo, _categoria in self.aleatorio.sample(animais, quantidade)
+            )
+
+            if tipo == 'vacinacao':
+                vacina = self.aleatorio.choice(self.vacinas)
+                registros_vacinacao.append(Vacinacao(
+                    id=self._uuid(), manejo=manejo, vacina=vacina,
+                    dose_aplicada=vacina.dose_ml,
+                    lote_vacina=f'LOTE{self.aleatorio.randrange(1000, 10000)}',
+                    data_proxima_dose=data + timedelta(
+                        days=vacina.intervalo_doses_dias or 365),
+                ))
+
+        self._gravar(Manejo, manejos)
+        self._gravar(Vacinacao, registros_vacinacao)
+        self._gravar(AnimalManejo, vinculos)
+
+    # ------------------------------------------------------------------
+    # Reprodução
+    # ------------------------------------------------------------------
+
+    def _criar_reproducao(self, propriedade, femeas, total):
+        if not femeas or not total:
+            return
+
+        inicio = self.hoje - timedelta(days=120)
+        estacao = EstacaoMonta(
+            id=self._uuid(),
+            propriedade=propriedade,
+            nome=f'Estação {inicio.year}/{inicio.year + 1}',
+            data_inicio=inicio,
+            data_fim=inicio + timedelta(days=150),
+        )
+        self._gravar(EstacaoMonta, [estacao])
+        estacao.lotes_participantes.set(self.lotes)
+
+        manejos = []
+        inseminacoes = []
+        diagnosticos = []
+        for _ in range(total):
+            animal_id = self.aleatorio.choice(femeas)
+            data = inicio + timedelta(days=self.aleatorio.randrange(90))
+            manejo = Manejo(
+                id=self._uuid(), propriedade=propriedade, tipo='inseminacao',
+                data_manejo=data, usuario=self.usuario,
+            )
+            inseminacao = Inseminacao(
+                id=self._uuid(), animal_id=animal_id, manejo=manejo,
+                data_inseminacao=data,
+                tipo=self.aleatorio.choice(['ia', 'iatf', 'natural']),
+                estacao_monta=estacao,
+            )
+            manejos.append(manejo)
+            inseminacoes.append(inseminacao)
+
+            data_diagnostico = data + timedelta(days=35)
+            if data_diagnostico <= self.hoje and self.aleatorio.random() < 0.8:
+                manejo_diagnostico = Manejo(
+                    id=self._uuid(), propriedade=propriedade, tipo='diagnostico',
+                    data_manejo=data_diagnostico, usuario=self.usuario,
+                )
+                manejos.append(manejo_diagnostico)
+                diagnosticos.append(DiagnosticoGestacao(
+                    id=self._uuid(), inseminacao=inseminacao,
+                    manejo=manejo_diagnostico, data_diagnostico=data_diagnostico,
+                    resultado='positivo' if self.aleatorio.random() < 0.6 else 'negativo',
+                    metodo='ultrassom',
+                ))
+
+        self._gravar(Manejo, manejos)
+        self._gravar(Inseminacao, inseminacoes)
+        self._gravar(DiagnosticoGestacao, diagnosticos)
+
+    # ------------------------------------------------------------------
+    # Financeiro
+    # ------------------------------------------------------------------
+
+    def _criar_financeiro(self, propriedade, total):
+        if not total:
+            return
+
+        conta = ContaFinanceira(
+            id=self._uuid(), propriedade=propriedade, nome='Conta Principal',
+            tipo='conta_corrente',
+            saldo_inicial=Decimal(self.aleatorio.randrange(10000, 100000)),
+        )
+        self._gravar(ContaFinanceira, [conta])
+        categorias = [
+            CategoriaFinanceira(
+                id=self._uuid(), propriedade=propriedade, nome=nome, tipo=tipo)
+            for nome, tipo in CATEGORIAS_FINANCEIRAS
+        ]
+        self._gravar(CategoriaFinanceira, categorias)
+        receitas = [categoria for categoria in categorias if categoria.tipo == 'receita']
+        despesas = [categoria for categoria in categorias if categoria.tipo == 'despesa']
+
+        lancamentos = []
+        for _ in range(total):
+            if self.aleatorio.random() < 0.45:
+                tipo, categoria = 'entrada', self.aleatorio.choice(receitas)
+                valor = self.aleatorio.randrange(100000, 5000000)
+            else:
+                tipo, categoria = 'saida', self.aleatorio.choice(despesas)
+                valor = self.aleatorio.randrange(10000, 1000000)
+            lancamentos.append(LancamentoFinanceiro(
+                id=self._uuid(),
+                propriedade=propriedade,
+                data_lancamento=self._data_recente(730),
+                tipo=tipo,
+                valor=Decimal(valor) / 100,
+                descricao=categoria.nome,
+                categoria=categoria,
+                conta_origem=conta,
+                usuario=self.usuario,
+            ))
+        self._gravar(LancamentoFinanceiro, lancamentos)
+        # bulk_create não dispara os sinais que mantêm o resumo mensal
+        reconstruir_resumo_financeiro([propriedade])
+
+
+# ============================================================================
+# GERAÇÃO EM PARALELO
+# ============================================================================
+
+def _gerar_em_processo(semente, tamanho_lote, data_referencia, tarefa):
+    """Executada em um processo do pool (Django já configurado)"""
+    tarefa = dict(tarefa)
+    usuario = Usuario.objects.get(pk=tarefa.pop('usuario_id'))
+    gerador = GeradorDadosSinteticos(
+        usuario, semente, tamanho_lote, data_referencia)
+    return gerador.gerar_propriedade(**tarefa)
+
+
+def gerar_propriedades(tarefas, semente=None, processos=1,
+                       tamanho_lote=TAMANHO_LOTE_GERACAO, data_referencia=None):
+    """
+    Gera várias propriedades, opcionalmente em paralelo, retornando os
+    totais de cada uma à medida que terminam.
+
+    Cada tarefa é um dicionário com `usuario_id`, `indice` e os demais
+    argumentos de GeradorDadosSinteticos.gerar_propriedade. Como cada
+    propriedade grava em sua própria transação e deriva seus dados apenas
+    de `semente` e `indice`, o resultado não depende de `processos`.
+    Paralelismo exige um banco com escrita concorrente (MySQL/PostgreSQL).
+    """
+    if semente is None:
+        semente = random.randrange(2 ** 32)
+    data_referencia = data_referencia or timezone.now().date()
+
+    if processos <= 1:
+        for tarefa in tarefas:
+            yield _gerar_em_processo(semente, tamanho_lote, data_referencia, tarefa)
+        return
+
+    # 'spawn' evita herdar conexões abertas do processo principal
+    contexto = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(processos, mp_context=contexto,
+                             initializer=django.setup) as executor:
+        futuros = [
+            executor.submit(_gerar_em_processo, semente, tamanho_lote,
+                            data_referencia, tarefa)
+            for tarefa in tarefas
+        ]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
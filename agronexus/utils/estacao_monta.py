@@ -0,0 +1,141 @@
+"""
+AgroNexus - Sistema
+Indicadores da estação de monta com agregação condicional, em um número
+fixo de consultas independente de lotes, fêmeas e registros
+"""
+
+from datetime import timedelta
+
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+from ..models import Animal, DiagnosticoGestacao, Inseminacao, Parto
+from .reproducao import (DIAS_AGUARDANDO_DIAGNOSTICO, anotar_estado_reprodutivo,
+                         da_inseminacao_atual, femeas_por_estado,
+                         prazo_diagnostico_vencido)
+from .series_temporais import acumular, serie_temporal
+
+
+def _percentual(parte, total):
+    return round(parte / total * 100, 2) if total else 0
+
+
+def femeas_estacao(estacao):
+    """Fêmeas ativas dos lotes participantes da estação"""
+    return Animal.objects.filter(
+        lote_atual__in=estacao.lotes_participantes.values('pk'),
+        sexo='F',
+        status='ativo',
+    )
+
+
+def fim_evolucao(estacao, hoje):
+    """Última data da série: fim da estação mais o prazo dos diagnósticos"""
+    limite = estacao.data_fim + timedelta(days=DIAS_AGUARDANDO_DIAGNOSTICO)
+    return max(estacao.data_fim, min(hoje, limite))
+
+
+def gerar_indicadores_estacao(estacao, data=None):
+    """
+    Fêmeas, inseminações, diagnósticos, partos, pendências, taxas e a
+    evolução semanal da estação na data (hoje se None). São seis consultas:
+    estados das fêmeas, inseminações, diagnósticos, partos e as duas séries.
+    """
+    hoje = data or timezone.now().date()
+    estados = femeas_por_estado(femeas_estacao(estacao), hoje)
+    total_femeas = sum(estados.values())
+
+    femeas = anotar_estado_reprodutivo(Animal.objects.filter(
+        propriedade_id=estacao.propriedade_id, sexo='F'), hoje)
+    aguardando_diagnostico = femeas.filter(
+        prazo_diagnostico_vencido(), estado_reprodutivo='inseminada')
+    prenhes = femeas.filter(estado_reprodutivo='prenhe')
+
+    inseminacoes = Inseminacao.objects.filter(estacao_monta=estacao)
+    totais_inseminacoes = inseminacoes.order_by().aggregate(
+        total=Count('pk'),
+        femeas=Count('animal', distinct=True),
+        natural=Count('pk', filter=Q(tipo='natural')),
+        ia=Count('pk', filter=Q(tipo='ia')),
+        iatf=Count('pk', filter=Q(tipo='iatf')),
+        diagnosticos_pendentes=Count(
+            'pk', filter=Q(da_inseminacao_atual(aguardando_diagnostico))),
+    )
+
+    diagnosticos = DiagnosticoGestacao.objects.filter(
+        inseminacao__estacao_monta=estacao)
+    totais_diagnosticos = diagnosticos.order_by().aggregate(
+        total=Count('pk'),
+        positivos=Count('pk', filter=Q(resultado='positivo')),
+        negativos=Count('pk', filter=Q(resultado='negativo')),
+        inconclusivos=Count('pk', filter=Q(resultado='inconclusivo')),
+        femeas_prenhes=Count(
+            'inseminacao__animal', distinct=True, filter=Q(resultado='positivo')),
+        partos_pendentes=Count('inseminacao__animal', distinct=True, filter=Q(
+            da_inseminacao_atual(prenhes, prefixo='inseminacao__'),
+            resultado='positivo',
+        )),
+    )
+
+    # Partos de fêmeas inseminadas na estação, posteriores à inseminação
+    totais_partos = Parto.objects.filter(Exists(Inseminacao.objects.filter(
+        animal=OuterRef('mae'),
+        estacao_monta=estacao,
+        data_inseminacao__lt=OuterRef('data_parto'),
+    ))).order_by().aggregate(
+        total=Count('pk'),
+        nascidos_vivos=Count('pk', filter=Q(resultado='nascido_vivo')),
+        abortos=Count('pk', filter=Q(resultado='aborto')),
+        natimortos=Count('pk', filter=Q(resultado='natimorto')),
+    )
+
+    inicio, fim = estacao.data_inicio, fim_evolucao(estacao, hoje)
+    evolucao = serie_temporal(
+        inseminacoes.filter(data_inseminacao__range=(inicio, fim)),
+        'data_inseminacao', {'inseminacoes': Count('pk')}, 'semana', inicio, fim)
+    por_semana = {
+        item['periodo']: item for item in serie_temporal(
+            diagnosticos.filter(data_diagnostico__range=(inicio, fim)),
+            'data_diagnostico',
+            {'diagnosticos': Count('pk'),
+             'positivos': Count('pk', filter=Q(resultado='positivo'))},
+            'semana', inicio, fim)
+    }
+    for item in evolucao:
+        semana = por_semana[item['periodo']]
+        item['diagnosticos'] = semana['diagnosticos']
+        item['positivos'] = semana['positivos']
+    acumular(evolucao, 'inseminacoes')
+
+    total_inseminacoes = totais_inseminacoes['total']
+    positivos = totais_diagnosticos['positivos']
+    return {
+        'estacao_id': str(estacao.id),
+        'estacao_nome': estacao.nome,
+        'total_femeas': total_femeas,
+        'femeas_inseminadas': totais_inseminacoes['femeas'],
+        'femeas_prenhes': totais_diagnosticos['femeas_prenhes'],
+        'inseminacoes_realizadas': total_inseminacoes,
+        'inseminacoes_por_tipo': {
+            tipo: totais_inseminacoes[tipo] for tipo in ('natural', 'ia', 'iatf')
+        },
+        'diagnosticos_realizados': totais_diagnosticos['total'],
+        'diagnosticos': {
+            resultado: totais_diagnosticos[resultado]
+            for resultado in ('positivos', 'negativos', 'inconclusivos')
+        },
+        'partos_realizados': totais_partos['total'],
+        'partos': {
+            resultado: totais_partos[resultado]
+            for resultado in ('nascidos_vivos', 'abortos', 'natimortos')
+        },
+        'inseminacoes_pendentes': estados['vazia'],
+        'diagnosticos_pendentes': totais_inseminacoes['diagnosticos_pendentes'],
+        'partos_pendentes': totais_diagnosticos['partos_pendentes'],
+        'estados_reprodutivos': estados,
+        'taxa_prenhez': _percentual(positivos, total_inseminacoes),
+        'taxa_parto': _percentual(totais_partos['total'], positivos),
+        'taxa_servico': _percentual(totais_inseminacoes['femeas'], total_femeas),
+        'progresso_estacao': _percentual(total_inseminacoes, total_femeas),
+        'evolucao_temporal': evolucao,
+    }
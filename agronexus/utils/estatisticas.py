@@ -0,0 +1,285 @@
+"""
+AgroNexus - Sistema
+Estatísticas de animais e lotes calculadas com consultas agregadas
+"""
+
+from datetime import timedelta
+
+from django.db.models import (Avg, Case, Count, FloatField, Func,
+                              IntegerField, OuterRef, Q, Subquery, Sum, Value,
+                              When)
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+
+from ..models import Animal, ConfiguracaoSistema, Pesagem
+
+
+def subquery_pesagem(campo, posicao=0, animal_ref='pk', ate=None):
+    """
+    Subquery com um campo da N-ésima pesagem mais recente do animal
+    (até a data `ate`, se informada)
+    """
+    pesagens = Pesagem.objects.filter(animal=OuterRef(animal_ref))
+    if ate is not None:
+        pesagens = pesagens.filter(data_pesagem__lte=ate)
+    return Subquery(
+        pesagens.order_by('-data_pesagem').values(campo)[posicao:posicao + 1]
+    )
+
+
+def recalcular_pesos_atuais(animais=None):
+    """
+    Reconstrói o snapshot de pesagens (atual e anterior) dos animais.
+
+    Executa um único UPDATE com subconsultas correlacionadas; sem argumento
+    recalcula todos os animais. Retorna a quantidade de animais atualizados.
+    """
+    if animais is None:
+        animais = Animal.objects.all()
+    return animais.order_by().update(
+        peso_atual=subquery_pesagem('peso_kg'),
+        data_ultima_pesagem=subquery_pesagem('data_pesagem'),
+        peso_anterior=subquery_pesagem('peso_kg', 1),
+        data_pesagem_anterior=subquery_pesagem('data_pesagem', 1),
+    )
+
+
+# UA de referência padrão (default de ConfiguracaoSistema.peso_ua_referencia).
+# Os pesos de referência das espécies são relativos a ela: uma propriedade
+# que configura 500 kg aumenta o de todas as espécies na mesma proporção.
+PESO_UA_PADRAO = 450
+
+
+def fator_ua_propriedade(propriedade):
+    """UA de referência da propriedade em relação à padrão (1 sem configuração)"""
+    try:
+        referencia = propriedade.configuracao.peso_ua_referencia
+    except ConfiguracaoSistema.DoesNotExist:
+        return 1.0
+    return float(referencia) / PESO_UA_PADRAO
+
+
+def expressao_peso_referencia_ua(especie='especie', propriedade='propriedade'):
+    """
+    Expressão com o peso (kg) de 1 UA para o animal: o de referência da
+    espécie ajustado pela UA de referência configurada na propriedade.
+    """
+    padrao = Value(float(PESO_UA_PADRAO))
+    return (
+        Cast(f'{especie}__peso_ua_referencia', FloatField())
+        * Coalesce(Cast(f'{propriedade}__configuracao__peso_ua_referencia',
+                        FloatField()), padrao)
+        / padrao
+    )
+
+
+def expressao_ua(peso, especie='especie', propriedade='propriedade'):
+    """
+    Expressão SQL com o valor em UA de um animal.
+
+    Usa o peso informado dividido pelo peso de referência (espécie e
+    propriedade) e, sem peso, o valor padrão da espécie (mesma regra de
+    Animal.get_ua_value).
+    """
+    padrao = Case(
+        *[When(**{f'{especie}__nome': nome}, then=Value(valor))
+          for nome, valor in Animal.UA_PADRAO_POR_ESPECIE.items()],
+        default=Value(Animal.UA_PADRAO),
+        output_field=FloatField()
+    )
+    return Case(
+        When(**{f'{peso}__gt': 0},
+             then=Cast(peso, FloatField()) /
+             expressao_peso_referencia_ua(especie, propriedade)),
+        default=padrao,
+        output_field=FloatField()
+    )
+
+
+def subquery_agregado(queryset, grupo, agregacao, padrao=0, output_field=None):
+    """
+    Subquery com `agregacao` sobre `queryset`, que deve estar filtrado por
+    um OuterRef no campo `grupo` (uma linha por registro externo).
+    """
+    return Coalesce(
+        Subquery(queryset.order_by().values(grupo).annotate(
+            valor=agregacao).values('valor')),
+        padrao,
+        output_field=output_field,
+    )
+
+
+def soma_ua(animais, grupo):
+    """Subquery com o total de UA (peso atual) de `animais` por `grupo`"""
+    return subquery_agregado(
+        animais, grupo, Sum(expressao_ua('peso_atual')), 0.0,
+        output_field=FloatField())
+
+
+def subquery_total_animais_lote(**filtros):
+    """Subquery com a contagem de animais ativos do lote (filtros opcionais)"""
+    return Coalesce(
+        Subquery(
+            Animal.objects.filter(
+                lote_atual=OuterRef('pk'), status='ativo', **filtros
+            ).order_by().values('lote_atual').annotate(
+                total=Count('pk')).values('total')
+        ),
+        0
+    )
+
+
+ESTATISTICAS_LOTE = ('total_animais', 'total_ua', 'peso_medio')
+
+
+def anotar_estatisticas_lotes(queryset, estatisticas=ESTATISTICAS_LOTE):
+    """
+    Anota total de animais ativos, total de UA e peso médio em cada lote.
+
+    As estatísticas são subconsultas correlacionadas, então o custo é de
+    uma única consulta independente da quantidade de lotes e animais.
+    `estatisticas` limita as anotações às informadas.
+    """
+    animais = Animal.objects.filter(lote_atual=OuterRef('pk'), status='ativo')
+
+    anotacoes = {
+        'total_animais': subquery_total_animais_lote(),
+        'total_ua': soma_ua(animais, 'lote_atual'),
+        'peso_medio': Subquery(
+            animais.order_by().values('lote_atual').annotate(
+                valor=Avg('peso_atual')).values('valor')
+        ),
+    }
+    return queryset.annotate(**{
+        nome: anotacoes[nome] for nome in estatisticas
+    })
+
+
+class DiasEntre(Func):
+    """Dias entre duas datas (fim - inicio) como inteiro, em qualquer banco"""
+    arg_joiner = ' - '
+    template = '(%(expressions)s)'
+    output_field = IntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template='CAST(julianday(%(expressions)s) AS INTEGER)',
+            arg_joiner=') - julianday(', **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, template='DATEDIFF(%(expressions)s)',
+            arg_joiner=', ', **extra_context)
+
+
+def expressao_gmd_periodo(dias=30, animal_ref='pk'):
+    """
+    Expressão com o GMD do animal nos últimos `dias` dias.
+
+    Diferença entre a última e a primeira pesagem do período dividida pelos
+    dias entre elas, como em Animal.get_gmd_periodo; NULL com menos de duas
+    pesagens em datas distintas.
+    """
+    data_limite = timezone.now().date() - timedelta(days=dias)
+    pesagens = Pesagem.objects.filter(
+        animal=OuterRef(animal_ref), data_pesagem__gte=data_limite)
+
+    def extremo(campo, ordem):
+        return Subquery(pesagens.order_by(ordem).values(campo)[:1])
+
+    variacao_peso = (
+        Cast(extremo('peso_kg', '-data_pesagem'), FloatField())
+        - Cast(extremo('peso_kg', 'data_pesagem'), FloatField())
+    )
+    intervalo = NullIf(DiasEntre(
+        extremo('data_pesagem', '-data_pesagem'),
+        extremo('data_pesagem', 'data_pesagem'),
+    ), 0)
+    return Cast(variacao_peso / intervalo, FloatField())
+
+
+def anotar_gmd_periodo(queryset, dias=30, nome='gmd_periodo'):
+    """Anota o GMD do período em cada animal (uma vez por queryset)"""
+    if nome in queryset.query.annotations:
+        return queryset
+    return queryset.annotate(**{nome: expressao_gmd_periodo(dias)})
+
+
+def calcular_gmd_medio_lotes(lotes, dias=30):
+    """
+    Calcula o GMD médio dos animais ativos de cada lote em uma consulta.
+
+    Animais sem GMD no período (menos de duas pesagens) ficam fora da
+    média. Retorna {lote_id: gmd}.
+    """
+    lote_ids = [getattr(lote, 'pk', lote) for lote in lotes]
+    if not lote_ids:
+        return {}
+
+    medias = anotar_gmd_periodo(
+        Animal.objects.filter(lote_atual__in=lote_ids, status='ativo'), dias
+    ).order_by().values('lote_atual').annotate(
+        media=Avg('gmd_periodo')
+    ).filter(media__isnull=False).values_list('lote_atual', 'media')
+    return dict(medias)
+
+
+def anexar_gmd_medio(lotes, dias=30):
+    """Preenche o atributo gmd_medio de cada lote da lista"""
+    lotes = list(lotes)
+    gmds = calcular_gmd_medio_lotes(lotes, dias)
+    for lote in lotes:
+        lote.gmd_medio = gmds.get(lote.pk)
+    return lotes
+
+
+def calcular_total_ua_propriedade(propriedade):
+    """Soma das UA dos animais ativos em lotes ativos da propriedade"""
+    return Animal.objects.filter(
+        propriedade=propriedade, status='ativo', lote_atual__ativo=True
+    ).aggregate(total=Sum(expressao_ua('peso_atual')))['total'] or 0
+
+
+def gerar_dashboard_propriedade(propriedade):
+    """Monta os dados do dashboard da propriedade com consultas agregadas"""
+    animais_ativos = propriedade.animais.filter(status='ativo').order_by()
+
+    # Estatísticas por categoria e por sexo
+    por_categoria = animais_ativos.values('categoria').annotate(total=Count('id'))
+    por_sexo = animais_ativos.values('sexo').annotate(total=Count('id'))
+
+    # Estatísticas financeiras (mês corrente, do resumo mensal)
+    financeiro = propriedade.resumos_financeiros.filter(
+        mes=timezone.now().date().replace(day=1)
+    ).aggregate(
+        receitas=Sum('total', filter=Q(tipo='entrada')),
+        despesas=Sum('total', filter=Q(tipo='saida')),
+    )
+    receitas = financeiro['receitas'] or 0
+    despesas = financeiro['despesas'] or 0
+
+    total_ua = calcular_total_ua_propriedade(propriedade)
+    taxa_ocupacao = (
+        total_ua / float(propriedade.area_total_ha)
+        if propriedade.area_total_ha > 0 else 0
+    )
+
+    return {
+        'estatisticas_gerais': {
+            'total_animais': animais_ativos.count(),
+            'total_lotes': propriedade.lotes.filter(ativo=True).count(),
+            'total_areas': propriedade.areas.count(),
+            'area_total_ha': propriedade.area_total_ha,
+            'taxa_ocupacao_global': taxa_ocupacao
+        },
+        'distribuicao_animais': {
+            'por_categoria': list(por_categoria),
+            'por_sexo': list(por_sexo)
+        },
+        'financeiro_mensal': {
+            'receitas': receitas,
+            'despesas': despesas,
+            'saldo': receitas - despesas
+        }
+    }
@@ -14,7 +14,8 @@ from ..models import (Animal, Area, CalendarioSanitario, CategoriaFinanceira,
                       ContaFinanceira, DiagnosticoGestacao, EspecieAnimal, EstacaoMonta,
                       Inseminacao, LancamentoFinanceiro, Lote, Manejo,
                       Medicamento, Parto, Pesagem, Propriedade, ProtocoloIATF,
-                      Vacina, Vacinacao)
+                      ResumoFinanceiroMensal, Vacina, Vacinacao)
+from .estatisticas import anotar_gmd_periodo
 
 
 class PropriedadeFilter(django_filters.FilterSet):
@@ -169,6 +170,7 @@ class PesagemFilter(django_filters.FilterSet):
 
     # Filtros relacionados
     animal = django_filters.ModelChoiceFilter(queryset=Animal.objects.all())
+    propriedade = django_filters.UUIDFilter(field_name='animal__propriedade')
     equipamento = django_filters.CharFilter(
         field_name='equipamento_usado', lookup_expr='icontains')
 
@@ -371,6 +373,25 @@ class LancamentoFinanceiroFilter(django_filters.FilterSet):
                   'conta_origem', 'conta_destino']
 
 
+class ResumoFinanceiroFilter(django_filters.FilterSet):
+    """
+    Filtro do resumo financeiro mensal com os mesmos nomes de parâmetros
+    de LancamentoFinanceiroFilter (datas comparadas com o mês do resumo)
+    """
+    tipo = django_filters.ChoiceFilter(
+        choices=LancamentoFinanceiro.TIPO_CHOICES)
+    data_inicio = django_filters.DateFilter(field_name='mes', lookup_expr='gte')
+    data_fim = django_filters.DateFilter(field_name='mes', lookup_expr='lte')
+    categoria = django_filters.ModelChoiceFilter(
+        queryset=CategoriaFinanceira.objects.all())
+    conta_origem = django_filters.ModelChoiceFilter(
+        field_name='conta', queryset=ContaFinanceira.objects.all())
+
+    class Meta:
+        model = ResumoFinanceiroMensal
+        fields = ['propriedade', 'tipo', 'categoria']
+
+
 # Filtros personalizados para relatórios
 class RelatorioRebanhoFilter(django_filters.FilterSet):
     """Filtro especializado para relatórios de rebanho"""
@@ -389,9 +410,10 @@ class RelatorioRebanhoFilter(django_filters.FilterSet):
     peso_min = django_filters.NumberFilter(method='filter_peso_min')
     peso_max = django_filters.NumberFilter(method='filter_peso_max')
 
-    # Filtros por GMD
+    # Filtros por GMD (período em dias; padrão da configuração da propriedade)
     gmd_min = django_filters.NumberFilter(method='filter_gmd_min')
     gmd_max = django_filters.NumberFilter(method='filter_gmd_max')
+    gmd_dias = django_filters.NumberFilter(method='filter_gmd_dias', min_value=1)
 
     # Filtros por localização
     lote = django_filters.ModelChoiceFilter(
@@ -420,45 +442,38 @@ class RelatorioRebanhoFilter(django_filters.FilterSet):
     def filter_peso_min(self, queryset, name, value):
         """Filtra por peso mínimo"""
         if value is not None:
-            # Filtra animais com peso atual >= value
-            animais_com_peso = []
-            for animal in queryset:
-                peso_atual = animal.get_peso_atual()
-                if peso_atual and peso_atual >= value:
-                    animais_com_peso.append(animal.id)
-            return queryset.filter(id__in=animais_com_peso)
+            return queryset.filter(peso_atual__gte=value)
         return queryset
 
     def filter_peso_max(self, queryset, name, value):
         """Filtra por peso máximo"""
         if value is not None:
-            # Filtra animais com peso atual <= value
-            animais_com_peso = []
-            for animal in queryset:
-                peso_atual = animal.get_peso_atual()
-                if peso_atual and peso_atual <= value:
-                    animais_com_peso.append(animal.id)
-            return queryset.filter(id__in=animais_com_peso)
+            return queryset.filter(peso_atual__lte=value)
+        return queryset
+
+    def dias_gmd(self):
+        """Período do GMD: gmd_dias, a configuração da propriedade ou 30"""
+        dias = self.form.cleaned_data.get('gmd_dias')
+        if dias:
+            return int(dias)
+        propriedade = self.form.cleaned_data.get('propriedade')
+        configuracao = getattr(propriedade, 'configuracao', None) if propriedade else None
+        return configuracao.dias_gmd_padrao if configuracao else 30
+
+    def filter_gmd_dias(self, queryset, name, value):
+        """Apenas define o período usado por gmd_min/gmd_max"""
         return queryset
 
     def filter_gmd_min(self, queryset, name, value):
         """Filtra por GMD mínimo"""
         if value is not None:
-            animais_com_gmd = []
-            for animal in queryset:
-                gmd = animal.get_gmd_periodo()
-                if gmd and gmd >= value:
-                    animais_com_gmd.append(animal.id)
-            return queryset.filter(id__in=animais_com_gmd)
+            return anotar_gmd_periodo(queryset, self.dias_gmd()).filter(
+                gmd_periodo__gte=value)
         return queryset
 
     def filter_gmd_max(self, queryset, name, value):
         """Filtra por GMD máximo"""
         if value is not None:
-            animais_com_gmd = []
-            for animal in queryset:
-                gmd = animal.get_gmd_periodo()
-                if gmd and gmd <= value:
-                    animais_com_gmd.append(animal.id)
-            return queryset.filter(id__in=animais_com_gmd)
+            return anotar_gmd_periodo(queryset, self.dias_gmd()).filter(
+                gmd_periodo__lte=value)
         return queryset
@@ -0,0 +1,102 @@
+"""
+AgroNexus - Sistema
+Verificação, via EXPLAIN, de que as consultas frequentes usam os índices
+"""
+
+import uuid
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from ..models import (Animal, CalendarioSanitario, LancamentoFinanceiro,
+                      Manejo, Pesagem)
+from .paginacao import filtro_apos
+
+
+def _primeiro_id(modelo, campo='pk'):
+    valor = modelo.objects.order_by().values_list(campo, flat=True).first()
+    return valor or uuid.uuid4()
+
+
+def consultas_indexadas():
+    """
+    Consultas dos caminhos mais usados e os índices aceitos para cada uma.
+
+    Retorna uma lista de (nome, queryset, índices esperados).
+    """
+    propriedade_id = _primeiro_id(Animal, 'propriedade_id')
+    lote_id = _primeiro_id(Animal, 'lote_atual_id')
+    animal_id = _primeiro_id(Pesagem, 'animal_id')
+    hoje = timezone.now().date()
+
+    return [
+        ('animais_propriedade_status',
+         Animal.objects.filter(propriedade_id=propriedade_id, status='ativo'),
+         ['animal_prop_status_ident_idx', 'animal_ativo_prop_cat_idx']),
+        # Contagens (ex.: fêmeas ativas) não usam a ordenação padrão
+        ('animais_propriedade_sexo_status',
+         Animal.objects.filter(
+             propriedade_id=propriedade_id, sexo='F', status='ativo').order_by(),
+         ['animal_prop_sexo_status_idx']),
+        ('animais_ativos_por_categoria',
+         Animal.objects.filter(propriedade_id=propriedade_id, status='ativo')
+         .values('categoria').annotate(total=Count('id')).order_by(),
+         ['animal_ativo_prop_cat_idx', 'animal_prop_status_ident_idx']),
+        ('animais_lote_status',
+         Animal.objects.filter(lote_atual_id=lote_id, status='ativo'),
+         ['animal_lote_status_ident_idx', 'animal_ativo_lote_sexo_idx']),
+        ('pesagens_animal',
+         Pesagem.objects.filter(animal_id=animal_id).order_by('-data_pesagem'),
+         ['pesagem_animal_data_idx']),
+        # Página seguinte da paginação por cursor
+        ('pesagens_cursor',
+         Pesagem.objects.filter(filtro_apos(
+             ('-data_pesagem', '-id'), [hoje, animal_id]
+         )).order_by('-data_pesagem', '-id')[:51],
+         ['pesagem_data_id_idx']),
+        ('manejos_propriedade_periodo',
+         Manejo.objects.filter(
+             propriedade_id=propriedade_id,
+             data_manejo__gte=hoje - timedelta(days=90)),
+         ['manejo_prop_data_idx']),
+        ('lancamentos_propriedade_periodo',
+         LancamentoFinanceiro.objects.filter(
+             propriedade_id=propriedade_id,
+             data_lancamento__range=(hoje - timedelta(days=365), hoje),
+             tipo='entrada'),
+         ['lanc_prop_data_tipo_idx']),
+        ('calendario_pendente',
+         CalendarioSanitario.objects.filter(
+             propriedade_id=propriedade_id, status='agendado',
+             data_agendada__gte=hoje),
+         ['calend_prop_status_data_idx']),
+    ]
+
+
+def verificar_indices():
+    """
+    Executa EXPLAIN de cada consulta e indica se um dos índices esperados
+    aparece no plano.
+
+    No PostgreSQL a varredura sequencial é desencorajada durante a
+    verificação, já que em tabelas pequenas o planejador a prefere mesmo
+    com o índice disponível.
+    """
+    resultados = []
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+        for nome, queryset, esperados in consultas_indexadas():
+            plano = queryset.explain()
+            usados = [indice for indice in esperados if indice in plano]
+            resultados.append({
+                'consulta': nome,
+                'indices_esperados': esperados,
+                'indice_usado': usados[0] if usados else None,
+                'plano': plano,
+            })
+    return resultados
@@ -0,0 +1,220 @@
+"""
+AgroNexus - Sistema
+Métricas de consultas SQL por endpoint (viewset e ação)
+"""
+
+import hashlib
+import logging
+import re
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger('agronexus.consultas')
+
+# Índice dos endpoints: total, endpoint de cada posição e marcador de
+# registro (cache.add garante uma única posição por endpoint)
+CHAVE_TOTAL_ENDPOINTS = 'monitor_consultas:endpoints'
+CHAVE_POSICAO_ENDPOINT = 'monitor_consultas:endpoints:{}'
+CHAVE_ENDPOINT_REGISTRADO = 'monitor_consultas:registrado:{}'
+# Contadores (cache.incr) e máximos/duplicadas de cada endpoint
+CHAVE_CONTADOR = 'monitor_consultas:endpoint:{}:{}'
+CHAVE_METRICAS = 'monitor_consultas:endpoint:{}'
+CONTADORES = ('requisicoes', 'consultas_total', 'tempo_sql_us_total',
+              'tempo_resposta_us_total', 'orcamento_excedido')
+TIMEOUT_METRICAS = 7 * 24 * 60 * 60
+MAXIMO_DUPLICADAS = 10
+
+_LISTA_PARAMETROS = re.compile(r'\((?:%s, )+%s\)')
+_NUMEROS = re.compile(r'\b\d+\b')
+
+
+class OrcamentoConsultasExcedido(Exception):
+    """Requisição executou mais consultas que o orçamento do endpoint"""
+
+
+def _cache():
+    return caches[settings.MONITOR_CONSULTAS_CACHE]
+
+
+def impressao_digital(sql):
+    """Identifica consultas iguais a menos de parâmetros e tamanho de IN"""
+    normalizada = _NUMEROS.sub('N', _LISTA_PARAMETROS.sub('(%s...)', sql))
+    return hashlib.md5(normalizada.encode()).hexdigest()[:12]
+
+
+class RegistroConsultas:
+    """execute_wrapper que mede cada consulta executada na requisição"""
+
+    def __init__(self):
+        self.total = 0
+        self.tempo = 0.0
+        self.ocorrencias = Counter()
+        self.exemplos = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.tempo += time.perf_counter() - inicio
+            self.total += 1
+            digital = impressao_digital(sql)
+            self.ocorrencias[digital] += 1
+            self.exemplos.setdefault(digital, sql)
+
+    def duplicadas(self):
+        return {
+            digital: {'sql': self.exemplos[digital], 'ocorrencias': total}
+            for digital, total in self.ocorrencias.most_common(MAXIMO_DUPLICADAS)
+            if total > 1
+        }
+
+
+def orcamento_endpoint(endpoint):
+    """Máximo de consultas do endpoint (None = sem limite)"""
+    return settings.ORCAMENTO_CONSULTAS.get(
+        endpoint, settings.ORCAMENTO_CONSULTAS_PADRAO)
+
+
+def orcamento_excedido(endpoint, registro):
+    orcamento = orcamento_endpoint(endpoint)
+    return orcamento is not None and registro.total > orcamento
+
+
+def reportar_orcamento_excedido(endpoint, registro):
+    """Registra no log ou levanta erro, conforme ORCAMENTO_CONSULTAS_ACAO"""
+    mensagem = (
+        f'{endpoint} executou {registro.total} consultas '
+        f'(orçamento: {orcamento_endpoint(endpoint)})'
+    )
+    if settings.ORCAMENTO_CONSULTAS_ACAO == 'erro':
+        raise OrcamentoConsultasExcedido(mensagem)
+    logger.warning(mensagem)
+
+
+def _incrementar(cache, chave, valor, timeout=TIMEOUT_METRICAS):
+    """Incremento atômico (INCRBY no Redis), criando o contador se preciso"""
+    try:
+        return cache.incr(chave, valor)
+    except ValueError:
+        cache.add(chave, 0, timeout)
+        return cache.incr(chave, valor)
+
+
+def _registrar_endpoint(cache, endpoint):
+    """Inclui o endpoint no índice uma única vez, mesmo entre processos"""
+    if cache.add(CHAVE_ENDPOINT_REGISTRADO.format(endpoint), True, None):
+        posicao = _incrementar(cache, CHAVE_TOTAL_ENDPOINTS, 1, None)
+        cache.set(CHAVE_POSICAO_ENDPOINT.format(posicao), endpoint, None)
+
+
+def _endpoints_registrados(cache):
+    total = cache.get(CHAVE_TOTAL_ENDPOINTS) or 0
+    posicoes = cache.get_many(
+        [CHAVE_POSICAO_ENDPOINT.format(i) for i in range(1, total + 1)])
+    return list(dict.fromkeys(posicoes.values()))
+
+
+def registrar_requisicao(endpoint, registro, tempo_resposta, excedeu=False):
+    """
+    Acumula as métricas da requisição no cache compartilhado.
+
+    Contagens e tempos totais usam incrementos atômicos e não perdem
+    requisições simultâneas de processos diferentes. Os máximos e as
+    consultas duplicadas são lidos e regravados: entre requisições
+    simultâneas vale a última gravação, então são aproximados.
+    """
+    cache = _cache()
+    _registrar_endpoint(cache, endpoint)
+    valores = {
+        'requisicoes': 1,
+        'consultas_total': registro.total,
+        'tempo_sql_us_total': round(registro.tempo * 1_000_000),
+        'tempo_resposta_us_total': round(tempo_resposta * 1_000_000),
+        'orcamento_excedido': int(excedeu),
+    }
+    # Todos os contadores do endpoint nascem (e expiram) juntos
+    requisicoes = None
+    for campo in CONTADORES:
+        total = _incrementar(cache, CHAVE_CONTADOR.format(endpoint, campo), valores[campo])
+        if campo == 'requisicoes':
+            requisicoes = total
+
+    chave = CHAVE_METRICAS.format(endpoint)
+    # Primeira requisição do período: máximos recomeçam com os contadores
+    metricas = (cache.get(chave) if requisicoes > 1 else None) or {
+        'consultas_max': 0,
+        'tempo_resposta_ms_max': 0.0,
+        'duplicadas': {},
+    }
+    tempo_resposta_ms = tempo_resposta * 1000
+    duplicadas = registro.duplicadas()
+    if (requisicoes > 1 and not duplicadas
+            and registro.total <= metricas['consultas_max']
+            and tempo_resposta_ms <= metricas['tempo_resposta_ms_max']):
+        return
+
+    metricas['consultas_max'] = max(metricas['consultas_max'], registro.total)
+    metricas['tempo_resposta_ms_max'] = max(
+        metricas['tempo_resposta_ms_max'], tempo_resposta_ms)
+    for digital, duplicada in duplicadas.items():
+        atual = metricas['duplicadas'].setdefault(
+            digital, {'sql': duplicada['sql'], 'ocorrencias_max': 0})
+        atual['ocorrencias_max'] = max(
+            atual['ocorrencias_max'], duplicada['ocorrencias'])
+    cache.set(chave, metricas, TIMEOUT_METRICAS)
+
+
+def relatorio_endpoints():
+    """Métricas por endpoint, do maior para o menor número médio de consultas"""
+    cache = _cache()
+    endpoints = _endpoints_registrados(cache)
+    valores = cache.get_many(
+        [CHAVE_CONTADOR.format(e, campo) for e in endpoints for campo in CONTADORES]
+        + [CHAVE_METRICAS.format(e) for e in endpoints])
+
+    relatorio = []
+    for endpoint in endpoints:
+        contadores = {
+            campo: valores.get(CHAVE_CONTADOR.format(endpoint, campo), 0)
+            for campo in CONTADORES
+        }
+        requisicoes = contadores['requisicoes']
+        if not requisicoes:
+            continue
+        metricas = valores.get(CHAVE_METRICAS.format(endpoint)) or {
+            'consultas_max': 0, 'tempo_resposta_ms_max': 0.0, 'duplicadas': {}}
+        tempo_sql_ms = contadores['tempo_sql_us_total'] / 1000
+        tempo_resposta_ms = contadores['tempo_resposta_us_total'] / 1000
+        relatorio.append({
+            'endpoint': endpoint,
+            'requisicoes': requisicoes,
+            'consultas_total': contadores['consultas_total'],
+            'consultas_max': metricas['consultas_max'],
+            'tempo_sql_ms_total': round(tempo_sql_ms, 3),
+            'tempo_resposta_ms_total': round(tempo_resposta_ms, 3),
+            'tempo_resposta_ms_max': metricas['tempo_resposta_ms_max'],
+            'orcamento_excedido': contadores['orcamento_excedido'],
+            'duplicadas': metricas['duplicadas'],
+            'consultas_media': round(contadores['consultas_total'] / requisicoes, 1),
+            'tempo_sql_ms_medio': round(tempo_sql_ms / requisicoes, 2),
+            'tempo_resposta_ms_medio': round(tempo_resposta_ms / requisicoes, 2),
+            'orcamento': orcamento_endpoint(endpoint),
+        })
+    return sorted(relatorio, key=lambda item: item['consultas_media'], reverse=True)
+
+
+def zerar_metricas():
+    cache = _cache()
+    endpoints = _endpoints_registrados(cache)
+    total = cache.get(CHAVE_TOTAL_ENDPOINTS) or 0
+    chaves = [CHAVE_TOTAL_ENDPOINTS]
+    chaves += [CHAVE_POSICAO_ENDPOINT.format(i) for i in range(1, total + 1)]
+    for endpoint in endpoints:
+        chaves += [CHAVE_ENDPOINT_REGISTRADO.format(endpoint),
+                   CHAVE_METRICAS.format(endpoint)]
+        chaves += [CHAVE_CONTADOR.format(endpoint, campo) for campo in CONTADORES]
+    cache.delete_many(chaves)
@@ -0,0 +1,87 @@
+"""
+AgroNexus - Sistema
+Taxa de ocupação (UA/ha) de áreas e propriedades calculada com subconsultas
+agregadas, em uma consulta independente de lotes e animais
+"""
+
+from django.db.models import (DateField, F, FloatField, OuterRef, Prefetch,
+                              Subquery, Value, prefetch_related_objects)
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+
+from ..models import Animal, HistoricoOcupacaoArea, Lote
+from .estatisticas import DiasEntre, soma_ua
+
+OCUPACAO_AREA = ('total_ua', 'taxa_ocupacao_atual', 'periodo_ocupacao_atual')
+OCUPACAO_PROPRIEDADE = ('total_ua', 'taxa_ocupacao_global')
+
+
+def animais_em_pastejo(**filtros):
+    """Animais que contam na ocupação: ativos e em lotes ativos"""
+    return Animal.objects.filter(status='ativo', lote_atual__ativo=True, **filtros)
+
+
+def taxa_ocupacao(total_ua, hectares):
+    """Expressão UA/ha (0 sem área)"""
+    return Coalesce(
+        total_ua / NullIf(Cast(hectares, FloatField()), Value(0.0)),
+        Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def anotar_ocupacao_areas(queryset, campos=OCUPACAO_AREA):
+    """
+    Anota em cada área o total de UA dos lotes ativos que a ocupam, a taxa
+    de ocupação atual (UA/ha) e há quantos dias está ocupada.
+    `campos` limita as anotações às informadas.
+    """
+    total_ua = soma_ua(
+        animais_em_pastejo(lote_atual__area_atual=OuterRef('pk')),
+        'lote_atual__area_atual')
+    if 'total_ua' in campos:
+        queryset = queryset.annotate(total_ua=total_ua)
+        total_ua = F('total_ua')
+    entrada = Subquery(
+        HistoricoOcupacaoArea.objects.filter(
+            area=OuterRef('pk'), data_saida__isnull=True
+        ).order_by('-data_entrada').values('data_entrada')[:1])
+    hoje = Value(timezone.now().date(), output_field=DateField())
+
+    anotacoes = {
+        'taxa_ocupacao_atual': taxa_ocupacao(total_ua, 'tamanho_ha'),
+        'periodo_ocupacao_atual': Coalesce(DiasEntre(hoje, entrada), 0),
+    }
+    return queryset.annotate(**{
+        nome: anotacoes[nome] for nome in campos if nome in anotacoes
+    })
+
+
+def anotar_ocupacao_propriedades(queryset, campos=OCUPACAO_PROPRIEDADE):
+    """
+    Anota em cada propriedade o total de UA dos animais em lotes ativos e
+    a taxa de ocupação global (UA/ha sobre a área total).
+    """
+    total_ua = soma_ua(
+        animais_em_pastejo(propriedade=OuterRef('pk')), 'propriedade')
+    if 'total_ua' in campos:
+        queryset = queryset.annotate(total_ua=total_ua)
+        total_ua = F('total_ua')
+    if 'taxa_ocupacao_global' in campos:
+        queryset = queryset.annotate(
+            taxa_ocupacao_global=taxa_ocupacao(total_ua, 'area_total_ha'))
+    return queryset
+
+
+def anexar_lotes_ativos(areas):
+    """
+    Carrega em uma consulta os lotes ativos das áreas da lista (atributo
+    lotes_ativos, usado por Area.get_lote_atual)
+    """
+    areas = list(areas)
+    prefetch_related_objects(areas, Prefetch(
+        'lotes',
+        queryset=Lote.objects.filter(ativo=True).select_related('propriedade'),
+        to_attr='lotes_ativos',
+    ))
+    return areas
@@ -0,0 +1,160 @@
+"""
+AgroNexus - Sistema
+Paginação por cursor (keyset) para coleções grandes
+"""
+
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _codificar_cursor(valores, anterior=False):
+    dados = {'v': valores, 'a': anterior}
+    texto = json.dumps(dados, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(texto.encode()).decode().rstrip('=')
+
+
+def _decodificar_cursor(cursor, total_chaves):
+    try:
+        texto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        dados = json.loads(texto)
+        valores, anterior = dados['v'], bool(dados['a'])
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        return None
+    if not isinstance(valores, list) or len(valores) != total_chaves:
+        return None
+    return valores, anterior
+
+
+def filtro_apos(chaves, valores):
+    """
+    Condição de keyset: registros depois de `valores` na ordem de `chaves`.
+
+    Para (-data, -id) gera data < d OR (data = d AND id < i).
+    """
+    condicao = Q()
+    anteriores = {}
+    for chave, valor in zip(chaves, valores):
+        campo = chave.lstrip('-')
+        operador = 'lt' if chave.startswith('-') else 'gt'
+        condicao |= Q(**anteriores, **{f'{campo}__{operador}': valor})
+        anteriores[campo] = valor
+    return condicao
+
+
+def _inverter(chave):
+    return chave[1:] if chave.startswith('-') else f'-{chave}'
+
+
+class PaginacaoCursor(PageNumberPagination):
+    """
+    Paginação por número de página com modo cursor opcional.
+
+    A view informa `chaves_cursor`, campos indexados que definem uma ordem
+    total (ex.: ('-data_pesagem', '-id')). Com o parâmetro `cursor` (vazio
+    na primeira página) cada página é lida a partir da chave do último
+    registro da anterior, sem COUNT nem OFFSET, e a resposta traz apenas
+    next, previous e results. Nesse modo `page` e `ordering` são ignorados.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    chaves_padrao = ('-pk',)
+    mensagem_cursor_invalido = 'Cursor inválido'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.modo_cursor = self.cursor_query_param in request.query_params
+        if not self.modo_cursor:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.chaves = tuple(getattr(view, 'chaves_cursor', self.chaves_padrao))
+        tamanho = self.get_page_size(request)
+
+        cursor = request.query_params[self.cursor_query_param]
+        valores, anterior = None, False
+        if cursor:
+            decodificado = _decodificar_cursor(cursor, len(self.chaves))
+            if decodificado is None:
+                raise NotFound(self.mensagem_cursor_invalido)
+            valores, anterior = decodificado
+
+        chaves = [_inverter(chave) for chave in self.chaves] if anterior else self.chaves
+        queryset = queryset.order_by(*chaves)
+        # Um registro a mais indica se há outra página nessa direção
+        try:
+            if valores is not None:
+                queryset = queryset.filter(filtro_apos(chaves, valores))
+            registros = list(queryset[:tamanho + 1])
+        except (ValidationError, ValueError, TypeError):
+            raise NotFound(self.mensagem_cursor_invalido)
+        mais = len(registros) > tamanho
+        registros = registros[:tamanho]
+        if anterior:
+            registros.reverse()
+            self.tem_proxima, self.tem_anterior = True, mais
+        else:
+            self.tem_proxima, self.tem_anterior = mais, valores is not None
+
+        self.primeiro = registros[0] if registros else None
+        self.ultimo = registros[-1] if registros else None
+        if not registros and valores is not None:
+            # Página vazia: os links continuam a partir do próprio cursor
+            self.tem_proxima, self.tem_anterior = not anterior, anterior
+            self.valores_vazios = valores
+        return registros
+
+    def _valores(self, registro):
+        return [getattr(registro, chave.lstrip('-')) for chave in self.chaves]
+
+    def _link(self, valores, anterior):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url, self.cursor_query_param, _codificar_cursor(valores, anterior))
+
+    def get_next_link(self):
+        if not self.modo_cursor:
+            return super().get_next_link()
+        if not self.tem_proxima:
+            return None
+        valores = self._valores(self.ultimo) if self.ultimo else self.valores_vazios
+        return self._link(valores, anterior=False)
+
+    def get_previous_link(self):
+        if not self.modo_cursor:
+            return super().get_previous_link()
+        if not self.tem_anterior:
+            return None
+        valores = self._valores(self.primeiro) if self.primeiro else self.valores_vazios
+        return self._link(valores, anterior=True)
+
+    def get_paginated_response(self, data):
+        if not self.modo_cursor:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_schema_operation_parameters(self, view):
+        parametros = super().get_schema_operation_parameters(view)
+        parametros.append({
+            'name': self.cursor_query_param,
+            'required': False,
+            'in': 'query',
+            'description': (
+                'Ativa a paginação por cursor (vazio na primeira página); '
+                'a resposta não traz count'),
+            'schema': {'type': 'string'},
+        })
+        return parametros
@@ -0,0 +1,721 @@
+"""
+AgroNexus - Sistema
+Exportação (.xlsx em streaming) e importação em lote de planilhas de animais
+"""
+
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from itertools import chain, islice
+from xml.sax.saxutils import escape
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from ..models import (Animal, AnimalManejo, EspecieAnimal, Lote, Manejo,
+                      Pesagem, RacaAnimal)
+from .cache import invalidar_propriedade
+
+CONTENT_TYPE_XLSX = (
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+)
+
+# Largura das colunas estimada pelas primeiras linhas de cada aba
+LINHAS_AMOSTRA_LARGURA = 500
+LARGURA_MAXIMA_COLUNA = 50
+
+# Quantidade de linhas escritas entre cada envio de bytes ao cliente
+LINHAS_POR_BLOCO = 500
+
+ESTILO_PADRAO = 0
+ESTILO_CABECALHO = 1
+
+_CARACTERES_INVALIDOS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_NS_PLANILHA = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_NS_RELACOES = ('http://schemas.openxmlformats.org/officeDocument/2006/'
+                'relationships')
+_NS_PACOTE = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+_ESTILOS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    f'<styleSheet xmlns="{_NS_PLANILHA}">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><color rgb="FFFFFFFF"/><name val="Calibri"/>'
+    '</font></fonts>'
+    '<fills count="3"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FF2E8B57"/>'
+    '</patternFill></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/>'
+    '</border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" '
+    'borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" '
+    'xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" '
+    'applyFont="1" applyFill="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/>'
+    '</cellStyles></styleSheet>'
+)
+
+
+@lru_cache(maxsize=None)
+def letra_coluna(indice):
+    """Converte o índice da coluna (1, 2, ...) na letra do Excel (A, B, ...)"""
+    letras = ''
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+class _SaidaStreaming:
+    """Destino somente escrita que acumula bytes até serem consumidos"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, dados):
+        self._buffer += dados
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def consumir(self):
+        dados = bytes(self._buffer)
+        self._buffer.clear()
+        return dados
+
+
+class PlanilhaXlsxStreaming:
+    """
+    Escreve um arquivo .xlsx aba por aba devolvendo os bytes à medida que
+    as linhas são geradas.
+
+    O .zip é montado em modo streaming, então a memória usada não depende da
+    quantidade de linhas e o primeiro bloco sai logo após as primeiras linhas.
+    """
+
+    def __init__(self):
+        self._saida = _SaidaStreaming()
+        self._zip = zipfile.ZipFile(
+            self._saida, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._abas = []
+
+    def escrever_aba(self, titulo, linhas, cabecalho=None, linhas_destaque=()):
+        """
+        Gera os bytes de uma aba.
+
+        `linhas` pode ser qualquer iterável de sequências; as linhas cujo
+        número está em `linhas_destaque` recebem o estilo do cabeçalho na
+        primeira coluna.
+        """
+        self._abas.append(titulo[:31])
+        caminho = f'xl/worksheets/sheet{len(self._abas)}.xml'
+
+        linhas = iter(linhas)
+        amostra = list(islice(linhas, LINHAS_AMOSTRA_LARGURA))
+        if cabecalho:
+            amostra_larguras = chain([cabecalho], amostra)
+        else:
+            amostra_larguras = amostra
+
+        with self._zip.open(caminho, 'w', force_zip64=True) as arquivo:
+            arquivo.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                f'<worksheet xmlns="{_NS_PLANILHA}">'
+                f'{self._colunas_xml(amostra_larguras)}<sheetData>'
+            ).encode('utf-8'))
+
+            numero = 0
+            if cabecalho:
+                numero += 1
+                arquivo.write(self._linha_xml(
+                    numero, cabecalho, ESTILO_CABECALHO).encode('utf-8'))
+
+            for linha in chain(amostra, linhas):
+                numero += 1
+                estilo_primeira = (
+                    ESTILO_CABECALHO if numero in linhas_destaque
+                    else ESTILO_PADRAO)
+                arquivo.write(self._linha_xml(
+                    numero, linha, ESTILO_PADRAO, estilo_primeira
+                ).encode('utf-8'))
+                if numero % LINHAS_POR_BLOCO == 0:
+                    yield self._saida.consumir()
+
+            arquivo.write(b'</sheetData></worksheet>')
+        yield self._saida.consumir()
+
+    def finalizar(self):
+        """Escreve os arquivos de estrutura do pacote e fecha o .zip"""
+        abas_xml = ''.join(
+            f'<sheet name="{escape(titulo, {chr(34): "&quot;"})}" '
+            f'sheetId="{indice}" r:id="rId{indice}"/>'
+            for indice, titulo in enumerate(self._abas, 1)
+        )
+        relacoes_abas = ''.join(
+            f'<Relationship Id="rId{indice}" Type="{_NS_RELACOES}/worksheet" '
+            f'Target="worksheets/sheet{indice}.xml"/>'
+            for indice in range(1, len(self._abas) + 1)
+        )
+        id_estilos = len(self._abas) + 1
+        tipos_abas = ''.join(
+            f'<Override PartName="/xl/worksheets/sheet{indice}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.'
+            'spreadsheetml.worksheet+xml"/>'
+            for indice in range(1, len(self._abas) + 1)
+        )
+        cabecalho_xml = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+
+        self._zip.writestr('xl/workbook.xml', (
+            f'{cabecalho_xml}<workbook xmlns="{_NS_PLANILHA}" '
+            f'xmlns:r="{_NS_RELACOES}"><sheets>{abas_xml}</sheets></workbook>'
+        ))
+        self._zip.writestr('xl/_rels/workbook.xml.rels', (
+            f'{cabecalho_xml}<Relationships xmlns="{_NS_PACOTE}">'
+            f'{relacoes_abas}<Relationship Id="rId{id_estilos}" '
+            f'Type="{_NS_RELACOES}/styles" Target="styles.xml"/>'
+            '</Relationships>'
+        ))
+        self._zip.writestr('xl/styles.xml', _ESTILOS_XML)
+        self._zip.writestr('_rels/.rels', (
+            f'{cabecalho_xml}<Relationships xmlns="{_NS_PACOTE}">'
+            f'<Relationship Id="rId1" Type="{_NS_RELACOES}/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>'
+        ))
+        self._zip.writestr('[Content_Types].xml', (
+            f'{cabecalho_xml}<Types xmlns="http://schemas.openxmlformats.org/'
+            'package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/'
+            'vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            f'{tipos_abas}</Types>'
+        ))
+        self._zip.close()
+        yield self._saida.consumir()
+
+    @staticmethod
+    def _colunas_xml(linhas):
+        """Define a largura de cada coluna pelo maior valor da amostra"""
+        larguras = []
+        for linha in linhas:
+            for indice, valor in enumerate(linha):
+                tamanho = len(str(valor)) if valor is not None else 0
+                if indice >= len(larguras):
+                    larguras.append(tamanho)
+                elif tamanho > larguras[indice]:
+                    larguras[indice] = tamanho
+        if not larguras:
+            return ''
+        colunas = ''.join(
+            f'<col min="{indice}" max="{indice}" '
+            f'width="{min(largura + 2, LARGURA_MAXIMA_COLUNA)}" customWidth="1"/>'
+            for indice, largura in enumerate(larguras, 1)
+        )
+        return f'<cols>{colunas}</cols>'
+
+    @staticmethod
+    def _linha_xml(numero, valores, estilo, estilo_primeira=None):
+        """Monta o XML de uma linha com strings inline e números nativos"""
+        celulas = []
+        for indice, valor in enumerate(valores, 1):
+            if valor is None or valor == '':
+                continue
+            atual = estilo_primeira if indice == 1 and estilo_primeira else estilo
+            atributos = f'r="{letra_coluna(indice)}{numero}"'
+            if atual:
+                atributos += f' s="{atual}"'
+            if isinstance(valor, (int, float, Decimal)) and not isinstance(valor, bool):
+                celulas.append(f'<c {atributos}><v>{valor}</v></c>')
+            else:
+                texto = escape(_CARACTERES_INVALIDOS.sub('', str(valor)))
+                celulas.append(
+                    f'<c {atributos} t="inlineStr"><is>'
+                    f'<t xml:space="preserve">{texto}</t></is></c>'
+                )
+        return f'<row r="{numero}">{"".join(celulas)}</row>'
+
+
+# ============================================================================
+# EXPORTAÇÃO DE ANIMAIS
+# ============================================================================
+
+COLUNAS_EXPORTACAO_ANIMAIS = [
+    'ID Único', 'Nome/Registro', 'Propriedade', 'Espécie', 'Raça',
+    'Sexo', 'Data Nascimento', 'Categoria', 'Status', 'Lote Atual',
+    'Peso Atual (kg)', 'Idade (meses)'
+]
+COLUNAS_GENEALOGIA = ['Pai', 'Mãe']
+
+
+def filtrar_animais_exportacao(queryset, parametros):
+    """Aplica os filtros opcionais da exportação (espécie, status e busca)"""
+    especie_id = parametros.get('especie_id')
+    if especie_id:
+        queryset = queryset.filter(especie_id=especie_id)
+
+    status_filter = parametros.get('status')
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+
+    search = parametros.get('search')
+    if search:
+        queryset = queryset.filter(
+            Q(identificacao_unica__icontains=search) |
+            Q(nome_registro__icontains=search)
+        )
+
+    # Ordena por identificação única
+    return queryset.order_by('identificacao_unica')
+
+
+def linhas_exportacao_animais(queryset, incluir_genealogia=False,
+                              ao_processar_bloco=None):
+    """
+    Gera as linhas da exportação de animais sem carregar o queryset inteiro.
+
+    O peso vem do snapshot desnormalizado do animal, então não há consultas
+    por linha. `ao_processar_bloco`, se informado, recebe o total de linhas
+    geradas a cada bloco.
+    """
+    relacionados = ['propriedade', 'especie', 'raca', 'lote_atual']
+    if incluir_genealogia:
+        relacionados += ['pai', 'mae']
+
+    animais = queryset.select_related(*relacionados).iterator(chunk_size=2000)
+    for numero, animal in enumerate(animais, 1):
+        if ao_processar_bloco and numero % LINHAS_POR_BLOCO == 0:
+            ao_processar_bloco(numero)
+        linha = [
+            animal.identificacao_unica or '',
+            animal.nome_registro or '',
+            animal.propriedade.nome if animal.propriedade else '',
+            animal.especie.nome_display if animal.especie else '',
+            animal.raca.nome if animal.raca else '',
+            animal.get_sexo_display(),
+            animal.data_nascimento.strftime('%d/%m/%Y') if animal.data_nascimento else '',
+            animal.get_categoria_display(),
+            animal.get_status_display(),
+            animal.lote_atual.nome if animal.lote_atual else '',
+            animal.peso_atual or '',
+            animal.get_idade_meses() or ''
+        ]
+        if incluir_genealogia:
+            linha.extend([
+                animal.pai.identificacao_unica if animal.pai else '',
+                animal.mae.identificacao_unica if animal.mae else ''
+            ])
+        yield linha
+
+
+def linhas_estatisticas_animais(queryset):
+    """Linhas da aba de estatísticas calculadas com uma agregação por grupo"""
+    totais = queryset.order_by().aggregate(
+        total=Count('id'),
+        ativos=Count('id', filter=Q(status='ativo')),
+        inativos=Count('id', filter=Q(status='inativo')),
+        machos=Count('id', filter=Q(sexo='M')),
+        femeas=Count('id', filter=Q(sexo='F')),
+    )
+    por_especie = queryset.order_by().values('especie__nome_display').annotate(
+        total=Count('id')
+    ).order_by('-total')
+
+    yield ['Estatísticas Gerais', '']
+    yield ['Total de Animais', totais['total']]
+    yield ['Animais Ativos', totais['ativos']]
+    yield ['Animais Inativos', totais['inativos']]
+    yield ['', '']
+    yield ['Distribuição por Sexo', '']
+    yield ['Machos', totais['machos']]
+    yield ['Fêmeas', totais['femeas']]
+    yield ['', '']
+    yield ['Distribuição por Espécie', '']
+    for esp in por_especie:
+        yield [esp['especie__nome_display'], esp['total']]
+
+
+def gerar_planilha_animais(queryset, incluir_genealogia=False,
+                           incluir_estatisticas=False, ao_processar_bloco=None):
+    """Gera os bytes do .xlsx de exportação de animais em blocos"""
+    colunas = list(COLUNAS_EXPORTACAO_ANIMAIS)
+    if incluir_genealogia:
+        colunas.extend(COLUNAS_GENEALOGIA)
+
+    planilha = PlanilhaXlsxStreaming()
+    yield from planilha.escrever_aba(
+        'Animais',
+        linhas_exportacao_animais(
+            queryset, incluir_genealogia, ao_processar_bloco),
+        cabecalho=colunas
+    )
+    if incluir_estatisticas:
+        yield from planilha.escrever_aba(
+            'Estatísticas',
+            linhas_estatisticas_animais(queryset),
+            linhas_destaque={1, 6, 10}
+        )
+    yield from planilha.finalizar()
+
+
+# ============================================================================
+# IMPORTAÇÃO DE ANIMAIS
+# ============================================================================
+
+# Mapeamento de cabeçalhos em português para nomes técnicos
+MAPEAMENTO_CABECALHOS_IMPORTACAO = {
+    'id único': 'identificacao_unica',
+    'id unico': 'identificacao_unica',
+    'identificacao única': 'identificacao_unica',
+    'identificacao unica': 'identificacao_unica',
+    'identificacao_unica': 'identificacao_unica',
+    'identificacao': 'identificacao_unica',
+    'nome/registro': 'nome_registro',
+    'nome registro': 'nome_registro',
+    'nome_registro': 'nome_registro',
+    'nome': 'nome_registro',
+    'propriedade': 'propriedade',
+    'espécie': 'especie',
+    'especie': 'especie',
+    'raça': 'raca',
+    'raca': 'raca',
+    'sexo': 'sexo',
+    'data nascimento': 'data_nascimento',
+    'data_nascimento': 'data_nascimento',
+    'data de nascimento': 'data_nascimento',
+    'nascimento': 'data_nascimento',
+    'categoria': 'categoria',
+    'status': 'status',
+    'lote atual': 'lote_atual',
+    'lote_atual': 'lote_atual',
+    'lote': 'lote_atual',
+    'peso atual (kg)': 'peso_atual',
+    'peso atual': 'peso_atual',
+    'peso_atual': 'peso_atual',
+    'peso': 'peso_atual',
+    'observações': 'observacoes',
+    'observacoes': 'observacoes',
+    'observação': 'observacoes',
+    'obs': 'observacoes',
+}
+
+CABECALHOS_OBRIGATORIOS_IMPORTACAO = [
+    'identificacao_unica', 'especie', 'sexo', 'data_nascimento', 'categoria', 'status'
+]
+
+SEXOS_IMPORTACAO = {
+    'M': 'M', 'MACHO': 'M', 'MASCULINO': 'M',
+    'F': 'F', 'FEMEA': 'F', 'FEMININO': 'F', 'FÊMEA': 'F', 'FÉMEA': 'F',
+}
+STATUS_IMPORTACAO = ['ativo', 'inativo', 'vendido', 'morto', 'descartado']
+FORMATOS_DATA_IMPORTACAO = ['%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%m/%d/%Y']
+PESO_MAXIMO_IMPORTACAO = Decimal('9999.99')
+
+
+def mapear_cabecalhos_importacao(cabecalho):
+    """Converte a linha de cabeçalho da planilha nos nomes técnicos dos campos"""
+    cabecalhos = []
+    for valor in cabecalho:
+        original = str(valor).strip().lower() if valor else ''
+        normalizado = original.replace('*', '').strip().lower()
+        cabecalhos.append(
+            MAPEAMENTO_CABECALHOS_IMPORTACAO.get(normalizado, original))
+    return cabecalhos
+
+
+def _converter_data(valor):
+    """Converte o valor da célula em data, aceitando datas nativas do Excel"""
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    for formato in FORMATOS_DATA_IMPORTACAO:
+        try:
+            return datetime.strptime(valor, formato).date()
+        except ValueError:
+            continue
+    return None
+
+
+class ImportadorAnimais:
+    """
+    Importa animais de planilha em etapas, processando as linhas em blocos.
+
+    Espécies, raças, propriedades e lotes são carregados uma vez em
+    dicionários; cada bloco faz uma única consulta IN para detectar
+    duplicados e grava animais, manejos e pesagens com bulk_create em sua
+    própria transação (ou savepoint, se já houver uma transação aberta).
+    """
+
+    TAMANHO_BLOCO = 1000
+
+    def __init__(self, usuario, propriedades, cabecalhos):
+        self.usuario = usuario
+        self.cabecalhos = cabecalhos
+
+        self.importados = []
+        self.duplicados = []
+        self.erros = []
+        self.total_registros = 0
+        self._identificacoes_vistas = set()
+
+        self._carregar_referencias(propriedades)
+
+    def _carregar_referencias(self, propriedades):
+        """Resolve antecipadamente todas as consultas de apoio"""
+        propriedades = list(propriedades)
+        self.propriedade_padrao = propriedades[0] if propriedades else None
+        self.propriedades = {}
+        for propriedade in propriedades:
+            self.propriedades.setdefault(propriedade.nome.lower(), propriedade)
+
+        # Nome de exibição tem prioridade sobre o nome técnico
+        self.especies = {}
+        especies = list(EspecieAnimal.objects.all())
+        for especie in especies:
+            self.especies.setdefault(especie.nome.lower(), especie)
+        for especie in especies:
+            self.especies[especie.nome_display.lower()] = especie
+
+        self.racas = {}
+        for raca in RacaAnimal.objects.all():
+            self.racas.setdefault((raca.especie_id, raca.nome.lower()), raca)
+
+        self.lotes = {}
+        for lote in Lote.objects.filter(propriedade__in=propriedades):
+            self.lotes.setdefault((lote.propriedade_id, lote.nome.lower()), lote)
+
+    def importar(self, linhas, ao_processar_bloco=None):
+        """
+        Processa as linhas de dados (sem o cabeçalho).
+
+        `ao_processar_bloco`, se informado, é chamado com o total de linhas
+        lidas ao final de cada bloco.
+        """
+        bloco = []
+        for valores in linhas:
+            self.total_registros += 1
+            # Pular linhas completamente vazias
+            if not any(valores):
+                continue
+            bloco.append((self.total_registros + 1, valores))
+            if len(bloco) >= self.TAMANHO_BLOCO:
+                self._processar_bloco(bloco)
+                bloco = []
+                if ao_processar_bloco:
+                    ao_processar_bloco(self.total_registros)
+        if bloco:
+            self._processar_bloco(bloco)
+        if ao_processar_bloco:
+            ao_processar_bloco(self.total_registros)
+        return self
+
+    def _dados_linha(self, valores):
+        dados = {}
+        for cabecalho, valor in zip(self.cabecalhos, valores):
+            if isinstance(valor, (date, datetime)):
+                dados[cabecalho] = valor
+            else:
+                dados[cabecalho] = str(valor).strip() if valor else ''
+        return dados
+
+    def _processar_bloco(self, bloco):
+        """Valida e grava um bloco de linhas"""
+        linhas = []
+        for linha_num, valores in bloco:
+            dados = self._dados_linha(valores)
+            linhas.append((linha_num, dados))
+
+        identificacoes = {
+            dados.get('identificacao_unica', '') for _, dados in linhas
+        } - {''}
+        existentes = set(
+            Animal.objects.filter(identificacao_unica__in=identificacoes)
+            .values_list('identificacao_unica', flat=True)
+        ) if identificacoes else set()
+
+        animais = []
+        pesagens = []
+        for linha_num, dados in linhas:
+            try:
+                animal, peso = self._validar_linha(linha_num, dados, existentes)
+            except Exception as e:
+                self.erros.append(f'Linha {linha_num}: Erro inesperado - {str(e)}')
+                continue
+            if animal is None:
+                continue
+            self._identificacoes_vistas.add(animal.identificacao_unica)
+            animais.append(animal)
+            if peso:
+                pesagens.append((animal, peso))
+
+        self._gravar(animais, pesagens)
+
+    def _validar_linha(self, linha_num, dados, existentes):
+        """Retorna (animal, peso) ou (None, None) se a linha não for importada"""
+        erros_linha = []
+
+        identificacao = dados.get('identificacao_unica', '')
+        if not identificacao:
+            erros_linha.append('Identificação única é obrigatória')
+        elif (identificacao in existentes
+              or identificacao in self._identificacoes_vistas):
+            # Animal já existe - pular esta linha sem erro
+            self.duplicados.append(identificacao)
+            return None, None
+
+        nome_especie = dados.get('especie', '')
+        especie = None
+        if nome_especie:
+            especie = self.especies.get(nome_especie.lower())
+            if especie is None:
+                erros_linha.append(f'Espécie "{nome_especie}" não encontrada')
+        else:
+            erros_linha.append('Espécie é obrigatória')
+
+        sexo = SEXOS_IMPORTACAO.get(dados.get('sexo', '').upper())
+        if sexo is None:
+            erros_linha.append('Sexo deve ser M/F ou Macho/Fêmea')
+
+        valor_data = dados.get('data_nascimento', '')
+        data_nascimento = None
+        if valor_data:
+            data_nascimento = _converter_data(valor_data)
+            if not data_nascimento:
+                erros_linha.append(
+                    f'Formato de data inválido: "{valor_data}". Use dd/mm/aaaa')
+        else:
+            erros_linha.append('Data de nascimento é obrigatória')
+
+        categoria = dados.get('categoria', '').lower()
+        if not categoria:
+            erros_linha.append('Categoria é obrigatória')
+
+        status_animal = dados.get('status', '').lower()
+        if status_animal not in STATUS_IMPORTACAO:
+            erros_linha.append(
+                'Status deve ser "ativo", "inativo", "vendido", "morto" ou "descartado"')
+
+        propriedade_nome = dados.get('propriedade', '')
+        if propriedade_nome:
+            propriedade = self.propriedades.get(propriedade_nome.lower())
+            if propriedade is None:
+                erros_linha.append(
+                    f'Propriedade "{propriedade_nome}" não encontrada')
+        else:
+            # Se não especificada, usar a primeira propriedade do usuário
+            propriedade = self.propriedade_padrao
+
+        if erros_linha:
+            self.erros.extend(f'Linha {linha_num}: {erro}' for erro in erros_linha)
+            return None, None
+
+        # Raça e lote não encontrados não impedem a importação
+        raca = self.racas.get((especie.pk, dados.get('raca', '').lower()))
+        lote = self.lotes.get((propriedade.pk, dados.get('lote_atual', '').lower()))
+
+        # Peso inválido é ignorado
+        peso = None
+        peso_str = dados.get('peso_atual', '')
+        if peso_str:
+            try:
+                peso = Decimal(peso_str.replace(',', '.')).quantize(Decimal('0.01'))
+            except InvalidOperation:
+                peso = None
+            if peso is not None and not (0 < peso <= PESO_MAXIMO_IMPORTACAO):
+                peso = None
+
+        animal = Animal(
+            identificacao_unica=identificacao,
+            nome_registro=dados.get('nome_registro', '') or f"Animal {identificacao}",
+            especie=especie,
+            raca=raca,
+            sexo=sexo,
+            data_nascimento=data_nascimento,
+            categoria=categoria,
+            status=status_animal,
+            propriedade=propriedade,
+            lote_atual=lote,
+            observacoes=dados.get('observacoes', '') or "Importado da planilha Excel",
+        )
+        if peso:
+            # Snapshot do peso: a pesagem importada é a única do animal
+            animal.peso_atual = peso
+            animal.data_ultima_pesagem = data_nascimento
+        return animal, peso
+
+    def _gravar(self, animais, pesagens):
+        """Grava animais, manejos de pesagem e pesagens do bloco em lote"""
+        if not animais:
+            return
+        with transaction.atomic():
+            self._gravar_bloco(animais, pesagens)
+            # bulk_create não dispara os sinais que invalidam o cache
+            invalidar_propriedade(*{animal.propriedade_id for animal in animais})
+        self.importados.extend(animal.identificacao_unica for animal in animais)
+
+    def _gravar_bloco(self, animais, pesagens):
+        Animal.objects.bulk_create(animais)
+
+        manejos = []
+        registros_pesagem = []
+        vinculos = []
+        for animal, peso in pesagens:
+            data = animal.data_nascimento
+            manejo = Manejo(
+                propriedade=animal.propriedade,
+                tipo='pesagem',
+                data_manejo=data,
+                observacoes='Peso inicial importado da planilha',
+                usuario=self.usuario
+            )
+            manejos.append(manejo)
+            registros_pesagem.append(Pesagem(
+                animal=animal,
+                manejo=manejo,
+                data_pesagem=data,
+                peso_kg=peso,
+                observacoes='Peso inicial importado da planilha'
+            ))
+            vinculos.append(AnimalManejo(animal=animal, manejo=manejo))
+
+        if manejos:
+            Manejo.objects.bulk_create(manejos)
+            Pesagem.objects.bulk_create(registros_pesagem)
+            AnimalManejo.objects.bulk_create(vinculos)
+
+    def resumo(self):
+        """Resultado da importação no formato devolvido pela API"""
+        resultado = {
+            'status': 'sucesso' if not self.erros else (
+                'parcial' if self.importados else 'erro'),
+            'total_registros': self.total_registros,
+            'sucessos': len(self.importados),
+            'erros': len(self.erros),
+            'duplicados': len(self.duplicados),
+            'animais_importados': self.importados[:10],  # Primeiros 10 para não sobrecarregar
+            'animais_duplicados': self.duplicados[:10],  # Primeiros 10 duplicados
+            'mensagens_erro': self.erros[:20],  # Primeiros 20 erros
+        }
+
+        # Mensagens informativas
+        mensagens = []
+        if self.importados:
+            mensagens.append(f'{len(self.importados)} animais importados com sucesso')
+        if self.duplicados:
+            mensagens.append(f'{len(self.duplicados)} animais ignorados por já existirem')
+        if self.erros:
+            mensagens.append(f'{len(self.erros)} erros encontrados durante a importação')
+
+        resultado['message'] = ' • '.join(mensagens) if mensagens else 'Nenhum animal foi processado'
+        return resultado
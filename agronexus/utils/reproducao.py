@@ -0,0 +1,143 @@
+"""
+AgroNexus - Sistema
+Estado reprodutivo das fêmeas (vazia, inseminada, prenhe e pós-parto)
+calculado no banco com subconsultas correlacionadas
+"""
+
+from datetime import timedelta
+
+from django.db.models import (Case, CharField, Count, DateField, Exists, F,
+                              OuterRef, Q, Subquery, Value, When)
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import LessThan
+from django.utils import timezone
+
+from ..models import DiagnosticoGestacao, Inseminacao, Parto
+from .catalogo import obter_catalogo
+from .estatisticas import DiasEntre
+
+ESTADOS_REPRODUTIVOS = [
+    ('vazia', 'Vazia'),
+    ('inseminada', 'Inseminada (aguardando diagnóstico)'),
+    ('prenhe', 'Prenhe'),
+    ('pos_parto', 'Pós-parto (espera voluntária)'),
+]
+
+# Padrões de ConfiguracaoSistema para propriedades sem configuração
+DIAS_ESPERA_VOLUNTARIA = 45
+DIAS_DIAGNOSTICO_GESTACAO = 35
+
+# Sem diagnóstico depois desse prazo a inseminação deixa de ocupar a fêmea
+DIAS_AGUARDANDO_DIAGNOSTICO = 90
+
+
+def anotar_estado_reprodutivo(queryset, data=None):
+    """
+    Anota o estado reprodutivo de cada fêmea na data (hoje se None).
+
+    Além de `estado_reprodutivo` ficam anotados data_ultima_inseminacao,
+    data_ultimo_parto, resultado_ultimo_diagnostico (da última inseminação)
+    e dias_desde_inseminacao. Regras, a partir do evento mais recente:
+
+    - parto sem inseminação posterior: pós-parto durante o período de
+      espera voluntária da propriedade, depois vazia;
+    - última inseminação com diagnóstico positivo: prenhe até o parto;
+    - diagnóstico negativo: vazia;
+    - sem diagnóstico (ou inconclusivo): inseminada por até
+      DIAS_AGUARDANDO_DIAGNOSTICO dias, depois vazia.
+    """
+    hoje = data or timezone.now().date()
+    inseminacoes = Inseminacao.objects.filter(
+        animal=OuterRef('pk'), data_inseminacao__lte=hoje
+    ).order_by('-data_inseminacao')
+    partos = Parto.objects.filter(
+        mae=OuterRef('pk'), data_parto__lte=hoje
+    ).order_by('-data_parto')
+    diagnosticos = DiagnosticoGestacao.objects.filter(
+        inseminacao__animal=OuterRef('pk'),
+        inseminacao__data_inseminacao=OuterRef('data_ultima_inseminacao'),
+        data_diagnostico__lte=hoje,
+    ).order_by('-data_diagnostico')
+    data_referencia = Value(hoje, output_field=DateField())
+
+    queryset = queryset.annotate(
+        data_ultima_inseminacao=Subquery(inseminacoes.values('data_inseminacao')[:1]),
+        data_ultimo_parto=Subquery(partos.values('data_parto')[:1]),
+    ).annotate(
+        resultado_ultimo_diagnostico=Subquery(diagnosticos.values('resultado')[:1]),
+        dias_desde_inseminacao=DiasEntre(data_referencia, F('data_ultima_inseminacao')),
+    )
+
+    apos_parto = Q(data_ultimo_parto__isnull=False) & (
+        Q(data_ultima_inseminacao__isnull=True)
+        | Q(data_ultima_inseminacao__lte=F('data_ultimo_parto'))
+    )
+    espera_voluntaria = LessThan(
+        DiasEntre(data_referencia, F('data_ultimo_parto')),
+        Coalesce(F('propriedade__configuracao__dias_espera_voluntaria'),
+                 Value(DIAS_ESPERA_VOLUNTARIA)),
+    )
+    return queryset.annotate(estado_reprodutivo=Case(
+        When(apos_parto & espera_voluntaria, then=Value('pos_parto')),
+        When(apos_parto | Q(data_ultima_inseminacao__isnull=True), then=Value('vazia')),
+        When(resultado_ultimo_diagnostico='positivo', then=Value('prenhe')),
+        When(resultado_ultimo_diagnostico='negativo', then=Value('vazia')),
+        When(data_ultima_inseminacao__gt=hoje - timedelta(days=DIAS_AGUARDANDO_DIAGNOSTICO),
+             then=Value('inseminada')),
+        default=Value('vazia'),
+        output_field=CharField(),
+    ))
+
+
+def femeas_por_estado(queryset, data=None):
+    """Total de fêmeas em cada estado reprodutivo em uma consulta"""
+    totais = dict.fromkeys((estado for estado, _ in ESTADOS_REPRODUTIVOS), 0)
+    contagem = anotar_estado_reprodutivo(queryset, data).order_by().values(
+        'estado_reprodutivo').annotate(total=Count('pk'))
+    for linha in contagem:
+        totais[linha['estado_reprodutivo']] = linha['total']
+    return totais
+
+
+def prazo_diagnostico_vencido():
+    """Condição sobre fêmeas anotadas: inseminadas há mais que o prazo de diagnóstico"""
+    return Q(dias_desde_inseminacao__gte=Coalesce(
+        F('propriedade__configuracao__dias_diagnostico_gestacao'),
+        Value(DIAS_DIAGNOSTICO_GESTACAO),
+    ))
+
+
+def da_inseminacao_atual(femeas, prefixo=''):
+    """
+    Condição Exists para registros (inseminações ou, com prefixo
+    'inseminacao__', diagnósticos) da última inseminação de uma das fêmeas
+    anotadas em `femeas`.
+    """
+    return Exists(femeas.filter(
+        pk=OuterRef(f'{prefixo}animal'),
+        data_ultima_inseminacao=OuterRef(f'{prefixo}data_inseminacao'),
+    ))
+
+
+def filtro_parto_previsto(inicio, fim, prefixo='inseminacao__'):
+    """
+    Condição para inseminações (ou registros ligados a elas pelo prefixo)
+    com parto previsto entre `inicio` e `fim`, pelo período de gestação de
+    cada espécie.
+    """
+    condicao = Q(pk__in=[])
+    for especie in obter_catalogo().especies.values():
+        dias = timedelta(days=especie.periodo_gestacao_dias)
+        condicao |= Q(**{
+            f'{prefixo}animal__especie_id': especie.pk,
+            f'{prefixo}data_inseminacao__range': (inicio - dias, fim - dias),
+        })
+    return condicao
+
+
+def data_parto_prevista(inseminacao):
+    """Data prevista do parto pela espécie da fêmea (sem consultas)"""
+    especie = obter_catalogo().especie(inseminacao.animal.especie_id)
+    if especie is None:
+        return None
+    return inseminacao.data_inseminacao + timedelta(days=especie.periodo_gestacao_dias)
@@ -0,0 +1,303 @@
+"""
+AgroNexus - Sistema
+Resumo financeiro mensal pré-agregado (propriedade, conta, categoria, mês, tipo)
+e livro de saldos das contas com checkpoints mensais
+"""
+
+import calendar
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import (Case, Count, DateField, DecimalField, F, Q, Sum,
+                              Value, When)
+from django.db.models.functions import TruncMonth
+
+from ..models import (ContaFinanceira, LancamentoFinanceiro,
+                      ResumoFinanceiroMensal, SaldoMensalConta)
+from .series_temporais import inicio_periodo, proximo_periodo
+
+TAMANHO_LOTE_RESUMO = 1000
+
+
+def fim_do_mes(data):
+    return data.replace(day=calendar.monthrange(data.year, data.month)[1])
+
+
+def _linhas_resumo(lancamentos):
+    """Agrega os lançamentos em linhas do resumo (uma consulta)"""
+    agregados = (
+        lancamentos.order_by()
+        .annotate(mes_lancamento=TruncMonth('data_lancamento', output_field=DateField()))
+        .values('propriedade_id', 'conta_origem_id', 'categoria_id',
+                'mes_lancamento', 'tipo')
+        .annotate(soma=Sum('valor'), registros=Count('id'))
+    )
+    for linha in agregados.iterator():
+        yield ResumoFinanceiroMensal(
+            propriedade_id=linha['propriedade_id'],
+            conta_id=linha['conta_origem_id'],
+            categoria_id=linha['categoria_id'],
+            mes=linha['mes_lancamento'],
+            tipo=linha['tipo'],
+            total=linha['soma'],
+            quantidade=linha['registros'],
+        )
+
+
+def atualizar_resumo_financeiro(celulas):
+    """
+    Recalcula as células (conta_id, mes) do resumo a partir dos lançamentos.
+
+    A conta é bloqueada durante o recálculo para que alterações simultâneas
+    na mesma conta não gravem totais duplicados.
+    """
+    celulas = {
+        (conta_id, inicio_periodo(mes, 'mes'))
+        for conta_id, mes in celulas if conta_id and mes
+    }
+    with transaction.atomic():
+        # Ordem fixa de bloqueio entre transações concorrentes
+        for conta_id, mes in sorted(celulas, key=str):
+            list(ContaFinanceira.objects.select_for_update()
+                 .filter(pk=conta_id).values_list('pk', flat=True))
+            ResumoFinanceiroMensal.objects.filter(conta_id=conta_id, mes=mes).delete()
+            ResumoFinanceiroMensal.objects.bulk_create(_linhas_resumo(
+                LancamentoFinanceiro.objects.filter(
+                    conta_origem_id=conta_id,
+                    data_lancamento__gte=mes,
+                    data_lancamento__lt=proximo_periodo(mes, 'mes'),
+                )
+            ))
+
+
+def reconstruir_resumo_financeiro(propriedades=None, tamanho_lote=TAMANHO_LOTE_RESUMO):
+    """
+    Reconstrói o resumo das propriedades informadas (todas se None),
+    incluindo o livro de saldos das contas.
+
+    Retorna a quantidade de linhas de resumo gravadas.
+    """
+    resumos = ResumoFinanceiroMensal.objects.all()
+    lancamentos = LancamentoFinanceiro.objects.all()
+    if propriedades is not None:
+        resumos = resumos.filter(propriedade__in=propriedades)
+        lancamentos = lancamentos.filter(propriedade__in=propriedades)
+
+    total = 0
+    with transaction.atomic():
+        resumos.delete()
+        lote = []
+        for linha in _linhas_resumo(lancamentos):
+            lote.append(linha)
+            if len(lote) >= tamanho_lote:
+                ResumoFinanceiroMensal.objects.bulk_create(lote)
+                total += len(lote)
+                lote = []
+        ResumoFinanceiroMensal.objects.bulk_create(lote)
+        total += len(lote)
+        reconstruir_saldos_contas(propriedades)
+    return total
+
+
+# ============================================================================
+# SALDO DAS CONTAS
+# ============================================================================
+
+VALOR_SALDO = DecimalField(max_digits=16, decimal_places=2)
+
+
+def _chave_celula(item):
+    (conta_id, mes), _valor = item
+    return str(conta_id), mes
+
+
+def efeitos_lancamento(tipo, valor, conta_origem_id, conta_destino_id):
+    """
+    Efeito de um lançamento no saldo das contas: [(conta_id, valor)].
+
+    Entradas creditam e saídas debitam a conta de origem; transferências
+    debitam a origem e creditam o destino.
+    """
+    if tipo == 'entrada':
+        return [(conta_origem_id, valor)]
+    efeitos = [(conta_origem_id, -valor)]
+    if tipo == 'transferencia' and conta_destino_id:
+        efeitos.append((conta_destino_id, valor))
+    return efeitos
+
+
+def aplicar_movimentos(movimentos, criar_checkpoints=True):
+    """
+    Aplica [(conta_id, data, valor)] ao saldo atual e aos checkpoints mensais.
+
+    Os saldos são atualizados com expressões F(); a atualização da conta
+    bloqueia sua linha até o fim da transação, serializando os checkpoints.
+    Com criar_checkpoints=False (exclusões) só os checkpoints existentes são
+    ajustados, já que na exclusão em cascata da conta eles podem ter sido
+    removidos antes dos lançamentos.
+    """
+    por_mes = defaultdict(Decimal)
+    for conta_id, data, valor in movimentos:
+        if conta_id and data and valor:
+            por_mes[(conta_id, inicio_periodo(data, 'mes'))] += Decimal(valor)
+    por_conta = defaultdict(Decimal)
+    for (conta_id, mes), valor in por_mes.items():
+        por_conta[conta_id] += valor
+
+    with transaction.atomic():
+        # Ordem fixa de bloqueio entre transações concorrentes
+        for conta_id in sorted(por_conta, key=str):
+            ContaFinanceira.objects.filter(pk=conta_id).update(
+                saldo_movimentacoes=F('saldo_movimentacoes') + por_conta[conta_id])
+        for (conta_id, mes), valor in sorted(por_mes.items(), key=_chave_celula):
+            if not valor:
+                continue
+            checkpoints = SaldoMensalConta.objects.filter(conta_id=conta_id)
+            atualizados = checkpoints.filter(mes=mes).update(
+                movimentacao=F('movimentacao') + valor)
+            if not atualizados and criar_checkpoints:
+                anterior = checkpoints.filter(mes__lt=mes).order_by('-mes').values_list(
+                    'saldo_acumulado', flat=True).first() or 0
+                SaldoMensalConta.objects.create(
+                    conta_id=conta_id, mes=mes, movimentacao=valor,
+                    saldo_acumulado=anterior)
+            checkpoints.filter(mes__gte=mes).update(
+                saldo_acumulado=F('saldo_acumulado') + valor)
+
+
+def _valor_na_conta(conta_id):
+    """Expressão com o efeito de cada lançamento no saldo de `conta_id`"""
+    return Case(
+        When(conta_origem_id=conta_id, tipo='entrada', then=F('valor')),
+        When(conta_origem_id=conta_id, then=-F('valor')),
+        When(conta_destino_id=conta_id, tipo='transferencia', then=F('valor')),
+        default=Value(0),
+        output_field=VALOR_SALDO,
+    )
+
+
+def saldo_conta_em(conta, data):
+    """
+    Saldo da conta ao fim do dia `data`.
+
+    Parte do último checkpoint mensal anterior ao mês de `data` e soma só
+    os lançamentos do próprio mês até a data.
+    """
+    mes = inicio_periodo(data, 'mes')
+    checkpoint = conta.saldos_mensais.filter(mes__lt=mes).order_by('-mes').values_list(
+        'saldo_acumulado', flat=True).first() or 0
+    do_mes = LancamentoFinanceiro.objects.filter(
+        Q(conta_origem=conta) | Q(conta_destino=conta),
+        data_lancamento__range=(mes, data),
+    ).order_by().aggregate(
+        total=Sum(_valor_na_conta(conta.pk), default=0))['total']
+    return conta.saldo_inicial + checkpoint + do_mes
+
+
+def reconstruir_saldos_contas(propriedades=None):
+    """
+    Reconstrói saldo atual e checkpoints mensais das contas das propriedades
+    informadas (todas se None) em duas consultas agregadas.
+    """
+    contas = ContaFinanceira.objects.all()
+    lancamentos = LancamentoFinanceiro.objects.order_by().annotate(
+        mes_lancamento=TruncMonth('data_lancamento', output_field=DateField()))
+    if propriedades is not None:
+        contas = contas.filter(propriedade__in=propriedades)
+
+    por_mes = defaultdict(Decimal)
+    origem = lancamentos.filter(conta_origem__in=contas).values(
+        'conta_origem_id', 'mes_lancamento'
+    ).annotate(total=Sum(Case(
+        When(tipo='entrada', then=F('valor')),
+        default=-F('valor'),
+        output_field=VALOR_SALDO,
+    )))
+    for linha in origem.iterator():
+        por_mes[(linha['conta_origem_id'], linha['mes_lancamento'])] += linha['total']
+    destino = lancamentos.filter(
+        conta_destino__in=contas, tipo='transferencia'
+    ).values('conta_destino_id', 'mes_lancamento').annotate(total=Sum('valor'))
+    for linha in destino.iterator():
+        por_mes[(linha['conta_destino_id'], linha['mes_lancamento'])] += linha['total']
+
+    checkpoints = []
+    saldos = defaultdict(Decimal)
+    for (conta_id, mes), valor in sorted(por_mes.items(), key=_chave_celula):
+        saldos[conta_id] += valor
+        checkpoints.append(SaldoMensalConta(
+            conta_id=conta_id, mes=mes, movimentacao=valor,
+            saldo_acumulado=saldos[conta_id]))
+
+    with transaction.atomic():
+        SaldoMensalConta.objects.filter(conta__in=contas).delete()
+        SaldoMensalConta.objects.bulk_create(checkpoints, batch_size=TAMANHO_LOTE_RESUMO)
+        contas.update(saldo_movimentacoes=0)
+        for conta_id, saldo in saldos.items():
+            ContaFinanceira.objects.filter(pk=conta_id).update(saldo_movimentacoes=saldo)
+    return len(checkpoints)
+
+
+# ============================================================================
+# LEITURA
+# ============================================================================
+
+def meses_completos(inicio, fim):
+    """
+    Divide [inicio, fim] em meses completos e trechos parciais nas bordas.
+
+    Retorna (primeiro_mes, ultimo_mes, parciais): o intervalo de meses
+    inteiros (None se não houver) e a lista de (inicio, fim) que precisam
+    ser lidos dos lançamentos.
+    """
+    primeiro = inicio if inicio.day == 1 else proximo_periodo(inicio, 'mes')
+    ultimo = inicio_periodo(fim, 'mes')
+    if fim != fim_do_mes(fim):
+        ultimo = inicio_periodo(ultimo - timedelta(days=1), 'mes')
+    if primeiro > ultimo:
+        return None, None, [(inicio, fim)]
+
+    parciais = []
+    if inicio < primeiro:
+        parciais.append((inicio, primeiro - timedelta(days=1)))
+    if fim > fim_do_mes(ultimo):
+        parciais.append((proximo_periodo(ultimo, 'mes'), fim))
+    return primeiro, ultimo, parciais
+
+
+def totais_periodo(propriedade, inicio, fim):
+    """
+    Total de entradas e saídas da propriedade entre `inicio` e `fim`.
+
+    Meses completos vêm do resumo; só os dias das bordas são somados
+    diretamente dos lançamentos.
+    """
+    primeiro, ultimo, parciais = meses_completos(inicio, fim)
+    totais = {'entrada': 0, 'saida': 0}
+
+    if primeiro:
+        resumo = ResumoFinanceiroMensal.objects.filter(
+            propriedade=propriedade, mes__range=(primeiro, ultimo)
+        ).aggregate(
+            entrada=Sum('total', filter=Q(tipo='entrada'), default=0),
+            saida=Sum('total', filter=Q(tipo='saida'), default=0),
+        )
+        for tipo, valor in resumo.items():
+            totais[tipo] += valor
+
+    if parciais:
+        filtro_datas = Q()
+        for parcial in parciais:
+            filtro_datas |= Q(data_lancamento__range=parcial)
+        lancamentos = LancamentoFinanceiro.objects.filter(
+            filtro_datas, propriedade=propriedade
+        ).aggregate(
+            entrada=Sum('valor', filter=Q(tipo='entrada'), default=0),
+            saida=Sum('valor', filter=Q(tipo='saida'), default=0),
+        )
+        for tipo, valor in lancamentos.items():
+            totais[tipo] += valor
+
+    return totais
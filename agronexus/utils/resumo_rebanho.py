@@ -0,0 +1,229 @@
+"""
+AgroNexus - Sistema
+Resumo diário do rebanho (animais, UA, peso médio e taxa de ocupação por
+propriedade, lote e área) reconstruído dos históricos e das pesagens
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import (Avg, Case, Count, Exists, F, OuterRef, Q,
+                              Subquery, Sum, UUIDField, When)
+
+from ..models import (Animal, Area, HistoricoLoteAnimal,
+                      HistoricoOcupacaoArea, Lote, Propriedade,
+                      ResumoRebanhoDiario)
+from .estatisticas import expressao_ua, subquery_pesagem
+from .series_temporais import serie_temporal
+
+TAMANHO_LOTE_RESUMO = 1000
+
+# Dias revistos a cada execução diária (pesagens e movimentações lançadas
+# com atraso)
+DIAS_REVISAO_RESUMO = 7
+
+
+def _vigente_em(data):
+    """Registros de histórico vigentes ao fim do dia `data`"""
+    return Q(data_entrada__lte=data) & (
+        Q(data_saida__isnull=True) | Q(data_saida__gt=data))
+
+
+def lote_na_data(data):
+    """
+    Expressão com o lote do animal ao fim do dia pelo histórico de lotes.
+    Animais sem nenhum registro no histórico ficam no lote atual.
+    """
+    historico = HistoricoLoteAnimal.objects.filter(animal=OuterRef('pk'))
+    return Case(
+        When(Exists(historico), then=Subquery(
+            historico.filter(_vigente_em(data))
+            .order_by('-data_entrada').values('lote')[:1])),
+        default=F('lote_atual'),
+        output_field=UUIDField(),
+    )
+
+
+def area_na_data(data):
+    """
+    Expressão com a área ocupada pelo lote ao fim do dia pelo histórico de
+    ocupação. Lotes sem nenhum registro no histórico ficam na área atual.
+    """
+    historico = HistoricoOcupacaoArea.objects.filter(lote=OuterRef('pk'))
+    return Case(
+        When(Exists(historico), then=Subquery(
+            historico.filter(_vigente_em(data))
+            .order_by('-data_entrada').values('area')[:1])),
+        default=F('area_atual'),
+        output_field=UUIDField(),
+    )
+
+
+def presentes_em(data):
+    """Condição dos animais que estavam no rebanho ao fim do dia `data`"""
+    return (
+        Q(data_nascimento__lte=data)
+        & (Q(data_compra__isnull=True) | Q(data_compra__lte=data))
+        & (Q(status='ativo') | Q(data_venda__gt=data) | Q(data_morte__gt=data))
+    )
+
+
+def _decimal(valor, casas=2):
+    return Decimal(valor).quantize(Decimal(1).scaleb(-casas))
+
+
+def _somar(destino, origem):
+    for campo, valor in origem.items():
+        destino[campo] = destino.get(campo, 0) + valor
+    return destino
+
+
+def _linha(data, nivel, propriedade_id, totais, hectares, **relacoes):
+    totais = totais or {}
+    ua = totais.get('ua') or 0
+    pesados = totais.get('pesados') or 0
+    return ResumoRebanhoDiario(
+        propriedade_id=propriedade_id,
+        nivel=nivel,
+        data=data,
+        total_animais=totais.get('total') or 0,
+        total_ua=_decimal(ua),
+        peso_medio=_decimal(totais['peso'] / pesados) if pesados else None,
+        taxa_ocupacao=_decimal(ua / float(hectares), 3) if hectares else None,
+        **relacoes,
+    )
+
+
+def calcular_resumo_rebanho(data, propriedades=None):
+    """
+    Linhas do resumo do rebanho ao fim do dia `data`, sem gravá-las.
+
+    São quatro consultas independente do tamanho do rebanho: lotes com a
+    área ocupada no dia, animais presentes agrupados por propriedade e lote
+    (com o peso da última pesagem até a data), áreas e propriedades. Lotes
+    inativos só entram se tinham animais no dia.
+
+    Como nas estatísticas ao vivo (calcular_total_ua_propriedade e
+    anotar_ocupacao_areas), UA e taxa de ocupação da propriedade e das
+    áreas contam só os animais em lotes ativos (situação atual do lote);
+    total de animais e peso médio da propriedade contam todo o rebanho.
+    """
+    animais = Animal.objects.filter(presentes_em(data))
+    lotes = Lote.objects.all()
+    areas = Area.objects.all()
+    fazendas = Propriedade.objects.all()
+    if propriedades is not None:
+        animais = animais.filter(propriedade__in=propriedades)
+        lotes = lotes.filter(propriedade__in=propriedades)
+        areas = areas.filter(propriedade__in=propriedades)
+        fazendas = fazendas.filter(pk__in=propriedades)
+
+    lotes_dia = list(lotes.annotate(area_dia=area_na_data(data)).values_list(
+        'pk', 'propriedade_id', 'area_dia', 'ativo'))
+    lotes_ativos = {lote_id for lote_id, _, _, ativo in lotes_dia if ativo}
+
+    grupos = animais.order_by().annotate(
+        lote_dia=lote_na_data(data),
+        peso_dia=subquery_pesagem('peso_kg', ate=data),
+    ).values('propriedade_id', 'lote_dia').annotate(
+        total=Count('pk'),
+        ua=Sum(expressao_ua('peso_dia')),
+        peso=Sum('peso_dia'),
+        pesados=Count('peso_dia'),
+    )
+
+    por_propriedade, por_lote = {}, {}
+    for grupo in grupos:
+        totais = {
+            'total': grupo['total'],
+            'ua': grupo['ua'] or 0,
+            'peso': grupo['peso'] or 0,
+            'pesados': grupo['pesados'],
+        }
+        em_lote_ativo = grupo['lote_dia'] in lotes_ativos
+        _somar(por_propriedade.setdefault(grupo['propriedade_id'], {}),
+               totais if em_lote_ativo else {**totais, 'ua': 0})
+        if grupo['lote_dia'] is not None:
+            _somar(por_lote.setdefault(grupo['lote_dia'], {}), totais)
+
+    tamanhos = {
+        area_id: (propriedade_id, hectares)
+        for area_id, propriedade_id, hectares in areas.values_list(
+            'pk', 'propriedade_id', 'tamanho_ha')
+    }
+
+    linhas, por_area = [], {}
+    for lote_id, propriedade_id, area_id, ativo in lotes_dia:
+        totais = por_lote.get(lote_id)
+        if not ativo and not totais:
+            continue
+        hectares = tamanhos.get(area_id, (None, None))[1]
+        linhas.append(_linha(data, 'lote', propriedade_id, totais, hectares,
+                             lote_id=lote_id, area_id=area_id))
+        if area_id is not None and ativo and totais:
+            _somar(por_area.setdefault(area_id, {}), totais)
+
+    for area_id, (propriedade_id, hectares) in tamanhos.items():
+        linhas.append(_linha(data, 'area', propriedade_id, por_area.get(area_id),
+                             hectares, area_id=area_id))
+
+    for propriedade_id, hectares in fazendas.values_list('pk', 'area_total_ha'):
+        linhas.append(_linha(data, 'propriedade', propriedade_id,
+                             por_propriedade.get(propriedade_id), hectares))
+    return linhas
+
+
+def gerar_resumo_rebanho(data, propriedades=None):
+    """
+    Grava o resumo do rebanho do dia `data` das propriedades informadas
+    (todas se None), substituindo o existente. Retorna as linhas gravadas.
+    """
+    linhas = calcular_resumo_rebanho(data, propriedades)
+    resumos = ResumoRebanhoDiario.objects.filter(data=data)
+    if propriedades is not None:
+        resumos = resumos.filter(propriedade__in=propriedades)
+    with transaction.atomic():
+        resumos.delete()
+        ResumoRebanhoDiario.objects.bulk_create(linhas, batch_size=TAMANHO_LOTE_RESUMO)
+    return len(linhas)
+
+
+def reconstruir_resumo_rebanho(inicio, fim, propriedades=None):
+    """Gera o resumo de cada dia entre `inicio` e `fim` (inclusive)"""
+    total = 0
+    data = inicio
+    while data <= fim:
+        total += gerar_resumo_rebanho(data, propriedades)
+        data += timedelta(days=1)
+    return total
+
+
+# ============================================================================
+# LEITURA
+# ============================================================================
+
+AGREGACOES_RESUMO = {
+    'total_animais': Avg('total_animais'),
+    'total_ua': Avg('total_ua'),
+    'peso_medio': Avg('peso_medio'),
+    'taxa_ocupacao': Avg('taxa_ocupacao'),
+}
+CASAS_RESUMO = {'taxa_ocupacao': 3}
+
+
+def serie_resumo_rebanho(resumos, granularidade, inicio=None, fim=None):
+    """
+    Série do resumo diário: média dos dias de cada período (dia, semana ou
+    mês) e quantos dias tinham resumo. Lê só as linhas dos dias do período.
+    """
+    serie = serie_temporal(
+        resumos, 'data', {**AGREGACOES_RESUMO, 'dias': Count('pk')},
+        granularidade, inicio, fim,
+        vazio={**dict.fromkeys(AGREGACOES_RESUMO), 'dias': 0},
+    )
+    for item in serie:
+        for campo in AGREGACOES_RESUMO:
+            if item[campo] is not None:
+                item[campo] = round(float(item[campo]), CASAS_RESUMO.get(campo, 2))
+    return serie
@@ -0,0 +1,116 @@
+"""
+AgroNexus - Sistema
+Séries temporais agregadas por dia, semana ou mês (portáveis entre bancos)
+"""
+
+from datetime import timedelta
+
+from django.db.models import DateField
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils.dateparse import parse_date
+
+GRANULARIDADES = {
+    'dia': TruncDay,
+    'semana': TruncWeek,
+    'mes': TruncMonth,
+}
+GRANULARIDADE_PADRAO = 'mes'
+
+# Limite de períodos preenchidos por série (ex.: ~3 anos de dias)
+MAXIMO_PERIODOS = 1100
+
+
+class ParametroSerieInvalido(ValueError):
+    """Granularidade, datas ou intervalo inválidos para a série"""
+
+
+def inicio_periodo(data, granularidade):
+    """Primeiro dia do período que contém `data` (semanas começam na segunda)"""
+    if granularidade == 'semana':
+        return data - timedelta(days=data.weekday())
+    if granularidade == 'mes':
+        return data.replace(day=1)
+    return data
+
+
+def proximo_periodo(data, granularidade):
+    if granularidade == 'semana':
+        return data + timedelta(days=7)
+    if granularidade == 'mes':
+        return (data.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return data + timedelta(days=1)
+
+
+def parametros_serie(parametros, padrao=GRANULARIDADE_PADRAO):
+    """Lê granularidade, data_inicio e data_fim dos parâmetros da requisição"""
+    granularidade = parametros.get('granularidade') or padrao
+    if granularidade not in GRANULARIDADES:
+        raise ParametroSerieInvalido(
+            f'Granularidade inválida: "{granularidade}". '
+            f'Use {", ".join(GRANULARIDADES)}')
+
+    datas = []
+    for nome in ('data_inicio', 'data_fim'):
+        valor = parametros.get(nome)
+        try:
+            data = parse_date(valor) if valor else None
+        except ValueError:
+            data = None
+        if valor and data is None:
+            raise ParametroSerieInvalido(f'{nome} inválida: "{valor}". Use aaaa-mm-dd')
+        datas.append(data)
+
+    inicio, fim = datas
+    if inicio and fim and inicio > fim:
+        raise ParametroSerieInvalido('data_inicio deve ser anterior a data_fim')
+    return granularidade, inicio, fim
+
+
+def serie_temporal(queryset, campo_data, agregacoes, granularidade=GRANULARIDADE_PADRAO,
+                   inicio=None, fim=None, vazio=None):
+    """
+    Agrega `queryset` por período em uma única consulta.
+
+    `agregacoes` segue o formato de annotate(). Os períodos sem registros
+    entre `inicio` e `fim` (ou entre o primeiro e o último período com
+    dados) são preenchidos com `vazio` (padrão: 0 em todas as colunas).
+    Cada item traz 'periodo' (data inicial do período) e as agregações.
+    """
+    truncar = GRANULARIDADES[granularidade]
+    linhas = (
+        queryset.order_by()
+        .annotate(periodo=truncar(campo_data, output_field=DateField()))
+        .values('periodo')
+        .annotate(**agregacoes)
+        .order_by('periodo')
+    )
+    por_periodo = {linha['periodo']: linha for linha in linhas}
+
+    primeiro = inicio or min(por_periodo, default=None)
+    ultimo = fim or max(por_periodo, default=None)
+    if primeiro is None or ultimo is None:
+        return []
+
+    if vazio is None:
+        vazio = dict.fromkeys(agregacoes, 0)
+
+    serie = []
+    periodo = inicio_periodo(primeiro, granularidade)
+    while periodo <= ultimo:
+        if len(serie) >= MAXIMO_PERIODOS:
+            raise ParametroSerieInvalido(
+                f'Intervalo muito longo para a granularidade "{granularidade}" '
+                f'(máximo de {MAXIMO_PERIODOS} períodos)')
+        serie.append(por_periodo.get(periodo) or {'periodo': periodo, **vazio})
+        periodo = proximo_periodo(periodo, granularidade)
+    return serie
+
+
+def acumular(serie, campo, destino=None, inicial=0):
+    """Adiciona à série a soma acumulada de `campo` (ex.: saldo acumulado)"""
+    destino = destino or f'{campo}_acumulado'
+    total = inicial
+    for item in serie:
+        total += item[campo] or 0
+        item[destino] = total
+    return serie
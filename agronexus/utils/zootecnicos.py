@@ -0,0 +1,217 @@
+"""
+AgroNexus - Sistema
+Índices zootécnicos calculados de forma vetorizada (pandas/numpy)
+"""
+
+from datetime import timedelta
+
+from django.db.models import BooleanField, ExpressionWrapper
+from django.utils import timezone
+
+from ..models import Animal, Parto, Pesagem
+from .cache import (NAMESPACE_DASHBOARDS, cache_namespace, chave_versionada,
+                    escopo_propriedade)
+from .resumo_rebanho import presentes_em
+
+# Idade de referência para o peso ao desmame, por espécie (dias)
+IDADE_DESMAME_DIAS = {
+    'bovino': 205,
+    'caprino': 60,
+    'ovino': 60,
+    'equino': 180,
+    'suino': 21,
+}
+IDADE_DESMAME_PADRAO = 205
+# Tolerância em torno da idade de referência para aceitar a pesagem
+TOLERANCIA_DESMAME_DIAS = 45
+
+CATEGORIAS_MATRIZES = ['vaca', 'novilha']
+TIMEOUT_CACHE_INDICES = 24 * 60 * 60
+
+
+def _dataframe(queryset, colunas):
+    """Carrega um values_list em um DataFrame com uma única consulta"""
+    import pandas as pd
+
+    return pd.DataFrame.from_records(
+        list(queryset.values_list(*colunas)), columns=colunas)
+
+
+def _arredondar(valor, casas=3):
+    """Converte escalares numpy em float do Python (None para NaN)"""
+    import numpy as np
+
+    if valor is None or not np.isfinite(valor):
+        return None
+    return round(float(valor), casas)
+
+
+def calcular_gmd_pesagens(pesagens):
+    """
+    Acrescenta ao DataFrame de pesagens o GMD em relação à pesagem anterior
+    do mesmo animal (mesma regra de Pesagem.get_gmd_anterior).
+
+    Espera as colunas animal_id, data_pesagem e peso_kg.
+    """
+    import numpy as np
+    import pandas as pd
+
+    pesagens = pesagens.sort_values(['animal_id', 'data_pesagem'], kind='stable')
+    pesagens['data_pesagem'] = pd.to_datetime(pesagens['data_pesagem'])
+    pesagens['peso_kg'] = pesagens['peso_kg'].astype(float)
+
+    por_animal = pesagens.groupby('animal_id', sort=False)
+    dias = por_animal['data_pesagem'].diff().dt.days
+    ganho = por_animal['peso_kg'].diff()
+    pesagens['gmd'] = np.where(dias > 0, ganho / dias.where(dias > 0), np.nan)
+    return pesagens
+
+
+def _peso_desmame(pesagens, animais):
+    """Peso médio mais próximo da idade de desmame de cada espécie"""
+    import numpy as np
+    import pandas as pd
+
+    if pesagens.empty or animais.empty:
+        return None
+
+    dados = pesagens.merge(
+        animais[['animal_id', 'data_nascimento', 'especie']], on='animal_id')
+    idade = (dados['data_pesagem'] - pd.to_datetime(dados['data_nascimento'])).dt.days
+    referencia = dados['especie'].map(IDADE_DESMAME_DIAS).fillna(IDADE_DESMAME_PADRAO)
+    dados['distancia'] = (idade - referencia).abs()
+    dados = dados[dados['distancia'] <= TOLERANCIA_DESMAME_DIAS]
+    if dados.empty:
+        return None
+
+    # Uma pesagem por animal: a mais próxima da idade de referência
+    mais_proximas = dados.sort_values('distancia', kind='stable').drop_duplicates('animal_id')
+    return _arredondar(np.mean(mais_proximas['peso_kg'].to_numpy()), 2)
+
+
+def _intervalo_partos(partos):
+    """Intervalo médio entre partos consecutivos da mesma matriz (dias)"""
+    import numpy as np
+    import pandas as pd
+
+    if partos.empty:
+        return None
+    partos = partos.sort_values(['mae_id', 'data_parto'], kind='stable')
+    intervalos = pd.to_datetime(partos['data_parto']).groupby(
+        partos['mae_id'], sort=False).diff().dt.days.dropna()
+    if intervalos.empty:
+        return None
+    return _arredondar(np.mean(intervalos.to_numpy()), 1)
+
+
+def calcular_indices_zootecnicos(propriedade, data_referencia=None, dias_gmd=30):
+    """
+    Calcula os índices zootécnicos de uma propriedade.
+
+    Faz três consultas (animais, pesagens e partos) e calcula tudo sobre
+    arrays: série de GMD por animal, GMD do rebanho, natalidade,
+    mortalidade, peso ao desmame e intervalo entre partos. Registros
+    posteriores a `data_referencia` não entram no cálculo.
+    """
+    import numpy as np
+    import pandas as pd
+
+    hoje = data_referencia or timezone.now().date()
+
+    animais = _dataframe(
+        Animal.objects.filter(propriedade=propriedade, data_nascimento__lte=hoje)
+        .annotate(presente=ExpressionWrapper(presentes_em(hoje), BooleanField()))
+        .order_by(),
+        ['id', 'sexo', 'status', 'presente', 'categoria', 'data_nascimento',
+         'data_morte', 'especie__nome']
+    ).rename(columns={'id': 'animal_id', 'especie__nome': 'especie'})
+    pesagens = _dataframe(
+        Pesagem.objects.filter(animal__propriedade=propriedade, data_pesagem__lte=hoje)
+        .order_by('animal_id', 'data_pesagem'),
+        ['animal_id', 'data_pesagem', 'peso_kg']
+    )
+    partos = _dataframe(
+        Parto.objects.filter(mae__propriedade=propriedade, data_parto__lte=hoje)
+        .order_by('mae_id', 'data_parto'),
+        ['mae_id', 'data_parto']
+    )
+
+    indices = {}
+
+    # Natalidade e mortalidade (rebanho presente na data)
+    ativos = animais['presente'].astype(bool).to_numpy()
+    nascimentos = pd.to_datetime(animais['data_nascimento'])
+    mortes = pd.to_datetime(animais['data_morte'])
+    total_femeas = int(np.sum(
+        ativos & (animais['sexo'] == 'F').to_numpy()
+        & animais['categoria'].isin(CATEGORIAS_MATRIZES).to_numpy()
+    ))
+    nascimentos_ano = int(np.sum(ativos & (nascimentos.dt.year == hoje.year).to_numpy()))
+    total_animais = int(np.sum(ativos))
+    mortes_ano = int(np.sum(
+        (animais['status'] == 'morto').to_numpy()
+        & (mortes.dt.year == hoje.year).to_numpy()
+        & (mortes <= pd.Timestamp(hoje)).to_numpy()
+    ))
+
+    if total_femeas > 0:
+        indices['taxa_natalidade'] = _arredondar(nascimentos_ano / total_femeas * 100, 2)
+    if total_animais > 0:
+        indices['taxa_mortalidade'] = _arredondar(mortes_ano / total_animais * 100, 2)
+
+    # GMD por animal e do rebanho
+    gmd_animais = {}
+    if not pesagens.empty:
+        pesagens = calcular_gmd_pesagens(pesagens)
+        data_limite = pd.Timestamp(hoje - timedelta(days=dias_gmd))
+        recentes = pesagens[(pesagens['data_pesagem'] >= data_limite)]['gmd'].dropna()
+        if not recentes.empty:
+            indices['gmd_medio'] = _arredondar(np.mean(recentes.to_numpy()))
+
+        series = pesagens.dropna(subset=['gmd']).groupby('animal_id')['gmd']
+        resumo = pd.DataFrame({'gmd_ultimo': series.last(), 'gmd_medio': series.mean()})
+        gmd_animais = {
+            str(animal_id): {
+                'gmd_ultimo': _arredondar(linha.gmd_ultimo),
+                'gmd_medio': _arredondar(linha.gmd_medio),
+            }
+            for animal_id, linha in resumo.iterrows()
+        }
+
+        peso_desmame = _peso_desmame(pesagens, animais)
+        if peso_desmame is not None:
+            indices['peso_desmame_medio'] = peso_desmame
+
+    intervalo = _intervalo_partos(partos)
+    if intervalo is not None:
+        indices['intervalo_partos_dias'] = intervalo
+
+    return {
+        'data_calculo': hoje.isoformat(),
+        'propriedade': propriedade.nome,
+        'indices': indices,
+        'gmd_animais': gmd_animais,
+    }
+
+
+def chave_cache_indices(propriedade_id, data_referencia):
+    """Chave versionada: alterações na propriedade invalidam os índices"""
+    return chave_versionada(
+        NAMESPACE_DASHBOARDS, escopo_propriedade(propriedade_id),
+        'indices_zootecnicos', data_referencia.isoformat())
+
+
+def obter_indices_zootecnicos(propriedade, data_referencia=None, recalcular=False):
+    """Índices da propriedade na data, reaproveitando o cache quando houver"""
+    data_referencia = data_referencia or timezone.now().date()
+    cache = cache_namespace(NAMESPACE_DASHBOARDS)
+    chave = chave_cache_indices(propriedade.pk, data_referencia)
+
+    if not recalcular:
+        indices = cache.get(chave)
+        if indices is not None:
+            return indices
+
+    indices = calcular_indices_zootecnicos(propriedade, data_referencia)
+    cache.set(chave, indices, TIMEOUT_CACHE_INDICES)
+    return indices
@@ -45,10 +45,19 @@ app.conf.beat_schedule = {
         'task': 'agronexus.tasks.backup_automatico',
         'schedule': 7 * 24 * 60 * 60,  # Semanalmente
     },
+    'backup-incremental': {
+        'task': 'agronexus.tasks.backup_automatico',
+        'schedule': 24 * 60 * 60,  # Diariamente
+        'kwargs': {'incremental': True},
+    },
     'gerar-relatorio-semanal': {
         'task': 'agronexus.tasks.gerar_relatorio_semanal',
         'schedule': 7 * 24 * 60 * 60,  # Semanalmente
     },
+    'gerar-resumos-rebanho': {
+        'task': 'agronexus.tasks.gerar_resumos_rebanho',
+        'schedule': 24 * 60 * 60,  # Diariamente
+    },
     'limpar-logs-antigos': {
         'task': 'agronexus.tasks.limpar_logs_antigos',
         'schedule': 24 * 60 * 60,  # Diariamente
@@ -7,6 +7,7 @@ from datetime import timedelta
 from pathlib import Path
 
 from decouple import Csv, config
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -57,6 +58,11 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Monitoramento de consultas SQL por endpoint (desligado por padrão)
+MONITOR_CONSULTAS_ATIVO = config('MONITOR_CONSULTAS_ATIVO', default=False, cast=bool)
+if MONITOR_CONSULTAS_ATIVO:
+    MIDDLEWARE.append('agronexus.middleware.MonitorConsultasMiddleware')
+
 ROOT_URLCONF = 'core.urls'
 
 TEMPLATES = [
@@ -222,6 +228,13 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# Executa as tarefas na própria requisição (desenvolvimento e testes locais)
+CELERY_TASK_ALWAYS_EAGER = config(
+    'CELERY_TASK_ALWAYS_EAGER', default=False, cast=bool)
+
+# Tarefas assíncronas de importação/exportação
+TAREFAS_TAMANHO_MAXIMO_UPLOAD = config(
+    'TAREFAS_TAMANHO_MAXIMO_UPLOAD', default=50 * 1024 * 1024, cast=int)
 
 # Email Configuration
 EMAIL_BACKEND = config(
@@ -237,15 +250,87 @@ EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 # Backup Configuration
 BACKUP_ENABLED = config('BACKUP_ENABLED', default=True, cast=bool)
 BACKUP_RETENTION_DAYS = config('BACKUP_RETENTION_DAYS', default=30, cast=int)
+BACKUP_DIR = config('BACKUP_DIR', default=str(Path(MEDIA_ROOT) / 'backups'))
+# Compressão dos arquivos de backup: gzip ou zstd (requer o pacote zstandard)
+BACKUP_COMPRESSAO = config('BACKUP_COMPRESSAO', default='gzip')
+
+# Resultados do comando benchmark_endpoints (JSON por execução)
+BENCHMARK_DIR = config('BENCHMARK_DIR', default=str(Path(MEDIA_ROOT) / 'benchmarks'))
 
 # Cache Configuration
+# Com REDIS_CACHE_URL os caches são compartilhados entre os processos
+# (workers do gunicorn e do Celery); sem ele cada processo usa memória local.
+REDIS_CACHE_URL = config('REDIS_CACHE_URL', default='')
+# Usa o fakeredis no lugar do servidor Redis (testes sem Redis disponível;
+# o pacote fakeredis não faz parte do requirements.txt)
+CACHE_REDIS_FAKE = config('CACHE_REDIS_FAKE', default=False, cast=bool)
+# Incrementar descarta todo o conteúdo em cache (ex.: mudança de formato)
+CACHE_VERSION = config('CACHE_VERSION', default=1, cast=int)
+
+# Namespaces de cache e validade padrão de cada um (segundos)
+CACHE_NAMESPACES = {
+    'default': 300,
+    'dashboards': config('DASHBOARD_CACHE_TIMEOUT', default=300, cast=int),
+    'referencia': config('REFERENCIA_CACHE_TIMEOUT', default=3600, cast=int),
+    'permissoes': config('PERMISSOES_CACHE_TIMEOUT', default=600, cast=int),
+}
+
+
+def _configurar_cache(namespace, timeout):
+    if REDIS_CACHE_URL or CACHE_REDIS_FAKE:
+        configuracao = {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL or 'redis://localhost:6379/1',
+        }
+        if CACHE_REDIS_FAKE:
+            try:
+                from fakeredis import FakeConnection
+            except ImportError:
+                raise ImproperlyConfigured(
+                    'CACHE_REDIS_FAKE requer o pacote fakeredis instalado '
+                    '(pip install fakeredis)')
+            configuracao['OPTIONS'] = {'connection_class': FakeConnection}
+    else:
+        configuracao = {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': f'agronexus-{namespace}',
+        }
+    configuracao.update({
+        'KEY_PREFIX': f'agronexus:{namespace}',
+        'TIMEOUT': timeout,
+        'VERSION': CACHE_VERSION,
+    })
+    return configuracao
+
+
 CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-    }
+    namespace: _configurar_cache(namespace, timeout)
+    for namespace, timeout in CACHE_NAMESPACES.items()
 }
 
+# Métricas do monitor de consultas e orçamentos por endpoint ('ViewSet.acao').
+# Acima do orçamento a requisição é registrada no log ('log') ou falha com
+# OrcamentoConsultasExcedido ('erro', útil nos testes).
+MONITOR_CONSULTAS_CACHE = config('MONITOR_CONSULTAS_CACHE', default='default')
+ORCAMENTO_CONSULTAS_PADRAO = config(
+    'ORCAMENTO_CONSULTAS_PADRAO', default=None,
+    cast=lambda valor: int(valor) if valor not in (None, '') else None)
+ORCAMENTO_CONSULTAS_ACAO = config('ORCAMENTO_CONSULTAS_ACAO', default='log')
+# Os valores incluem as consultas de autenticação (sessão/usuário)
+ORCAMENTO_CONSULTAS = {
+    'AnimalViewSet.list': 10,
+    'AnimalViewSet.retrieve': 10,
+    'LoteViewSet.list': 10,
+    'LoteViewSet.animais': 10,
+    'PropriedadeViewSet.dashboard': 15,
+    'EspecieAnimalViewSet.list': 8,
+    'RacaAnimalViewSet.list': 8,
+}
+
+# Intervalo para conferir se o catálogo de espécies/raças mudou em outro processo
+CATALOGO_VERIFICACAO_SEGUNDOS = config(
+    'CATALOGO_VERIFICACAO_SEGUNDOS', default=30, cast=int)
+
 # Session Configuration
 SESSION_ENGINE = 'django.contrib.sessions.backends.db'
 SESSION_SAVE_EVERY_REQUEST = True